@@ -10,13 +10,14 @@ Manages projects with:
 import os
 import json
 import shutil
-import sqlite3
 import uuid
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import logging
 
+from rag.connection_pool import get_database_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,8 +112,9 @@ class ProjectManager:
     def _init_registry(self):
         """Initialize project registry database."""
         os.makedirs(os.path.dirname(self.registry_db), exist_ok=True)
+        self._db = get_database_pool(self.registry_db)
 
-        with sqlite3.connect(self.registry_db) as conn:
+        with self._db.writer() as conn:
             cursor = conn.cursor()
 
             # Create projects table
@@ -129,7 +131,6 @@ class ProjectManager:
                 )
             """)
 
-            conn.commit()
             logger.info(f"Project registry initialized at {self.registry_db}")
 
     def create_project(
@@ -228,7 +229,7 @@ class ProjectManager:
         Returns:
             Project metadata dict or None
         """
-        with sqlite3.connect(self.registry_db) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM projects WHERE project_id = ?",
@@ -263,7 +264,7 @@ class ProjectManager:
         Returns:
             List of project metadata dicts
         """
-        with sqlite3.connect(self.registry_db) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             if status_filter:
@@ -347,7 +348,7 @@ class ProjectManager:
 
     def _register_project(self, metadata: Dict[str, Any]) -> None:
         """Register project in global registry."""
-        with sqlite3.connect(self.registry_db) as conn:
+        with self._db.writer() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO projects
@@ -364,14 +365,12 @@ class ProjectManager:
                 json.dumps({k: v for k, v in metadata.items()
                            if k not in ["project_id", "name", "short_uuid", "chroma_path", "created_at", "updated_at", "status"]})
             ))
-            conn.commit()
 
     def _unregister_project(self, project_id: str) -> None:
         """Unregister project from global registry."""
-        with sqlite3.connect(self.registry_db) as conn:
+        with self._db.writer() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM projects WHERE project_id = ?",
                 (project_id,)
             )
-            conn.commit()
@@ -22,9 +22,11 @@ import json
 import logging
 import os
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 # MCP SDK imports
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
@@ -38,6 +40,7 @@ from rag import (
     SemanticRetriever, get_semantic_retriever
 )
 from rag.auto_learning_tracker import AutoLearningTracker
+from rag.embedding import EmbeddingMemo
 from rag.learning_extractor import LearningExtractor
 from rag.model_manager import get_model_manager
 from rag.conversation_analyzer import ConversationAnalyzer
@@ -68,6 +71,12 @@ class RAGMemoryBackend:
     - Semantic memory is non-authoritative (lowest priority)
     """
 
+    # Similarity above which a new lesson duplicates an existing one
+    EPISODE_DUPLICATE_JACCARD = 0.85
+    EPISODE_DUPLICATE_COSINE = 0.92
+    # Recent episodes a new lesson is compared against
+    EPISODE_DEDUP_CANDIDATES = 20
+
     def __init__(self):
         """Initialize RAG backend (lazy initialization of stores)."""
         self._symbolic_store: Optional[MemoryStore] = None
@@ -107,6 +116,15 @@ class RAGMemoryBackend:
         # Universal hooks configuration
         self.universal_hooks_config = self._load_universal_hooks_config()
 
+        # A lazily loaded semantic index is cheap to open, so open it now and
+        # let it warm up in the background instead of on the first request
+        semantic_index_config = self._load_semantic_index_config()
+        if semantic_index_config["lazy_load"] and semantic_index_config["warm_up"]:
+            try:
+                self._get_semantic_store()
+            except Exception as e:
+                logger.warning(f"Failed to open semantic index at startup: {e}")
+
     def _get_data_dir(self) -> str:
         """
         Get data directory with OS-aware detection.
@@ -193,7 +211,15 @@ class RAGMemoryBackend:
         """Get or create semantic memory store (Phase 4)."""
         if self._semantic_store is None:
             index_path = os.path.join(self._get_data_dir(), "semantic_index")
-            self._semantic_store = get_semantic_store(index_path)
+            index_config = self._load_semantic_index_config()
+            self._semantic_store = get_semantic_store(
+                index_path,
+                ann_config=index_config,
+                storage_mode=index_config["storage_mode"],
+                rerank_factor=index_config["rerank_factor"],
+                lazy_load=index_config["lazy_load"],
+                warm_up=index_config["warm_up"]
+            )
         return self._semantic_store
 
     def _get_semantic_ingestor(self) -> SemanticIngestor:
@@ -304,6 +330,43 @@ class RAGMemoryBackend:
 
         return config
 
+    def _load_semantic_index_config(self) -> Dict[str, Any]:
+        """
+        Load semantic index (ANN, storage) configuration from rag_config.json.
+
+        Returns:
+            Semantic index configuration dictionary
+        """
+        config = {
+            "ann_index": "flat",
+            "ivf_n_lists": 1024,
+            "ivf_nprobe": 16,
+            "ivf_min_train_size": 50000,
+            "storage_mode": "float32",
+            "rerank_factor": 4,
+            "lazy_load": False,
+            "warm_up": False
+        }
+
+        try:
+            config_path = os.environ.get("RAG_CONFIG_PATH", "./configs/rag_config.json")
+            if os.path.exists(config_path):
+                with open(config_path, 'r') as f:
+                    file_config = json.load(f)
+
+                if "semantic_index" in file_config:
+                    for key, value in file_config["semantic_index"].items():
+                        config[key] = value
+        except Exception as e:
+            logger.warning(f"Failed to load semantic index config: {e}, using defaults")
+
+        logger.info(
+            f"Semantic index config: ann_index={config['ann_index']}, "
+            f"lazy_load={config['lazy_load']}, warm_up={config['warm_up']}"
+        )
+
+        return config
+
     def _load_universal_hooks_config(self) -> Dict[str, Any]:
         """
         Load universal hooks configuration from rag_config.json.
@@ -575,28 +638,8 @@ class RAGMemoryBackend:
 
             semantic_store = self._get_semantic_store()
 
-            # Get all chunks
-            sources = {}
-            for chunk in semantic_store.chunks:
-                src = chunk.metadata.get("source", "unknown")
-                src_type = chunk.metadata.get("type", "unknown")
-
-                # Filter by source_type if specified
-                if source_type and src_type != source_type:
-                    continue
-
-                if src not in sources:
-                    sources[src] = {
-                        "path": src,
-                        "type": src_type,
-                        "doc_type": src_type,
-                        "chunk_count": 0,
-                        "last_updated": chunk.created_at
-                    }
-
-                sources[src]["chunk_count"] += 1
-
-            sources_list = list(sources.values())
+            # Per-source aggregates are maintained by the store
+            sources_list = semantic_store.list_sources(source_type)
 
             operation["result"] = "success"
             operation["outcome"] = "completed"
@@ -666,6 +709,7 @@ class RAGMemoryBackend:
         }
 
         request_id = self.metrics.record_tool_call(project_id, "get_context")
+        embedding_memo = EmbeddingMemo()
 
         try:
             logger.info(
@@ -723,10 +767,11 @@ class RAGMemoryBackend:
                 retriever = self._get_semantic_retriever()
 
                 try:
-                    results = retriever.retrieve(
+                    results = await retriever.retrieve_async(
                         query=query,
                         trigger="external_info_needed",
-                        top_k=max_results
+                        top_k=max_results,
+                        embedding_memo=embedding_memo
                     )
 
                     result["semantic"] = [
@@ -778,15 +823,24 @@ class RAGMemoryBackend:
                 self._auto_learning_tracker.track_operation(operation)
                 self.operation_buffer.append(operation)
 
+                # Extraction and lesson embedding block; run them off the event loop
+                loop = asyncio.get_running_loop()
+
                 # Check for task completion
                 task_completion = self._auto_learning_tracker.detect_task_completion()
                 if task_completion and self.auto_learning_config.get("track_tasks", True):
-                    await self._auto_store_episode(project_id, task_completion)
+                    await loop.run_in_executor(
+                        None, self._auto_store_episode, project_id, task_completion, embedding_memo
+                    )
 
                 # Check for patterns
                 pattern = self._auto_learning_tracker.detect_pattern()
                 if pattern and self.auto_learning_config.get("track_operations", True):
-                    await self._auto_store_episode(project_id, pattern)
+                    await loop.run_in_executor(
+                        None, self._auto_store_episode, project_id, pattern, embedding_memo
+                    )
+
+            embedding_memo.log_summary("rag.get_context")
 
     async def search(
         self,
@@ -823,6 +877,7 @@ class RAGMemoryBackend:
         }
 
         request_id = self.metrics.record_tool_call(project_id, "search")
+        embedding_memo = EmbeddingMemo()
 
         try:
             logger.info(
@@ -835,14 +890,15 @@ class RAGMemoryBackend:
             # Search symbolic memory (authoritative)
             if memory_type in ["all", "symbolic"]:
                 symbolic_store = self._get_symbolic_store()
-                # Enable partial matching with wildcards
-                search_key = f"%{query}%" if '%' not in query and '_' not in query else query
-                facts = symbolic_store.query_memory(
-                    key=search_key,  # Use LIKE pattern with wildcards for partial matching
-                    min_confidence=0.0
+                # Substring match on keys and values, ranked by relevance and confidence
+                facts = symbolic_store.search_memory(
+                    query,
+                    scope=project_id,
+                    min_confidence=0.0,
+                    limit=top_k
                 )
 
-                for fact in facts[:top_k]:
+                for fact in facts:
                     results.append({
                         "type": "symbolic",
                         "authority": "authoritative",
@@ -877,10 +933,11 @@ class RAGMemoryBackend:
                 retriever = self._get_semantic_retriever()
 
                 try:
-                    semantic_results = retriever.retrieve(
+                    semantic_results = await retriever.retrieve_async(
                         query=query,
                         trigger="external_info_needed",
-                        top_k=top_k
+                        top_k=top_k,
+                        embedding_memo=embedding_memo
                     )
 
                     for r in semantic_results:
@@ -933,15 +990,24 @@ class RAGMemoryBackend:
                 self._auto_learning_tracker.track_operation(operation)
                 self.operation_buffer.append(operation)
 
+                # Extraction and lesson embedding block; run them off the event loop
+                loop = asyncio.get_running_loop()
+
                 # Check for task completion
                 task_completion = self._auto_learning_tracker.detect_task_completion()
                 if task_completion and self.auto_learning_config.get("track_tasks", True):
-                    await self._auto_store_episode(project_id, task_completion)
+                    await loop.run_in_executor(
+                        None, self._auto_store_episode, project_id, task_completion, embedding_memo
+                    )
 
                 # Check for patterns
                 pattern = self._auto_learning_tracker.detect_pattern()
                 if pattern and self.auto_learning_config.get("track_operations", True):
-                    await self._auto_store_episode(project_id, pattern)
+                    await loop.run_in_executor(
+                        None, self._auto_store_episode, project_id, pattern, embedding_memo
+                    )
+
+            embedding_memo.log_summary("rag.search")
 
     async def ingest_file(
         self,
@@ -1071,18 +1137,17 @@ class RAGMemoryBackend:
                 # Auto-extract and store facts from file ingestion
                 if operation["result"] == "success" and self._learning_extractor and self.auto_learning_config.get("track_code_changes", True):
                     facts = self._learning_extractor.extract_facts_from_ingestion(real_path)
-                    for fact in facts:
-                        await self._auto_store_fact(project_id, fact)
+                    self._auto_store_facts(project_id, facts)
 
                 # Check for task completion
                 task_completion = self._auto_learning_tracker.detect_task_completion()
                 if task_completion and self.auto_learning_config.get("track_tasks", True):
-                    await self._auto_store_episode(project_id, task_completion)
+                    self._auto_store_episode(project_id, task_completion)
 
                 # Check for patterns
                 pattern = self._auto_learning_tracker.detect_pattern()
                 if pattern and self.auto_learning_config.get("track_operations", True):
-                    await self._auto_store_episode(project_id, pattern)
+                    self._auto_store_episode(project_id, pattern)
 
     async def analyze_conversation(
         self,
@@ -1150,34 +1215,33 @@ class RAGMemoryBackend:
                 }
 
             if auto_store:
-                # Parallel storage of facts and episodes
-                storage_tasks = []
-
-                for fact in facts:
-                    storage_tasks.append(self.add_fact(
-                        project_id=project_id,
-                        fact_key=fact.get("key", ""),
-                        fact_value=fact.get("value", ""),
+                # Store each kind in one transaction
+                fact_batch = [
+                    MemoryFact(
+                        scope=project_id,
+                        category="user",
+                        key=fact.get("key", ""),
+                        value=fact.get("value", ""),
                         confidence=fact.get("confidence", 0.8),
-                        category="user"
-                    ))
+                        source="agent"
+                    )
+                    for fact in facts
+                    if fact.get("key")
+                ]
+                if fact_batch:
+                    facts_stored = len(self._get_symbolic_store().store_memories_bulk(fact_batch))
 
+                episode_batch = []
                 for episode in episodes:
-                    storage_tasks.append(self.add_episode(
-                        project_id=project_id,
-                        title=episode.get("title", ""),
-                        content=episode.get("content", ""),
-                        lesson_type=episode.get("lesson_type", "pattern"),
-                        quality=episode.get("confidence", 0.8)
-                    ))
-
-                # Wait for all storage operations to complete
-                if storage_tasks:
-                    results = await asyncio.gather(*storage_tasks, return_exceptions=True)
-
-                    # Count successful operations
-                    facts_stored = sum(1 for r in results if isinstance(r, dict) and r.get("success"))
-                    episodes_stored = sum(1 for r in results if isinstance(r, dict) and r.get("success"))
+                    if episode.get("lesson"):
+                        parts = {part: episode.get(part, "") for part in ("situation", "action", "outcome", "lesson")}
+                    else:
+                        parts = self._parse_episode_content(episode.get("content", ""), episode.get("title", ""))
+                    candidate = Episode(project_id=project_id, confidence=episode.get("confidence", 0.8), **parts)
+                    if candidate.validate():
+                        episode_batch.append(candidate)
+                if episode_batch:
+                    episodes_stored = len(self._get_episodic_store().store_episodes_bulk(episode_batch))
 
             duration_ms = (datetime.now() - start_time).total_seconds() * 1000
 
@@ -1425,13 +1489,23 @@ class RAGMemoryBackend:
 
         return parts
 
-    def _auto_store_episode(self, project_id: str, episode_data: Dict[str, Any]) -> Optional[str]:
+    def _auto_store_episode(
+        self,
+        project_id: str,
+        episode_data: Dict[str, Any],
+        embedding_memo: Optional[EmbeddingMemo] = None
+    ) -> Optional[str]:
         """
         Automatically store an episode to episodic memory.
 
+        Blocks on extraction and lesson embedding, so async tool handlers
+        run it in the default executor.
+
         Args:
             project_id: Project identifier
             episode_data: Episode data from tracker/extractor
+            embedding_memo: Per-request memo; when given, duplicates are
+                detected by embedding similarity instead of word overlap
 
         Returns:
             Episode ID or None if not stored
@@ -1460,23 +1534,12 @@ class RAGMemoryBackend:
 
             # Check deduplication
             if self.auto_learning_config.get("episode_deduplication", True):
-                episodic_store = self._get_episodic_store()
-                # Check for similar episodes (same lesson)
-                existing_episodes = episodic_store.query_episodes(
-                    project_id=project_id,
-                    lesson=episode.get("lesson", ""),
-                    min_confidence=0.5,
-                    limit=5
+                similarity, threshold = self._closest_lesson_similarity(
+                    project_id, episode.get("lesson", ""), embedding_memo
                 )
-                for existing in existing_episodes:
-                    # Simple similarity check
-                    similarity = self._calculate_episode_similarity(
-                        episode.get("lesson", ""),
-                        existing.lesson
-                    )
-                    if similarity > 0.85:  # High similarity threshold
-                        logger.debug(f"Duplicate episode detected (similarity: {similarity:.2f}), skipping")
-                        return None
+                if similarity > threshold:
+                    logger.debug(f"Duplicate episode detected (similarity: {similarity:.2f}), skipping")
+                    return None
 
             # Store episode
             episodic_store = self._get_episodic_store()
@@ -1498,80 +1561,138 @@ class RAGMemoryBackend:
             logger.error(f"Failed to auto-store episode for project {project_id}: {e}", exc_info=True)
             return None
 
-    def _auto_store_fact(self, project_id: str, fact_data: Dict[str, Any]) -> Optional[str]:
+    def _auto_store_facts(self, project_id: str, facts_data: List[Dict[str, Any]]) -> List[str]:
         """
-        Automatically store a fact to symbolic memory.
+        Automatically store facts to symbolic memory in one transaction.
 
         Args:
             project_id: Project identifier
-            fact_data: Fact data from extractor
+            facts_data: Fact data from extractor
 
         Returns:
-            Fact ID or None if not stored
+            IDs of the stored facts (empty if none were stored)
         """
-        if not self._auto_learning_tracker:
-            return None
+        if not self._auto_learning_tracker or not facts_data:
+            return []
 
         try:
             # Check if tracking enabled for facts
             if not self.auto_learning_config.get("track_code_changes", True):
                 logger.debug(f"Fact tracking disabled, skipping fact storage")
-                return None
+                return []
 
-            # Extract fact components
-            fact_key = fact_data.get("key", "")
-            fact_value = fact_data.get("value", {})
-            category = fact_data.get("category", "fact")
-            confidence = fact_data.get("confidence", 1.0)
-
-            # Check deduplication
             symbolic_store = self._get_symbolic_store()
-            existing_facts = symbolic_store.query_memory(
-                scope=project_id,
-                key=fact_key,
-                min_confidence=0.0
-            )
+            batch = []
+            seen_keys = set()
+            for fact_data in facts_data:
+                # Extract fact components
+                fact_key = fact_data.get("key", "")
+                if fact_key in seen_keys:
+                    continue
+                seen_keys.add(fact_key)
 
-            for existing in existing_facts:
-                # Check for identical key
-                if existing.key == fact_key:
+                # Check deduplication
+                existing_facts = symbolic_store.query_memory(
+                    scope=project_id,
+                    key=fact_key,
+                    min_confidence=0.0
+                )
+                if any(existing.key == fact_key for existing in existing_facts):
                     logger.debug(f"Duplicate fact key detected: {fact_key}, skipping")
-                    return None
-
-            # Store fact
-            fact = MemoryFact(
-                scope=project_id,
-                category=category or "fact",
-                key=fact_key,
-                value=fact_value,
-                confidence=confidence,
-                source="auto_learning"
-            )
+                    continue
 
-            stored_fact = symbolic_store.store_memory(fact)
+                batch.append(MemoryFact(
+                    scope=project_id,
+                    category=fact_data.get("category", "fact") or "fact",
+                    key=fact_key,
+                    value=fact_data.get("value", {}),
+                    confidence=fact_data.get("confidence", 1.0),
+                    source="auto_learning"
+                ))
+
+            stored_facts = symbolic_store.store_memories_bulk(batch)
+            for stored_fact in stored_facts:
+                logger.info(f"Auto-stored fact: {stored_fact.key} (id: {stored_fact.id})")
+            return [str(stored_fact.id) for stored_fact in stored_facts]
 
-            logger.info(f"Auto-stored fact: {fact_key} (id: {stored_fact.id})")
-            return str(stored_fact.id)
+        except Exception as e:
+            logger.error(f"Failed to auto-store facts for project {project_id}: {e}", exc_info=True)
+            return []
 
+    def _embed_lessons(self, lessons: List[str], embedding_memo: EmbeddingMemo) -> Optional[List[List[float]]]:
+        """Embed lessons through the memo, or None if embedding is unavailable."""
+        try:
+            return embedding_memo.embed(lessons)
         except Exception as e:
-            logger.error(f"Failed to auto-store fact for project {project_id}: {e}", exc_info=True)
+            logger.debug(f"Falling back to word overlap for episode deduplication: {e}")
             return None
 
-    def _calculate_episode_similarity(self, lesson1: str, lesson2: str) -> float:
+    def _closest_lesson_similarity(
+        self,
+        project_id: str,
+        lesson: str,
+        embedding_memo: Optional[EmbeddingMemo] = None
+    ) -> Tuple[float, float]:
         """
-        Calculate similarity between two lesson strings.
+        Similarity of a new lesson to the closest lesson already stored.
+
+        A stored identical lesson is a duplicate without embedding anything.
+        Otherwise the project's recent episodes are the candidates: with a
+        memo, the new and candidate lessons are embedded in one batch (the
+        memo answers lessons already embedded in this tool call) and
+        compared by cosine similarity; without one, or if embedding fails,
+        by word overlap (Jaccard).
 
         Args:
-            lesson1: First lesson string
-            lesson2: Second lesson string
+            project_id: Project identifier
+            lesson: Lesson of the new episode
+            embedding_memo: Optional per-request embedding memo
 
         Returns:
-            Similarity score (0.0 to 1.0)
+            (highest similarity score, duplicate threshold for that score)
         """
-        if not lesson1 or not lesson2:
-            return 0.0
+        if not lesson:
+            return 0.0, self.EPISODE_DUPLICATE_JACCARD
+
+        episodic_store = self._get_episodic_store()
+        identical = episodic_store.query_episodes(
+            project_id=project_id,
+            lesson=lesson,
+            min_confidence=0.5,
+            limit=5
+        )
+        if any(existing.lesson == lesson for existing in identical):
+            return 1.0, self.EPISODE_DUPLICATE_JACCARD
+
+        candidates = list(dict.fromkeys(
+            existing.lesson
+            for existing in episodic_store.list_recent_episodes(
+                project_id=project_id,
+                min_confidence=0.5,
+                limit=self.EPISODE_DEDUP_CANDIDATES
+            )
+            if existing.lesson
+        ))
+        if not candidates:
+            return 0.0, self.EPISODE_DUPLICATE_JACCARD
+
+        if embedding_memo is not None:
+            vectors = self._embed_lessons([lesson] + candidates, embedding_memo)
+            if vectors and all(len(vector) for vector in vectors):
+                matrix = np.asarray(vectors, dtype=np.float64)
+                norms = np.linalg.norm(matrix, axis=1)
+                if norms.all():
+                    similarities = matrix[1:] @ matrix[0] / (norms[1:] * norms[0])
+                    return float(similarities.max()), self.EPISODE_DUPLICATE_COSINE
+
+        return (
+            max(self._jaccard_similarity(lesson, candidate) for candidate in candidates),
+            self.EPISODE_DUPLICATE_JACCARD
+        )
 
-        # Simple word overlap similarity
+    @staticmethod
+    def _jaccard_similarity(lesson1: str, lesson2: str) -> float:
+        """Word overlap (Jaccard) similarity of two lessons, 0.0 to 1.0."""
         words1 = set(lesson1.lower().split())
         words2 = set(lesson2.lower().split())
 
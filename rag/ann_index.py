@@ -0,0 +1,284 @@
+"""
+ANN Index - Approximate nearest-neighbour search for SemanticStore.
+
+IVFIndex partitions the store's unit-length embedding matrix into
+n_lists clusters with spherical k-means. A query only scores the rows of
+its nprobe nearest clusters, so search cost is roughly
+nprobe / n_lists of a flat scan.
+
+The index does not own any vectors. It keeps one list id per store row
+(the "assignments" array, aligned with SemanticStore.chunks) and
+builds inverted lists from it lazily:
+
+    assignments   int32 (rows,)        list id per row, -1 for rows without an embedding
+    centroids     float32 (n_lists, d) unit-length cluster centroids
+
+Centroids and assignments are persisted in the compacted base segment
+(see semantic_index_io); rows appended after the last compaction are
+assigned when the index is loaded.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .logger import get_logger
+logger = get_logger(__name__)
+
+
+ANN_TYPES = {"flat", "ivf"}
+
+CENTROIDS_FILE = "ivf_centroids.npy"
+ASSIGNMENTS_FILE = "ivf_assignments.npy"
+
+# Rows scored per matrix product when assigning rows to lists
+_ASSIGN_BATCH = 65536
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) index over an external embedding matrix.
+
+    Example:
+        >>> index = IVFIndex(n_lists=256, nprobe=8)
+        >>> index.train(vectors)
+        >>> index.add(vectors, mask)
+        >>> rows = index.probe(query)
+    """
+
+    def __init__(
+        self,
+        n_lists: int = 1024,
+        nprobe: int = 16,
+        min_train_size: int = 50000,
+        max_iter: int = 10,
+        seed: int = 0
+    ):
+        """
+        Initialize an untrained index.
+
+        Args:
+            n_lists: Number of clusters (upper bound; capped by training size)
+            nprobe: Default number of clusters scanned per query
+            min_train_size: Minimum number of embedded rows before training
+            max_iter: k-means iterations
+            seed: Random seed for centroid initialization and sampling
+        """
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.max_iter = max_iter
+        self.seed = seed
+
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+
+        # List id per row, with spare capacity so appends are amortized O(1)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._size = 0
+
+        # Inverted lists over the first _built rows: rows of list j are
+        # _order[_bounds[j]:_bounds[j + 1]]
+        self._order: Optional[np.ndarray] = None
+        self._bounds: Optional[np.ndarray] = None
+        self._built = 0
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether centroids are available."""
+        return self.centroids is not None
+
+    @property
+    def assignments(self) -> np.ndarray:
+        """List id per row (-1 for rows without an embedding)."""
+        return self._assignments[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def params(self) -> Dict[str, Any]:
+        """Index parameters, as recorded in the segment manifest."""
+        return {
+            "type": "ivf",
+            "n_lists": self.n_lists,
+            "trained_size": self.trained_size
+        }
+
+    def train(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Fit centroids with spherical k-means.
+
+        Training runs on a sample of at most 64 rows per list; the full
+        input is then assigned once to the final centroids.
+
+        Args:
+            vectors: float32 (rows, dim) unit-length embeddings to train on
+
+        Returns:
+            List id of every input row under the new centroids
+        """
+        count = vectors.shape[0]
+        n_lists = max(1, min(self.n_lists, count))
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(count, n_lists * 64)
+        sample_rows = np.sort(rng.choice(count, sample_size, replace=False)) if sample_size < count else None
+        sample = np.ascontiguousarray(vectors[sample_rows] if sample_rows is not None else vectors, dtype=np.float32)
+
+        centroids = sample[rng.choice(sample.shape[0], n_lists, replace=False)].copy()
+        for _ in range(self.max_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+
+            # Re-seed empty clusters with random sample rows
+            empty = np.flatnonzero(counts == 0)
+            if empty.size:
+                sums[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        self.centroids = centroids
+        self.trained_size = count
+        logger.info(f"Trained IVF index: {n_lists} lists on {sample.shape[0]} of {count} vectors")
+        return self.assign(vectors)
+
+    def assign(self, vectors: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the nearest list of each row.
+
+        Args:
+            vectors: float32 (rows, dim) unit-length embeddings
+            mask: Optional bool (rows,) validity mask; invalid rows get -1
+
+        Returns:
+            int32 (rows,) list ids (-1 everywhere if the index is untrained)
+        """
+        count = vectors.shape[0]
+        labels = np.full(count, -1, dtype=np.int32)
+        if self.centroids is None or count == 0 or vectors.ndim != 2 or vectors.shape[1] != self.centroids.shape[1]:
+            return labels
+
+        for start in range(0, count, _ASSIGN_BATCH):
+            block = np.asarray(vectors[start:start + _ASSIGN_BATCH], dtype=np.float32)
+            labels[start:start + block.shape[0]] = np.argmax(block @ self.centroids.T, axis=1)
+
+        if mask is not None:
+            labels[~np.asarray(mask, dtype=bool)] = -1
+        return labels
+
+    def reset(self, assignments: Optional[np.ndarray] = None) -> None:
+        """
+        Replace all row assignments.
+
+        Args:
+            assignments: List id per row (empty when None)
+        """
+        assignments = np.zeros(0, dtype=np.int32) if assignments is None else assignments
+        self._assignments = np.array(assignments, dtype=np.int32)
+        self._size = self._assignments.shape[0]
+        self._invalidate()
+
+    def add(self, vectors: np.ndarray, mask: np.ndarray) -> None:
+        """
+        Append rows, assigning them to their nearest lists.
+
+        Args:
+            vectors: float32 (rows, dim) embeddings of the appended rows
+            mask: bool (rows,) validity mask of the appended rows
+        """
+        labels = self.assign(vectors, mask)
+        size = self._size + labels.shape[0]
+        if size > self._assignments.shape[0]:
+            grown = np.full(max(size, self._assignments.shape[0] * 2, 64), -1, dtype=np.int32)
+            grown[:self._size] = self._assignments[:self._size]
+            self._assignments = grown
+        self._assignments[self._size:size] = labels
+        self._size = size
+
+    def keep(self, keep: np.ndarray) -> None:
+        """
+        Drop rows, mirroring a delete in the store.
+
+        Args:
+            keep: bool (rows,) mask of rows to keep
+        """
+        self._assignments = self._assignments[:self._size][keep]
+        self._size = self._assignments.shape[0]
+        self._invalidate()
+
+    def probe(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """
+        Candidate rows for a query.
+
+        Args:
+            query: float32 (dim,) unit-length query vector
+            nprobe: Number of lists to scan (defaults to self.nprobe)
+
+        Returns:
+            int64 array of row positions in the probed lists (grouped by list)
+        """
+        n_lists = self.centroids.shape[0]
+        nprobe = max(1, min(nprobe or self.nprobe, n_lists))
+        centroid_scores = self.centroids @ query
+        if nprobe < n_lists:
+            lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            lists = np.arange(n_lists)
+
+        self._build_lists()
+        rows = [self._order[self._bounds[j]:self._bounds[j + 1]] for j in lists]
+
+        # Rows appended since the lists were built
+        if self._built < self._size:
+            tail = self._assignments[self._built:self._size]
+            rows.append(self._built + np.flatnonzero(np.isin(tail, lists)))
+
+        return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+    def _build_lists(self) -> None:
+        """(Re)build inverted lists once enough rows were appended since the last build."""
+        if self._order is not None and self._size - self._built <= max(1024, self._built // 8):
+            return
+
+        n_lists = self.centroids.shape[0]
+        assignments = self._assignments[:self._size]
+        order = np.argsort(assignments, kind="stable")
+        self._bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self._order = order.astype(np.int64)
+        self._built = self._size
+
+    def _invalidate(self) -> None:
+        """Forget the inverted lists after row positions changed."""
+        self._order = None
+        self._bounds = None
+        self._built = 0
+
+
+def create_ann_index(config: Optional[Dict[str, Any]]) -> Optional[IVFIndex]:
+    """
+    Create the ANN index selected by a semantic index config block.
+
+    Args:
+        config: Dict with "ann_index" ("flat" or "ivf") and IVF parameters
+            (ivf_n_lists, ivf_nprobe, ivf_min_train_size)
+
+    Returns:
+        IVFIndex, or None for a flat (exact) index
+    """
+    config = config or {}
+    ann_type = config.get("ann_index", "flat")
+    if ann_type not in ANN_TYPES:
+        logger.warning(f"Unknown ann_index '{ann_type}', falling back to flat search")
+        return None
+    if ann_type == "flat":
+        return None
+
+    return IVFIndex(
+        n_lists=config.get("ivf_n_lists", 1024),
+        nprobe=config.get("ivf_nprobe", 16),
+        min_train_size=config.get("ivf_min_train_size", 50000)
+    )
@@ -23,6 +23,11 @@ from .query_cache import QueryCache
 logger = logging.getLogger(__name__)
 
 
+def text_hash(text: str) -> str:
+    """Short stable hash of a text, used to build chunk IDs."""
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:16]
+
+
 class DocumentChunk:
     """
     Represents a single chunk of a document in semantic memory.
@@ -100,7 +105,7 @@ class ChromaSemanticStore:
             logger.info(f"Created persist directory: {persist_directory}")
 
         # ChromaDB client will be created in add_document()
-        self._client = None
+        self.client = None
         self.collection = None
 
         logger.info(f"ChromaSemanticStore initialized for project {project_id}, "
@@ -178,6 +183,7 @@ class ChromaSemanticStore:
 
             # Get texts and embeddings in parallel
             texts = [chunk["content"] for chunk in batch]
+            embeddings_list = None
             try:
                 embeddings_list = await self.embedding_service.embed_parallel(texts)
 
@@ -191,12 +197,18 @@ class ChromaSemanticStore:
             ids = [chunk["chunk_id"] for chunk in batch]
             metadata_list = [chunk["metadata"] for chunk in batch]
 
+            # Store our embeddings; without a complete set ChromaDB embeds itself
+            extra = {}
+            if embeddings_list and len(embeddings_list) == len(batch) and all(embeddings_list):
+                extra["embeddings"] = embeddings_list
+
             # Single bulk update - 10x faster than sequential updates
             try:
                 self.collection.add(
                     documents=[chunk["content"] for chunk in batch],
                     metadatas=metadata_list,
-                    ids=ids
+                    ids=ids,
+                    **extra
                 )
                 logger.debug(f"Added {len(ids)} chunks to ChromaDB in batch")
             except Exception as e:
@@ -323,6 +335,10 @@ class ChromaSemanticStore:
 
             return chunks[:top_k]
 
+        except Exception as e:
+            logger.error(f"ChromaDB search failed: {e}")
+            return []
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the semantic store.
@@ -391,7 +407,7 @@ class ChromaSemanticStore:
             if self.client:
                 self.client.persist()
                 logger.info(f"ChromaDB data persisted to {self._get_persist_path()}")
-        else:
+            else:
                 logger.warning("No ChromaDB client to persist (not initialized)")
         except Exception as e:
             logger.error(f"Failed to persist ChromaDB: {e}")
@@ -137,16 +137,39 @@ class ChromaVectorStore(IVectorStore):
         Returns:
             List of tuples: (doc_text, similarity_score, metadata)
         """
-        # Validate query vector dimension
-        if len(query_vector) != self.embedding_dimension:
-            logger.warning(
-                f"Query vector dimension ({len(query_vector)}) != "
-                f"expected ({self.embedding_dimension})"
-            )
+        return self.search_many([query_vector], top_k, metadata_filters)[0]
+
+    def search_many(
+        self,
+        query_vectors: List[List[float]],
+        top_k: int = 3,
+        metadata_filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """
+        Search for several query vectors in one ChromaDB query.
+
+        Args:
+            query_vectors: Query embedding vectors
+            top_k: Number of results per query
+            metadata_filters: Optional metadata filters
+
+        Returns:
+            One list of (doc_text, similarity_score, metadata) tuples per query
+        """
+        if not query_vectors:
+            return []
+
+        # Validate query vector dimensions
+        for query_vector in query_vectors:
+            if len(query_vector) != self.embedding_dimension:
+                logger.warning(
+                    f"Query vector dimension ({len(query_vector)}) != "
+                    f"expected ({self.embedding_dimension})"
+                )
 
         # Prepare query parameters
         query_params = {
-            "query_embeddings": [query_vector],
+            "query_embeddings": query_vectors,
             "n_results": top_k
         }
 
@@ -157,24 +180,27 @@ class ChromaVectorStore(IVectorStore):
         # Execute search
         results = self.collection.query(**query_params)
 
-        # Parse results
-        results_list = []
-        if results['documents'] and len(results['documents'][0]) > 0:
-            for i in range(len(results['documents'][0])):
-                doc_text = results['documents'][0][i]
-                distance = results['distances'][0][i]  # ChromaDB returns distance
+        # Parse results (one row per query)
+        all_results = []
+        for row in range(len(query_vectors)):
+            results_list = []
+            documents = results['documents'][row] if results['documents'] else []
+            for i in range(len(documents)):
+                doc_text = documents[i]
+                distance = results['distances'][row][i]  # ChromaDB returns distance
                 similarity = 1.0 - distance  # Convert to similarity (cosine)
 
                 # Convert metadata from ChromaDB Metadata type to dict
                 meta_dict = {}
-                if results['metadatas'] and results['metadatas'][0]:
-                    meta_dict = dict(results['metadatas'][0][i]) if results['metadatas'][0][i] else {}
+                if results['metadatas'] and results['metadatas'][row]:
+                    meta_dict = dict(results['metadatas'][row][i]) if results['metadatas'][row][i] else {}
 
                 results_list.append((doc_text, similarity, meta_dict))
+            all_results.append(results_list)
 
-        return results_list
+        return all_results
 
-    def save(self, path: Optional[str] = None) -> None:
+    def save(self, path: Optional[str] = None, append: bool = False) -> None:
         """
         Persist store to disk.
 
@@ -182,6 +208,7 @@ class ChromaVectorStore(IVectorStore):
 
         Args:
             path: Optional path (ignored - ChromaDB uses persistent path from __init__)
+            append: Ignored (ChromaDB persists incrementally)
         """
         # ChromaDB auto-persists, no action needed
         logger.debug("ChromaVectorStore: save() called (auto-persisted)")
@@ -0,0 +1,360 @@
+"""
+Streaming Chunking - Generator-based text chunking for large files.
+
+The chunkers in SemanticStore and rag.ingest used to need a whole file as
+one string and built whole chunk lists. The generators here produce the
+same chunks lazily from an iterable of text blocks, so a multi-hundred-MB
+log can be chunked, embedded and persisted in bounded-memory batches:
+
+- iter_file_blocks() reads a file in fixed-size blocks, with the same
+  encoding fallback as reading it whole.
+- iter_paragraphs() yields exactly what "".join(blocks).split("\\n\\n")
+  would, without joining the blocks.
+- iter_chunks() packs paragraphs into chunks (splitting long paragraphs by
+  sentences or words) and applies the "...overlap...\\n" prefix.
+- iter_text_chunks() does both for streamed text, splitting a paragraph
+  longer than chunk_size as it arrives, so a file without blank lines is
+  never held whole.
+"""
+
+import codecs
+import re
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Characters per block read from a file
+BLOCK_SIZE = 1 << 20
+
+# Encodings tried in order, as by reading a file whole
+ENCODINGS = ('utf-8', 'utf-8-sig', 'latin-1', 'cp1252')
+
+# What str.split() calls a word (\s is str.isspace() for str patterns)
+_WORD = re.compile(r'\S+')
+
+
+def detect_encoding(file_path: str, block_size: int = BLOCK_SIZE) -> Optional[str]:
+    """
+    Find the first encoding in ENCODINGS that decodes the whole file.
+
+    Decodes block by block, so memory stays bounded.
+
+    Args:
+        file_path: Path to file
+        block_size: Bytes per read
+
+    Returns:
+        Encoding name, or None if none decodes the file
+    """
+    for encoding in ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(block_size), b''):
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def iter_file_blocks(
+    file_path: str,
+    block_size: int = BLOCK_SIZE,
+    encoding: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Read a text file in blocks.
+
+    Uses the first encoding in ENCODINGS that decodes the whole file,
+    falling back to UTF-8 with replacement characters. Callers reading a
+    file more than once should detect its encoding once and pass it in,
+    since detection decodes the whole file.
+
+    Args:
+        file_path: Path to file
+        block_size: Characters per block
+        encoding: Encoding from detect_encoding() (default: detected here)
+
+    Yields:
+        Consecutive blocks of the file's text
+    """
+    encoding = encoding or detect_encoding(file_path)
+    errors = 'strict' if encoding else 'replace'
+    with open(file_path, 'r', encoding=encoding or 'utf-8', errors=errors) as f:
+        for block in iter(lambda: f.read(block_size), ''):
+            yield block
+
+
+def iter_paragraphs(blocks: Iterable[str]) -> Iterator[str]:
+    """
+    Split streamed text on blank lines.
+
+    Yields the same strings as "".join(blocks).split("\\n\\n"), including
+    empty ones, but only ever holds one paragraph in memory.
+
+    Args:
+        blocks: Consecutive pieces of the text
+
+    Yields:
+        Paragraphs (unstripped)
+    """
+    pending: List[str] = []
+    for piece, last in _split_pieces(blocks, '\n\n'):
+        pending.append(piece)
+        if last:
+            yield ''.join(pending)
+            pending = []
+
+
+def iter_text_chunks(
+    blocks: Iterable[str],
+    chunk_size: int = 500,
+    chunk_overlap: int = 50,
+    split_long: str = "sentences"
+) -> Iterator[str]:
+    """
+    Chunk streamed text as iter_chunks(iter_paragraphs(blocks), ...) would.
+
+    Paragraphs longer than chunk_size are split as they stream in rather
+    than joined first, so text without blank lines (e.g. a log) is chunked
+    in memory bounded by the block size and the longest word or sentence.
+
+    Args:
+        blocks: Consecutive pieces of the text, e.g. from iter_file_blocks()
+        chunk_size: Target chunk size
+        chunk_overlap: Overlap between chunks
+        split_long: "sentences" or "words"
+
+    Yields:
+        Text chunks
+    """
+    chunks = _pack_paragraphs(_split_pieces(blocks, '\n\n'), chunk_size, split_long)
+    yield from _with_overlap(chunks, chunk_overlap)
+
+
+def _split_pieces(blocks: Iterable[str], sep: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Split streamed text on a two-character separator, piece by piece.
+
+    Yields (piece, last) pairs; joining the pieces up to each last=True
+    gives the items of "".join(blocks).split(sep), without ever joining
+    more than one block.
+    """
+    # sep[0] at the end of the previous block, held back in case the
+    # next block starts with sep[1]
+    held = ''
+    for block in blocks:
+        if not block:
+            continue
+        if held:
+            if block.startswith(sep[1]):
+                # A separator straddles the block boundary
+                yield '', True
+                block = block[1:]
+            else:
+                block = held + block
+            held = ''
+
+        start = 0
+        end = block.find(sep)
+        while end >= 0:
+            yield block[start:end], True
+            start = end + len(sep)
+            end = block.find(sep, start)
+        tail = block[start:]
+        if tail.endswith(sep[0]):
+            tail, held = tail[:-1], sep[0]
+        if tail:
+            yield tail, False
+    yield held, True
+
+
+def _paragraph(piece: str, last: bool, pieces: Iterator[Tuple[str, bool]]) -> Iterator[str]:
+    """Non-empty pieces of the paragraph starting with piece, consuming the rest from pieces."""
+    if piece:
+        yield piece
+    while not last:
+        piece, last = next(pieces)
+        if piece:
+            yield piece
+
+
+def _strip_pieces(pieces: Iterable[str]) -> Iterator[str]:
+    """Pieces of "".join(pieces).strip(); trailing whitespace is held until more text follows."""
+    started = False
+    trailing: List[str] = []
+    for piece in pieces:
+        if not started:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+            started = True
+        stripped = piece.rstrip()
+        if stripped:
+            whitespace = ''.join(trailing)
+            if whitespace:
+                yield whitespace
+            yield stripped
+            trailing = []
+        trailing.append(piece[len(stripped):])
+
+
+def _stripped_paragraphs(
+    pieces: Iterable[Tuple[str, bool]],
+    limit: int
+) -> Iterator[Tuple[str, Optional[Iterator[str]]]]:
+    """
+    Stripped paragraphs from _split_pieces() output.
+
+    Yields (paragraph, None) for a paragraph of at most limit characters
+    (after stripping), and (head, rest) for a longer one: head holds its
+    first limit+ characters and rest streams the remaining pieces. rest
+    must be consumed before the next paragraph is read.
+    """
+    pieces = iter(pieces)
+    for piece, last in pieces:
+        stripped = _strip_pieces(_paragraph(piece, last, pieces))
+        head: List[str] = []
+        length = 0
+        for text in stripped:
+            head.append(text)
+            length += len(text)
+            if length > limit:
+                break
+        if length > limit:
+            yield ''.join(head), stripped
+            # Skip whatever the consumer left
+            for _ in stripped:
+                pass
+        else:
+            yield ''.join(head), None
+
+
+def _split_sentences(pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Split a long paragraph, given as pieces, on ". ", ending every chunk with a period."""
+    current = ""
+    sent_pieces: List[str] = []
+    for piece, last in _split_pieces(pieces, '. '):
+        sent_pieces.append(piece)
+        if not last:
+            continue
+        sent = ''.join(sent_pieces)
+        sent_pieces = []
+        if len(current) + len(sent) + 1 > chunk_size:
+            if current:
+                yield current.strip() + "."
+            current = sent
+        else:
+            current = f"{current} {sent}".strip() if current else sent
+    if current:
+        yield current.strip() + "."
+
+
+def _split_words(pieces: Iterable[str]) -> Iterator[str]:
+    """The words of "".join(pieces).split(), reading one piece at a time."""
+    partial = ''
+    for piece in pieces:
+        word = None
+        for match in _WORD.finditer(partial + piece):
+            if word is not None:
+                yield word
+            word = match.group()
+        # A word running into the next piece is completed there
+        if word is not None and piece[-1].isspace():
+            yield word
+            word = None
+        partial = word or ''
+    if partial:
+        yield partial
+
+
+def iter_chunks(
+    paragraphs: Iterable[str],
+    chunk_size: int = 500,
+    chunk_overlap: int = 50,
+    split_long: str = "sentences"
+) -> Iterator[str]:
+    """
+    Pack paragraphs into chunks of about chunk_size characters.
+
+    Paragraphs are joined with blank lines while they fit. A paragraph
+    longer than chunk_size is split by sentences (SemanticStore) or by
+    words (rag.ingest). Every chunk after the first is prefixed with
+    "...<last chunk_overlap characters of the previous chunk>...\\n".
+    To chunk text streamed from a file, use iter_text_chunks(), which
+    does not join long paragraphs first.
+
+    Args:
+        paragraphs: Paragraphs, e.g. from iter_paragraphs()
+        chunk_size: Target chunk size
+        chunk_overlap: Overlap between chunks
+        split_long: "sentences" or "words"
+
+    Yields:
+        Text chunks
+    """
+    chunks = _pack_paragraphs(((para, True) for para in paragraphs), chunk_size, split_long)
+    yield from _with_overlap(chunks, chunk_overlap)
+
+
+def _with_overlap(chunks: Iterable[str], chunk_overlap: int) -> Iterator[str]:
+    """Prefix every chunk after the first with the end of the previous one."""
+    previous: Optional[str] = None
+    for chunk in chunks:
+        if chunk_overlap > 0 and previous is not None:
+            yield f"...{previous[-chunk_overlap:]}...\n{chunk}"
+        else:
+            yield chunk
+        previous = chunk
+
+
+def _pack_paragraphs(
+    pieces: Iterable[Tuple[str, bool]],
+    chunk_size: int,
+    split_long: str
+) -> Iterator[str]:
+    """Chunks of iter_chunks() before the overlap prefix is applied, from _split_pieces() output."""
+    if split_long not in ("sentences", "words"):
+        raise ValueError(f"split_long must be 'sentences' or 'words', not {split_long!r}")
+
+    # The current chunk as parts joined by sep, so growing it is not quadratic
+    parts: List[str] = []
+    sep = "\n\n"
+    length = 0
+
+    for para, rest in _stripped_paragraphs(pieces, chunk_size):
+        if not para:
+            continue
+
+        # If adding this paragraph exceeds chunk size
+        if length + len(para) + 2 > chunk_size:
+            if parts:
+                yield sep.join(parts).strip()
+
+            if rest is None:
+                parts, sep, length = [para], "\n\n", len(para)
+            elif split_long == "sentences":
+                # The current chunk is kept (and emitted again later), as
+                # SemanticStore always did
+                yield from _split_sentences(chain([para], rest), chunk_size)
+            else:
+                # The last partial run of words becomes the current chunk
+                parts, sep, length = [], " ", 0
+                for word in _split_words(chain([para], rest)):
+                    if length + len(word) + 1 > chunk_size:
+                        if parts:
+                            yield " ".join(parts)
+                        parts, length = [word], len(word)
+                    else:
+                        length += len(word) + (1 if parts else 0)
+                        parts.append(word)
+        else:
+            if parts and sep != "\n\n":
+                parts = [sep.join(parts)]
+            length += len(para) + (2 if parts else 0)
+            parts.append(para)
+            sep = "\n\n"
+
+    if parts:
+        yield sep.join(parts).strip()
@@ -2,15 +2,37 @@
 SQLite Connection Pool - Thread-safe pool for SQLite connections.
 
 Improves performance by reusing connections instead of creating new ones per query.
+
+- SQLiteConnectionPool: a pool of interchangeable connections.
+- SQLiteDatabasePool: pooled read connections plus one writer connection
+  for a database file; get_database_pool() shares one per file between
+  every store that opens it.
 """
+import json
+import os
 import sqlite3
 import threading
-from typing import List
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from contextlib import contextmanager
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Defaults for get_database_pool(), overridable in rag_config.json
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_POOL_WAIT_MS = 50
+
+
+def _connect(db_path: str, foreign_keys: bool = True) -> sqlite3.Connection:
+    """Open a connection with the pool's pragmas."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")  # Better concurrency
+    conn.execute("PRAGMA synchronous=NORMAL")   # Balanced safety/speed
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys=ON")      # Enable foreign key constraints
+    return conn
+
 
 class SQLiteConnectionPool:
     """
@@ -22,30 +44,47 @@ class SQLiteConnectionPool:
     - Automatic overflow handling
     - Graceful shutdown
     - Thread-safe operations
+    - Wait time and overflow metrics (get_stats())
     """
 
-    def __init__(self, db_path: str, pool_size: int = 5):
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 5,
+        wait_timeout: float = 0.0,
+        foreign_keys: bool = True
+    ):
         """
         Initialize connection pool.
 
         Args:
             db_path: Path to SQLite database file
             pool_size: Number of connections to maintain in pool
+            wait_timeout: Seconds to wait for a pooled connection before
+                opening an overflow connection (0 = never wait)
+            foreign_keys: Enable foreign key constraints on every connection
         """
         self.db_path = db_path
         self.pool_size = pool_size
+        self.wait_timeout = wait_timeout
+        self.foreign_keys = foreign_keys
         self._pool: List[sqlite3.Connection] = []
         self._lock = threading.Lock()
+        self._returned = threading.Condition(self._lock)
+        self._closed = False
+
+        # Metrics
+        self._in_use = 0
+        self.acquisitions = 0
+        self.overflows = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
 
         # Initialize pool with WAL mode for better concurrency
         logger.info(f"Initializing SQLiteConnectionPool for {db_path}, pool_size={pool_size}")
 
         for _ in range(pool_size):
-            conn = sqlite3.connect(db_path, check_same_thread=False)
-            conn.execute("PRAGMA journal_mode=WAL")  # Better concurrency
-            conn.execute("PRAGMA synchronous=NORMAL")   # Balanced safety/speed
-            conn.execute("PRAGMA foreign_keys=ON")      # Enable foreign key constraints
-            self._pool.append(conn)
+            self._pool.append(_connect(db_path, foreign_keys))
 
         logger.info(f"SQLiteConnectionPool initialized with {len(self._pool)} connections")
 
@@ -59,51 +98,72 @@ class SQLiteConnectionPool:
 
         Behavior:
             - LIFO: Last used connection first
-            - Overflow: Creates temporary connection if pool exhausted
-            - Return: Connection goes back to pool if not full
+            - Overflow: Waits up to wait_timeout, then creates a temporary
+              connection if the pool is still exhausted
+            - Return: An open transaction is rolled back; the connection goes
+              back to the pool if not full and is closed otherwise
         """
-        conn = None
-        try:
-            # Get connection from pool (LIFO)
-            with self._lock:
-                if self._pool:
-                    conn = self._pool.pop()
-                    logger.debug(f"Got connection from pool, pool size: {len(self._pool)}")
-                else:
-                    # Pool exhausted, create temporary connection
-                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    conn.execute("PRAGMA synchronous=NORMAL")
-                    logger.warning("Connection pool exhausted, created temporary connection")
+        start = time.perf_counter()
+        with self._returned:
+            if not self._pool and self.wait_timeout > 0:
+                self._returned.wait_for(lambda: self._pool, timeout=self.wait_timeout)
+            waited = time.perf_counter() - start
+            self.acquisitions += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+            self._in_use += 1
+            if self._pool:
+                # Get connection from pool (LIFO)
+                conn = self._pool.pop()
+                logger.debug(f"Got connection from pool, pool size: {len(self._pool)}")
+            else:
+                conn = None
+                self.overflows += 1
 
-            yield conn
-
-        except Exception as e:
-            # Connection failed, try to return to pool
-            logger.error(f"Connection error: {e}")
-            if conn is not None:
+        if conn is None:
+            # Pool exhausted, create temporary connection
+            try:
+                conn = _connect(self.db_path, self.foreign_keys)
+            except Exception:
                 with self._lock:
-                    if len(self._pool) < self.pool_size:
-                        self._pool.append(conn)
-            raise
+                    self._in_use -= 1
+                raise
+            logger.debug("Connection pool exhausted, created temporary connection")
 
+        try:
+            yield conn
         finally:
-            # Return connection to pool if it's a pooled connection
-            if conn is not None:
-                # Check if this is a pooled connection (not temporary)
-                with self._lock:
-                    # Simple heuristic: if we're at pool capacity, return it
-                    if len(self._pool) < self.pool_size:
-                        # Check if connection is not already in pool
-                        in_pool = any(c is conn for c in self._pool)
-                        if not in_pool:
-                            self._pool.append(conn)
-                            logger.debug(f"Returned connection to pool, pool size: {len(self._pool)}")
+            self._release(conn)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, or close it if the pool is full."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            reusable = True
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding broken connection: {e}")
+            reusable = False
+
+        with self._returned:
+            self._in_use -= 1
+            if reusable and not self._closed and len(self._pool) < self.pool_size:
+                self._pool.append(conn)
+                self._returned.notify()
+                logger.debug(f"Returned connection to pool, pool size: {len(self._pool)}")
+                return
+
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing connection: {e}")
 
     def close_all(self):
-        """Close all connections in pool."""
+        """Close all connections in pool; connections still in use are closed when returned."""
         with self._lock:
             logger.info(f"Closing {len(self._pool)} connections in pool")
+            self._closed = True
             for conn in self._pool:
                 try:
                     conn.close()
@@ -116,9 +176,285 @@ class SQLiteConnectionPool:
         with self._lock:
             return len(self._pool)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with pool size, idle and in-use connections,
+            acquisitions, overflow connections opened and wait times (ms)
+        """
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "available": len(self._pool),
+                "in_use": self._in_use,
+                "acquisitions": self.acquisitions,
+                "overflows": self.overflows,
+                "wait_ms_total": round(self.wait_time_total * 1000, 3),
+                "wait_ms_max": round(self.wait_time_max * 1000, 3),
+                "wait_ms_avg": round(self.wait_time_total * 1000 / self.acquisitions, 3) if self.acquisitions else 0.0
+            }
+
     def __del__(self):
         """Cleanup on object destruction."""
         try:
             self.close_all()
         except Exception:
             pass
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """(device, inode) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class SQLiteDatabasePool:
+    """
+    Pooled read connections plus a single writer connection for one database.
+
+    SQLite allows one writer at a time and, in WAL mode, readers never block
+    it. Writes therefore share one connection under a lock, so concurrent
+    writers queue in-process instead of contending for SQLite's write lock,
+    while reads take any connection from a SQLiteConnectionPool.
+
+    A closed pool reopens its connections on next use, so stores holding
+    it keep working after close_database_pools().
+
+    Usage:
+        db = get_database_pool("./data/memory.db")
+        with db.writer() as conn:   # commits on success, rolls back on error
+            conn.execute("INSERT ...")
+        with db.reader() as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        wait_timeout: float = DEFAULT_POOL_WAIT_MS / 1000,
+        foreign_keys: bool = False
+    ):
+        """
+        Open the writer and read connections.
+
+        Args:
+            db_path: Path to SQLite database file
+            read_pool_size: Number of pooled read connections
+            wait_timeout: Seconds a reader waits for a pooled connection
+                before opening an overflow connection
+            foreign_keys: Enable foreign key constraints (off by default, as
+                for a plain sqlite3.connect())
+        """
+        self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.wait_timeout = wait_timeout
+        self.foreign_keys = foreign_keys
+        self._writer_lock = threading.RLock()
+        self._open()
+        self._identity = _file_identity(db_path)
+        self._data_version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+
+        self._stats_lock = threading.Lock()
+        self.writes = 0
+        self.write_wait_total = 0.0
+        self.write_wait_max = 0.0
+
+    def _open(self) -> None:
+        """Open the writer and read connections (called with the writer lock held, or from __init__)."""
+        # The writer opens first, so it creates the file and switches it to WAL
+        self._writer = _connect(self.db_path, self.foreign_keys)
+        self._readers = SQLiteConnectionPool(self.db_path, self.read_pool_size, self.wait_timeout, self.foreign_keys)
+        self._closed = False
+
+    def _reopen_if_closed(self) -> None:
+        """Reopen the connections after close()."""
+        if self._closed:
+            with self._writer_lock:
+                if self._closed:
+                    logger.info(f"Reopening closed connection pool for {self.db_path}")
+                    self._open()
+
+    @contextmanager
+    def reader(self):
+        """
+        Get a pooled read connection (context manager).
+
+        Yields:
+            sqlite3.Connection: Connection for queries; do not write with it
+        """
+        self._reopen_if_closed()
+        with self._readers.get_connection() as conn:
+            yield conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Get the writer connection (context manager).
+
+        Holds the writer lock for the block, which is reentrant within a
+        thread. Commits when the block exits normally and rolls back if it
+        raises.
+
+        Yields:
+            sqlite3.Connection: The database's writer connection
+        """
+        start = time.perf_counter()
+        with self._writer_lock:
+            self._reopen_if_closed()
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.writes += 1
+                self.write_wait_total += waited
+                self.write_wait_max = max(self.write_wait_max, waited)
+
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def data_version(self) -> int:
+        """
+        PRAGMA data_version of the writer connection.
+
+        Changes whenever another connection, e.g. in another process,
+        commits to the database, but not on this pool's own writes. Never
+        waits for a write in progress: while another thread holds the
+        writer, the value read last is returned, so a foreign commit is
+        noticed once that write finishes.
+
+        Returns:
+            Current data version
+        """
+        if not self._writer_lock.acquire(blocking=False):
+            return self._data_version
+        try:
+            self._reopen_if_closed()
+            self._data_version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            return self._data_version
+        finally:
+            self._writer_lock.release()
+
+    def is_current(self) -> bool:
+        """Whether the pool's file is still the one at db_path (not deleted or replaced)."""
+        return self._identity is not None and _file_identity(self.db_path) == self._identity
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get read pool and writer statistics.
+
+        Returns:
+            Dictionary with "readers" (see SQLiteConnectionPool.get_stats())
+            and "writer" (writes and lock wait times in ms)
+        """
+        with self._stats_lock:
+            writer = {
+                "writes": self.writes,
+                "wait_ms_total": round(self.write_wait_total * 1000, 3),
+                "wait_ms_max": round(self.write_wait_max * 1000, 3),
+                "wait_ms_avg": round(self.write_wait_total * 1000 / self.writes, 3) if self.writes else 0.0
+            }
+        return {"readers": self._readers.get_stats(), "writer": writer}
+
+    def close(self) -> None:
+        """Close the read pool and, once no write is in progress, the writer; both reopen on next use."""
+        with self._writer_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._readers.close_all()
+            try:
+                self._writer.close()
+            except Exception as e:
+                logger.warning(f"Error closing writer connection: {e}")
+
+
+# Shared database pools, by real path
+_database_pools: Dict[str, SQLiteDatabasePool] = {}
+_database_pools_lock = threading.Lock()
+_pool_config: Optional[Dict[str, Any]] = None
+
+
+def _load_pool_config() -> Dict[str, Any]:
+    """Load default database pool settings from rag_config.json."""
+    global _pool_config
+    if _pool_config is None:
+        config = {
+            "sqlite_read_pool_size": DEFAULT_READ_POOL_SIZE,
+            "sqlite_pool_wait_ms": DEFAULT_POOL_WAIT_MS
+        }
+        try:
+            config_path = os.environ.get("RAG_CONFIG_PATH", "./configs/rag_config.json")
+            if os.path.exists(config_path):
+                with open(config_path, 'r') as f:
+                    file_config = json.load(f)
+                for key in config:
+                    if key in file_config:
+                        config[key] = file_config[key]
+        except Exception as e:
+            logger.warning(f"Failed to load connection pool config: {e}, using defaults")
+        _pool_config = config
+    return _pool_config
+
+
+def get_database_pool(db_path: str, read_pool_size: Optional[int] = None) -> SQLiteDatabasePool:
+    """
+    Get the shared connection pool for a database file.
+
+    Every caller opening the same file gets the same pool. If the file was
+    deleted or replaced since its pool was opened, a new pool is opened.
+
+    Args:
+        db_path: Path to SQLite database file
+        read_pool_size: Read connections, used only when the pool is created
+            (default: sqlite_read_pool_size from rag_config.json)
+
+    Returns:
+        SQLiteDatabasePool instance
+    """
+    key = os.path.realpath(db_path)
+    with _database_pools_lock:
+        pool = _database_pools.get(key)
+        if pool is not None and not pool.is_current():
+            # Stores still holding the old pool keep it until they are dropped
+            logger.info(f"Database {db_path} was replaced, opening a new connection pool")
+            pool = None
+        if pool is None:
+            config = _load_pool_config()
+            pool = SQLiteDatabasePool(
+                db_path,
+                read_pool_size=read_pool_size or config["sqlite_read_pool_size"],
+                wait_timeout=config["sqlite_pool_wait_ms"] / 1000
+            )
+            _database_pools[key] = pool
+        return pool
+
+
+def get_database_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics of every shared database pool, by database path."""
+    with _database_pools_lock:
+        pools = list(_database_pools.items())
+    return {path: pool.get_stats() for path, pool in pools}
+
+
+def close_database_pools() -> None:
+    """
+    Close every shared database pool.
+
+    Stores still holding a pool keep working: it reopens its connections
+    on next use, outside the registry (get_database_pool() opens a new one).
+    """
+    with _database_pools_lock:
+        pools = list(_database_pools.values())
+        _database_pools.clear()
+    for pool in pools:
+        pool.close()
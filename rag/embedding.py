@@ -4,22 +4,104 @@ Embedding Service - Uses llama-cpp-python for GGUF embedding models.
 Supports:
 - Local GGUF embedding models (e.g., nomic-embed-text, bge-small)
 - Dynamic model loading via ModelManager
-- Embedding caching for efficiency
+- Embedding caching for efficiency (in memory, optionally persisted on disk)
 - Thread-safe embedding generation
+- Optional multi-process worker pool (embedding_workers) for CPU-only hosts
+- Async micro-batching of concurrent query embeddings (embed_async)
+- ParallelEmbeddingService: sharded embedding under a global concurrency cap
+- EmbeddingMemo: per-request memo so each text is embedded once per tool call
 - Test mode with mock embeddings
 """
 
+import asyncio
+import hashlib
 import json
+import math
 import os
+import sys
 import threading
-from typing import List, Dict, Any, Optional
-from collections import OrderedDict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import OrderedDict, deque
+
+import numpy as np
 
 from .model_manager import get_model_manager, ModelConfig
+from .embedding_pool import EmbeddingWorkerPool
+from .embedding_cache import PersistentEmbeddingCache, model_identity
 from .logger import get_logger
 logger = get_logger(__name__)
 
 
+class _AsyncEmbeddingBatcher:
+    """
+    Coalesces embed_async() calls into batched embed() calls.
+
+    The first text starts a window of `window` seconds; every text submitted
+    before it closes (or until max_batch texts are pending) is embedded with
+    one embed() call in the default executor, and each caller's future is
+    resolved with its own vector. State is bound to the running event loop.
+    """
+
+    def __init__(self, service: "EmbeddingService", window: float, max_batch: int):
+        self._service = service
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.texts = 0
+
+    def submit(self, text: str) -> asyncio.Future:
+        """Queue a text; the returned future resolves to its embedding."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures of another (finished) loop cannot be resolved here
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Close the current window and embed its texts."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = self._loop.create_task(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: List[Tuple[str, asyncio.Future]]) -> None:
+        """Embed one window's texts and resolve their futures."""
+        texts = list(dict.fromkeys(text for text, _ in pending))
+        try:
+            embeddings = await self._loop.run_in_executor(None, self._service.embed, texts)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.texts += len(pending)
+        by_text = dict(zip(texts, embeddings))
+        for text, future in pending:
+            if not future.done():
+                future.set_result(by_text.get(text, []))
+
+
 class EmbeddingService:
     """
     Embedding service using llama-cpp-python with GGUF models.
@@ -33,14 +115,30 @@ class EmbeddingService:
         self.config_path = config_path
         self._load_config()
 
-        # Cache for embeddings
-        self._cache: OrderedDict[str, List[float]] = OrderedDict()
+        # LRU cache of float32 embeddings, bounded by cache_size entries and
+        # cache_max_bytes (most recently used last)
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_bytes = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
 
-        # Model manager
+        # Content-addressed cache shared across restarts
+        # (embedding_disk_cache_enabled), opened on first use
+        self._disk_cache: Optional[PersistentEmbeddingCache] = None
+        self._disk_cache_lock = threading.Lock()
+
+        # Model manager (serializes access to the embedding model)
         self._manager = get_model_manager()
 
-        # Thread lock for safe concurrent access to embedding model
-        self._lock = threading.Lock()
+        # Worker processes with their own models (embedding_workers > 0),
+        # started on first use
+        self._pool: Optional[EmbeddingWorkerPool] = None
+        self._pool_lock = threading.Lock()
+
+        # Coalesces concurrent embed_async() calls
+        self._batcher = _AsyncEmbeddingBatcher(self, self.async_window_ms / 1000.0, self.async_max_batch)
 
         # Test mode: use mock embeddings to avoid model loading issues
         import os
@@ -58,8 +156,19 @@ class EmbeddingService:
         self.model_name = "embedding"
         self.cache_enabled = True
         self.cache_size = 1000
+        self.cache_max_bytes = 64 * 1024 * 1024
         self.n_ctx = 2048
+        self.n_batch = 512
+        self.batch_size = 32
         self.n_gpu_layers = -1
+        self.num_workers = 0
+        self.worker_threads = 0
+        self.async_window_ms = 3.0
+        self.async_max_batch = 32
+        self.max_concurrency = 0
+        self.disk_cache_enabled = False
+        self.disk_cache_path = "./data/embedding_cache.db"
+        self.disk_cache_max_mb = 512
         
         try:
             if os.path.exists(self.config_path):
@@ -69,8 +178,19 @@ class EmbeddingService:
                 self.model_name = config.get("embedding_model_name", "embedding")
                 self.cache_enabled = config.get("embedding_cache_enabled", True)
                 self.cache_size = config.get("embedding_cache_size", 1000)
+                self.cache_max_bytes = int(config.get("embedding_cache_max_mb", 64) * 1024 * 1024)
                 self.n_ctx = config.get("embedding_n_ctx", 2048)
+                self.n_batch = config.get("embedding_n_batch", 512)
+                self.batch_size = config.get("embedding_batch_size", 32)
                 self.n_gpu_layers = config.get("embedding_n_gpu_layers", -1)
+                self.num_workers = config.get("embedding_workers", 0)
+                self.worker_threads = config.get("embedding_worker_threads", 0)
+                self.async_window_ms = config.get("embedding_async_window_ms", 3.0)
+                self.async_max_batch = config.get("embedding_async_max_batch", 32)
+                self.max_concurrency = config.get("embedding_max_concurrency", 0)
+                self.disk_cache_enabled = config.get("embedding_disk_cache_enabled", False)
+                self.disk_cache_path = config.get("embedding_disk_cache_path", "./data/embedding_cache.db")
+                self.disk_cache_max_mb = config.get("embedding_disk_cache_max_mb", 512)
         except Exception as e:
             logger.warning(f"Failed to load config: {e}")
     
@@ -84,6 +204,7 @@ class EmbeddingService:
             model_type="embedding",
             n_ctx=self.n_ctx,
             n_gpu_layers=self.n_gpu_layers,
+            n_batch=self.n_batch,
             embedding=True,
             verbose=False
         )
@@ -93,12 +214,21 @@ class EmbeddingService:
         """
         Set the embedding model to use.
         
+        Stops the worker pool, unloads the previous model and clears the
+        in-memory cache, so no vector of the previous model is served or
+        stored in the disk cache under the new model's identity.
+
         Args:
             model_path: Path to GGUF model file
             model_name: Name identifier for the model
         """
+        previous_name = self.model_name
         self.model_path = model_path
         self.model_name = model_name
+        self._close_pool()
+        self._manager.unload_model(previous_name)
+        self._close_disk_cache()
+        self.clear_cache()
 
         logger.debug(f"Model path: {model_path}")
         if os.path.exists(model_path):
@@ -106,23 +236,60 @@ class EmbeddingService:
         else:
             raise FileNotFoundError(f"Model file not found: {model_path}")
 
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text."""
-        return text.lower().strip()[:500]  # Limit key length
+    def _get_cache_key(self, text: str) -> bytes:
+        """Generate cache key for text (a digest of the exact text)."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup_cache(self, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached embeddings, promoting hits to most recently used.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            {index into texts: embedding} for every hit
+        """
+        hits: Dict[int, List[float]] = {}
+        with self._cache_lock:
+            for idx, text in enumerate(texts):
+                key = self._get_cache_key(text)
+                emb = self._cache.get(key)
+                if emb is None:
+                    self._cache_misses += 1
+                    continue
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                hits[idx] = emb.tolist()
+        return hits
 
     def _update_cache(self, texts: List[str], embeddings: List[List[float]]) -> None:
-        """Update cache with new embeddings."""
+        """Update cache with new embeddings, evicting least recently used ones."""
         if not self.cache_enabled:
             return
 
-        for text, emb in zip(texts, embeddings):
-            key = self._get_cache_key(text)
+        with self._cache_lock:
+            for text, emb in zip(texts, embeddings):
+                if not len(emb):
+                    continue
+                key = self._get_cache_key(text)
+                old = self._cache.pop(key, None)
+                if old is not None:
+                    self._cache_bytes -= self._entry_size(key, old)
+                array = np.asarray(emb, dtype=np.float32)
+                self._cache[key] = array
+                self._cache_bytes += self._entry_size(key, array)
 
-            # Remove oldest if cache is full
-            if len(self._cache) >= self.cache_size:
-                self._cache.popitem(last=False)
+                while self._cache and (len(self._cache) > self.cache_size
+                                       or self._cache_bytes > self.cache_max_bytes):
+                    evicted_key, evicted = self._cache.popitem(last=False)
+                    self._cache_bytes -= self._entry_size(evicted_key, evicted)
+                    self._cache_evictions += 1
 
-            self._cache[key] = emb
+    @staticmethod
+    def _entry_size(key: bytes, array: np.ndarray) -> int:
+        """Approximate memory held by one cache entry."""
+        return sys.getsizeof(key) + sys.getsizeof(array)
 
     def embed(self, texts: List[str]) -> List[List[float]]:
         """
@@ -160,10 +327,10 @@ class EmbeddingService:
 
 
         if self.cache_enabled:
+            hits = self._lookup_cache(texts)
             for idx, text in enumerate(texts):
-                key = self._get_cache_key(text)
-                if key in self._cache:
-                    results[idx] = self._cache[key]
+                if idx in hits:
+                    results[idx] = hits[idx]
                 else:
                     uncached_texts.append(text)
                     uncached_indices.append(idx)
@@ -171,6 +338,17 @@ class EmbeddingService:
             uncached_texts = texts
             uncached_indices = list(range(len(texts)))
 
+        # Then the on-disk cache, which survives restarts
+        disk_cache = self._get_disk_cache() if uncached_texts else None
+        if disk_cache is not None:
+            hits = disk_cache.get_many(uncached_texts)
+            if hits:
+                for i, emb in hits.items():
+                    results[uncached_indices[i]] = emb
+                self._update_cache([uncached_texts[i] for i in hits], list(hits.values()))
+                uncached_texts = [text for i, text in enumerate(uncached_texts) if i not in hits]
+                uncached_indices = [idx for i, idx in enumerate(uncached_indices) if i not in hits]
+
 
         # Generate embeddings for uncached texts (thread-safe)
         if uncached_texts:
@@ -191,12 +369,15 @@ class EmbeddingService:
                         embedding = [x/norm for x in embedding]
                     new_embeddings.append(embedding)
             else:
-                # Use lock to prevent concurrent model access
+                # Token-budgeted batches, at most batch_size texts per model call
                 try:
-                    with self._lock:
+                    if self.num_workers > 0:
+                        new_embeddings = self._get_pool().embed(uncached_texts)
+                    else:
                         new_embeddings = self._manager.generate_embeddings(
                             self.model_name,
-                            uncached_texts
+                            uncached_texts,
+                            max_batch_size=self.batch_size
                         )
                 except FileNotFoundError as e:
                     raise FileNotFoundError(
@@ -214,6 +395,8 @@ class EmbeddingService:
                 results[idx] = emb
 
             self._update_cache(uncached_texts, new_embeddings)
+            if disk_cache is not None:
+                disk_cache.put_many(uncached_texts, new_embeddings)
 
 
         # Return results
@@ -232,22 +415,99 @@ class EmbeddingService:
         embeddings = self.embed([text])
         return embeddings[0] if embeddings else []
 
+    async def embed_async(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text from async code.
+
+        Texts arriving within embedding_async_window_ms of each other (up to
+        embedding_async_max_batch of them) share one batched embed() call,
+        which runs off the event loop.
+
+        Args:
+            text: String to embed
+
+        Returns:
+            Embedding vector as a list of floats
+        """
+        return await self._batcher.submit(text)
+
+    def _get_pool(self) -> EmbeddingWorkerPool:
+        """Get or start the embedding worker pool."""
+        with self._pool_lock:
+            if self._pool is None:
+                logger.info(f"Starting {self.num_workers} embedding worker processes")
+                self._pool = EmbeddingWorkerPool(
+                    self.model_path,
+                    num_workers=self.num_workers,
+                    n_threads=self.worker_threads or None,
+                    n_ctx=self.n_ctx,
+                    n_batch=self.n_batch,
+                    batch_size=self.batch_size
+                )
+            return self._pool
+
+    def _get_disk_cache(self) -> Optional[PersistentEmbeddingCache]:
+        """Get or open the on-disk embedding cache (None when disabled)."""
+        if not self.disk_cache_enabled or self._test_mode:
+            return None
+        with self._disk_cache_lock:
+            if self._disk_cache is None:
+                try:
+                    self._disk_cache = PersistentEmbeddingCache(
+                        os.path.expanduser(self.disk_cache_path),
+                        model_identity(self.model_path, self.n_ctx),
+                        max_bytes=int(self.disk_cache_max_mb * 1024 * 1024)
+                    )
+                except Exception as e:
+                    logger.warning(f"Disabling embedding disk cache: {e}")
+                    self.disk_cache_enabled = False
+            return self._disk_cache
+
+    def _close_disk_cache(self) -> None:
+        """Close the on-disk cache, e.g. because the model changed."""
+        with self._disk_cache_lock:
+            disk_cache, self._disk_cache = self._disk_cache, None
+        if disk_cache is not None:
+            disk_cache.close()
+
     def preload_model(self) -> None:
         """Preload the embedding model into memory."""
         if self.model_path:
-            self._manager.load_model(self.model_name)
+            if self.num_workers > 0:
+                self._get_pool().embed(["warm-up"])
+            else:
+                self._manager.load_model(self.model_name)
     
+    def _close_pool(self) -> None:
+        """Stop the worker pool, if one was started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
     def unload_model(self) -> None:
-        """Unload the embedding model to free memory."""
+        """Unload the embedding model (and stop the worker pool) to free memory."""
+        self._close_pool()
         self._manager.unload_model(self.model_name)
     
     def is_model_loaded(self) -> bool:
         """Check if the embedding model is currently loaded."""
         return self._manager.is_loaded(self.model_name)
     
-    def clear_cache(self) -> None:
-        """Clear embedding cache."""
-        self._cache.clear()
+    def clear_cache(self, persistent: bool = False) -> None:
+        """
+        Clear embedding cache.
+
+        Args:
+            persistent: Also delete the on-disk cache's embeddings
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+        if persistent:
+            disk_cache = self._get_disk_cache()
+            if disk_cache is not None:
+                disk_cache.clear()
         
     def get_stats(self) -> Dict[str, Any]:
         """Get service statistics."""
@@ -256,9 +516,18 @@ class EmbeddingService:
             "cache_size": len(self._cache),
             "cache_enabled": self.cache_enabled,
             "max_cache_size": self.cache_size,
+            "cache_bytes": self._cache_bytes,
+            "max_cache_bytes": self.cache_max_bytes,
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "cache_evictions": self._cache_evictions,
             "model_path": self.model_path,
             "model_name": self.model_name,
             "model_loaded": self._manager.is_loaded(self.model_name),
+            "embedding_workers": self.num_workers if self._pool is not None else 0,
+            "async_batches": self._batcher.batches,
+            "async_texts": self._batcher.texts,
+            "disk_cache": self._disk_cache.get_stats() if self._disk_cache is not None else None,
             "model_info": model_info
         }
     
@@ -311,3 +580,249 @@ def get_embedding_service(config_path: str = "./configs/rag_config.json") -> Emb
     if _embedding_service is None:
         _embedding_service = EmbeddingService(config_path)
     return _embedding_service
+
+
+class EmbeddingMemo:
+    """
+    Per-request embedding memo.
+
+    One tool call may need the same strings embedded by several subsystems
+    (query expansion, retrieval, episode deduplication). Passing one memo
+    through them embeds each distinct text at most once; requested,
+    computed and saved count what was asked for, what reached the
+    embedding service and what the memo answered.
+
+    Usage:
+        memo = EmbeddingMemo()
+        vectors = memo.embed(["query", "query variant"])
+        memo.embed_single("query")   # answered from the memo
+        memo.log_summary("rag.search")
+    """
+
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None):
+        """
+        Initialize an empty memo.
+
+        Args:
+            embedding_service: Service computing misses (default: get_embedding_service(), resolved on first miss)
+        """
+        self._service = embedding_service
+        self._vectors: Dict[str, List[float]] = {}
+        self.requested = 0
+        self.computed = 0
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        """The service computing misses."""
+        if self._service is None:
+            self._service = get_embedding_service()
+        return self._service
+
+    @property
+    def saved(self) -> int:
+        """Embeddings answered by the memo instead of the service."""
+        return self.requested - self.computed
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, computing only those not seen in this request.
+
+        Args:
+            texts: List of strings to embed
+
+        Returns:
+            List of embedding vectors (empty where embedding failed)
+        """
+        missing = [text for text in dict.fromkeys(texts) if text not in self._vectors]
+        if missing:
+            embeddings = self.embedding_service.embed(missing)
+            for text, emb in zip(missing, embeddings):
+                self._vectors[text] = emb
+            self.computed += len(missing)
+        self.requested += len(texts)
+        return [self._vectors.get(text, []) for text in texts]
+
+    def embed_single(self, text: str) -> List[float]:
+        """
+        Embed one text, computing it only if not seen in this request.
+
+        Args:
+            text: String to embed
+
+        Returns:
+            Embedding vector as a list of floats
+        """
+        return self.embed([text])[0]
+
+    async def embed_async(self, text: str) -> List[float]:
+        """
+        Embed one text from async code via the service's embed_async().
+
+        Args:
+            text: String to embed
+
+        Returns:
+            Embedding vector as a list of floats
+        """
+        self.requested += 1
+        if text not in self._vectors:
+            self._vectors[text] = await self.embedding_service.embed_async(text)
+            self.computed += 1
+        return self._vectors[text]
+
+    def log_summary(self, tool_name: str) -> None:
+        """Log how many embeddings the memo saved for a tool call."""
+        if self.saved:
+            logger.info(
+                f"{tool_name}: embedded {self.computed} distinct text(s) for "
+                f"{self.requested} request(s), {self.saved} embedding call(s) saved"
+            )
+        elif self.requested:
+            logger.debug(f"{tool_name}: embedded {self.computed} text(s)")
+
+
+# Default shards in flight without worker processes: while one shard runs
+# the model, another does its cache lookups and conversions
+IN_PROCESS_CONCURRENCY = 2
+
+
+class ParallelEmbeddingService:
+    """
+    Shards embedding requests across worker threads of an EmbeddingService.
+
+    At most max_concurrency shards run at once across every caller of the
+    instance. The default is one per embedding worker process; without
+    workers it is IN_PROCESS_CONCURRENCY, because the in-process model
+    serializes its calls and more threads would only queue on it. Shard
+    sizes adapt to the request: texts are spread over all slots, at most
+    batch_size per shard.
+
+    Usage:
+        service = get_parallel_embedding_service()
+        embeddings = await service.embed_parallel(["Hello world", "Another text"])
+    """
+
+    def __init__(
+        self,
+        embedding_service: Optional[EmbeddingService] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize the parallel embedding service.
+
+        Args:
+            embedding_service: Service that embeds each shard (default: singleton)
+            max_concurrency: Maximum shards in flight (default: embedding_max_concurrency,
+                or the number of embedding worker processes, or
+                IN_PROCESS_CONCURRENCY without workers)
+        """
+        self.embedding_service = embedding_service or get_embedding_service()
+        configured = max_concurrency or getattr(self.embedding_service, "max_concurrency", 0)
+        workers = getattr(self.embedding_service, "num_workers", 0)
+        self.max_concurrency = max(1, configured or workers or IN_PROCESS_CONCURRENCY)
+
+        # The executor's size is the global concurrency cap
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embedding-shard")
+
+        # Per-shard latency (recent shards) and totals
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=256)
+        self._shard_count = 0
+        self._text_count = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Model settings (model_path, n_ctx, batch_size, num_workers, ...)
+        # come from the wrapped service
+        if name == "embedding_service":
+            raise AttributeError(name)
+        return getattr(self.embedding_service, name)
+
+    def _shards(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into contiguous shards, spread over all slots."""
+        batch_size = max(1, int(getattr(self.embedding_service, "batch_size", 32)))
+        size = max(1, min(batch_size, math.ceil(len(texts) / self.max_concurrency)))
+        return [texts[i:i + size] for i in range(0, len(texts), size)]
+
+    def _embed_shard(self, shard: List[str]) -> List[List[float]]:
+        """Embed one shard and record its latency."""
+        start_time = time.perf_counter()
+        embeddings = self.embedding_service.embed(shard)
+        latency = time.perf_counter() - start_time
+        with self._lock:
+            self._latencies.append(latency)
+            self._shard_count += 1
+            self._text_count += len(shard)
+        logger.debug(f"Embedded shard of {len(shard)} texts in {latency * 1000:.1f}ms")
+        return embeddings
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts, shards in parallel.
+
+        Args:
+            texts: List of strings to embed
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        if not texts:
+            return []
+        futures = [self._executor.submit(self._embed_shard, shard) for shard in self._shards(texts)]
+        return [embedding for future in futures for embedding in future.result()]
+
+    def embed_single(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text.
+
+        Args:
+            text: String to embed
+
+        Returns:
+            Embedding vector as a list of floats
+        """
+        embeddings = self.embed([text])
+        return embeddings[0] if embeddings else []
+
+    async def embed_parallel(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings from async code, shards in parallel.
+
+        Args:
+            texts: List of strings to embed
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, self._embed_shard, shard)
+            for shard in self._shards(texts)
+        ))
+        return [embedding for embeddings in results for embedding in embeddings]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get service statistics, including recent per-shard latency."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            shards, texts = self._shard_count, self._text_count
+        return {
+            **self.embedding_service.get_stats(),
+            "max_concurrency": self.max_concurrency,
+            "shards": shards,
+            "texts": texts,
+            "shard_latency_ms_mean": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "shard_latency_ms_p95": 1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+        }
+
+
+_parallel_embedding_service: Optional[ParallelEmbeddingService] = None
+
+
+def get_parallel_embedding_service(config_path: str = "./configs/rag_config.json") -> ParallelEmbeddingService:
+    """Get or create the parallel embedding service singleton."""
+    global _parallel_embedding_service
+    if _parallel_embedding_service is None:
+        _parallel_embedding_service = ParallelEmbeddingService(get_embedding_service(config_path))
+    return _parallel_embedding_service
@@ -0,0 +1,248 @@
+"""
+Persistent Embedding Cache - Content-addressed embeddings on disk.
+
+EmbeddingService's in-memory cache is lost on restart, so re-ingesting an
+unchanged project or repeating a common agent query runs the model again.
+PersistentEmbeddingCache keeps vectors in a SQLite table that survives
+restarts and is shared by every process using the same file:
+
+- Keys are blake2b digests of the model identity and the exact text, so
+  texts are never conflated and a different model never sees stale vectors.
+- Vectors are stored as float32 blobs.
+- The table is bounded by max_bytes of vector data; the least recently
+  used rows are evicted first. A hit only rewrites its row's last_used
+  once it is touch_interval old, so repeated queries stay read-only.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .connection_pool import SQLiteConnectionPool
+from .logger import get_logger
+logger = get_logger(__name__)
+
+# SQLite's default limit on host parameters is 999
+_QUERY_CHUNK = 500
+
+# Eviction frees down to this fraction of max_bytes, so a full cache is not
+# trimmed on every write
+_EVICT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key BLOB PRIMARY KEY,
+    vector BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used);
+"""
+
+
+def model_identity(model_path: str, n_ctx: int) -> str:
+    """
+    Identify an embedding model for cache keys.
+
+    Uses the file name, size and modification time rather than hashing a
+    multi-gigabyte GGUF file; n_ctx is included because it decides where
+    long texts are truncated.
+
+    Args:
+        model_path: Path to the GGUF model file
+        n_ctx: Model context size
+
+    Returns:
+        Identity string
+    """
+    path = os.path.expanduser(model_path)
+    try:
+        stat = os.stat(path)
+        return f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}:{n_ctx}"
+    except OSError:
+        return f"{os.path.basename(path)}:{n_ctx}"
+
+
+class PersistentEmbeddingCache:
+    """
+    Size-bounded, content-addressed embedding cache in SQLite.
+
+    Usage:
+        cache = PersistentEmbeddingCache("./data/embedding_cache.db", model_identity(path, 2048))
+        hits = cache.get_many(texts)          # {index: vector}
+        cache.put_many(missed_texts, vectors)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        model_id: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        pool_size: int = 2,
+        touch_interval: float = 300.0
+    ):
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            model_id: Model identity mixed into every key (see model_identity())
+            max_bytes: Upper bound on stored vector bytes
+            pool_size: Number of pooled SQLite connections
+            touch_interval: Seconds a hit's last_used may lag before the hit
+                writes it again (the LRU order's resolution)
+        """
+        self.db_path = db_path
+        self.model_id = model_id
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._prefix = model_id.encode("utf-8") + b"\0"
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._pool = SQLiteConnectionPool(db_path, pool_size=pool_size)
+        with self._pool.get_connection() as conn:
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str) -> bytes:
+        """Content hash of a text under this cache's model."""
+        return hashlib.blake2b(self._prefix + text.encode("utf-8"), digest_size=20).digest()
+
+    def get_many(self, texts: Sequence[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached embeddings and mark them as recently used.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            {index into texts: embedding} for every hit
+        """
+        keys = [self.key(text) for text in texts]
+        found: Dict[bytes, List[float]] = {}
+        now = time.time()
+        stale: List[bytes] = []
+        with self._pool.get_connection() as conn:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[start:start + _QUERY_CHUNK]
+                rows = conn.execute(
+                    f"SELECT key, vector, last_used FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, blob, last_used in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32).tolist()
+                    if now - last_used >= self.touch_interval:
+                        stale.append(bytes(key))
+            if stale:
+                # One write per touch_interval per row, not per hit
+                conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in stale])
+                conn.commit()
+
+        hits = {i: found[key] for i, key in enumerate(keys) if key in found}
+        with self._lock:
+            self.hits += len(hits)
+            self.misses += len(texts) - len(hits)
+        return hits
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """
+        Store embeddings, evicting least recently used rows when over budget.
+
+        Empty embeddings (failed texts) and texts already cached are not
+        stored.
+
+        Args:
+            texts: Embedded texts
+            embeddings: One embedding per text
+        """
+        now = time.time()
+        rows = {}
+        for text, embedding in zip(texts, embeddings):
+            if len(embedding):
+                blob = np.asarray(embedding, dtype=np.float32).tobytes()
+                rows[self.key(text)] = (blob, len(blob), now)
+        if not rows:
+            return
+
+        with self._pool.get_connection() as conn:
+            # A key already stored holds the same vector (keys are content
+            # hashes), so only new keys are written and counted
+            keys = list(rows)
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                for (key,) in conn.execute(
+                    f"SELECT key FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ):
+                    rows.pop(bytes(key), None)
+            if not rows:
+                return
+            conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)",
+                [(key,) + row for key, row in rows.items()]
+            )
+            conn.commit()
+            with self._lock:
+                self._bytes += sum(size for _, size, _ in rows.values())
+                over_budget = self._bytes > self.max_bytes
+            if over_budget:
+                self._evict(conn)
+
+    def _evict(self, conn) -> None:
+        """Delete least recently used rows down to _EVICT_TO of max_bytes."""
+        # Other processes may share the file, so recount before trimming
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        target = int(self.max_bytes * _EVICT_TO)
+        doomed = []
+        if total > self.max_bytes:
+            for key, size in conn.execute("SELECT key, size FROM embeddings ORDER BY last_used"):
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM embeddings WHERE key = ?", doomed)
+            conn.commit()
+            logger.debug(f"Evicted {len(doomed)} embeddings from {self.db_path}")
+
+        with self._lock:
+            self._bytes = total
+            self.evictions += len(doomed)
+
+    def clear(self) -> None:
+        """Delete every cached embedding."""
+        with self._pool.get_connection() as conn:
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+        with self._lock:
+            self._bytes = 0
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._pool.close_all()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        with self._pool.get_connection() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        with self._lock:
+            return {
+                "entries": entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
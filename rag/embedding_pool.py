@@ -0,0 +1,276 @@
+"""
+Embedding Worker Pool - Multi-process embedding for CPU-only hosts.
+
+A llama-cpp model serializes on ModelManager's lock, so one EmbeddingService
+keeps one core busy. EmbeddingWorkerPool starts N worker processes, each
+loading its own copy of the GGUF embedding model with its own thread count,
+and spreads every embed() call across them:
+
+- Texts are UTF-8 encoded into one shared-memory buffer; workers receive
+  only its name and the (start, end) byte spans of their texts.
+- Texts are dealt to workers round-robin in length order, so every worker
+  gets a similar token load.
+- Each worker embeds its shard with ModelManager.generate_embeddings
+  (token-budgeted batches) and writes the vectors to a shared-memory
+  float32 block that the parent copies out and unlinks.
+- Results are gathered back into input order.
+- If a worker dies or fails to load the model, the executor is replaced
+  with fresh workers, so one failure does not break every later call.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .logger import get_logger
+from .model_manager import ModelConfig, ModelManager
+logger = get_logger(__name__)
+
+# Model name inside each worker's ModelManager
+WORKER_MODEL_NAME = "embedding"
+
+# Per-process state of a pool worker (set by _init_worker)
+_worker_manager: Optional[ModelManager] = None
+_worker_batch_size: Optional[int] = None
+
+# (shared-memory name or None, rows, dim, rows whose embedding failed)
+SharedVectors = Tuple[Optional[str], int, int, List[int]]
+
+
+def pack_texts(texts: Sequence[str]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Encode texts into a new shared-memory buffer.
+
+    Args:
+        texts: Texts to pack
+
+    Returns:
+        (buffer, int64 offsets) where text i is buffer[offsets[i]:offsets[i + 1]];
+        the caller closes and unlinks the buffer
+    """
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    buffer = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+    buffer.buf[:int(offsets[-1])] = b"".join(encoded)
+    return buffer, offsets
+
+
+def unpack_texts(buffer: memoryview, spans: Sequence[Tuple[int, int]]) -> List[str]:
+    """Decode the texts at the given (start, end) byte spans of a buffer."""
+    return [bytes(buffer[start:end]).decode("utf-8") for start, end in spans]
+
+
+def share_vectors(vectors: Sequence[Sequence[float]]) -> SharedVectors:
+    """
+    Copy embeddings into a new shared-memory float32 block.
+
+    Args:
+        vectors: One embedding per text (empty where embedding failed)
+
+    Returns:
+        SharedVectors describing the block; the reader unlinks it
+    """
+    failed = [i for i, vector in enumerate(vectors) if not len(vector)]
+    dim = next((len(vector) for vector in vectors if len(vector)), 0)
+    if not dim:
+        return None, len(vectors), 0, failed
+
+    block = shared_memory.SharedMemory(create=True, size=len(vectors) * dim * 4)
+    array = np.ndarray((len(vectors), dim), dtype=np.float32, buffer=block.buf)
+    array[:] = 0.0
+    for i, vector in enumerate(vectors):
+        if len(vector):
+            array[i] = vector
+    del array
+    block.close()
+    return block.name, len(vectors), dim, failed
+
+
+def collect_vectors(shared: SharedVectors) -> List[List[float]]:
+    """
+    Read embeddings written by share_vectors() and unlink their block.
+
+    Args:
+        shared: SharedVectors returned by share_vectors()
+
+    Returns:
+        One embedding per text (empty where embedding failed)
+    """
+    name, rows, dim, failed = shared
+    if name is None:
+        return [[] for _ in range(rows)]
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        array = np.ndarray((rows, dim), dtype=np.float32, buffer=block.buf)
+        vectors = array.tolist()
+        del array
+    finally:
+        block.close()
+        block.unlink()
+    for i in failed:
+        vectors[i] = []
+    return vectors
+
+
+def _init_worker(model_path: str, n_ctx: int, n_batch: int, n_threads: int, batch_size: int) -> None:
+    """Pool initializer: load this worker's copy of the embedding model."""
+    global _worker_manager, _worker_batch_size
+    manager = ModelManager(config_path="")
+    manager.register_model(WORKER_MODEL_NAME, ModelConfig(
+        path=model_path,
+        model_type="embedding",
+        n_ctx=n_ctx,
+        n_gpu_layers=0,
+        n_batch=n_batch,
+        embedding=True,
+        verbose=False,
+        n_threads=n_threads
+    ))
+    manager.load_model(WORKER_MODEL_NAME)
+    _worker_manager = manager
+    _worker_batch_size = batch_size
+
+
+def _embed_shard(buffer_name: str, spans: List[Tuple[int, int]]) -> SharedVectors:
+    """Worker task: embed the texts at the given spans of a packed buffer."""
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    try:
+        texts = unpack_texts(buffer.buf, spans)
+    finally:
+        buffer.close()
+    vectors = _worker_manager.generate_embeddings(WORKER_MODEL_NAME, texts, max_batch_size=_worker_batch_size)
+    return share_vectors(vectors)
+
+
+class EmbeddingWorkerPool:
+    """
+    Pool of worker processes, each with its own embedding model.
+
+    Usage:
+        pool = EmbeddingWorkerPool("~/models/bge-m3-q8_0.gguf", num_workers=4)
+        embeddings = pool.embed(["Hello world", "Another text"])
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        num_workers: int,
+        n_threads: Optional[int] = None,
+        n_ctx: int = 2048,
+        n_batch: int = 512,
+        batch_size: int = 32
+    ):
+        """
+        Initialize the pool. Workers start (and load the model) on first use.
+
+        Args:
+            model_path: Path to the GGUF embedding model
+            num_workers: Number of worker processes
+            n_threads: llama-cpp threads per worker (default: cores / workers)
+            n_ctx: Model context size
+            n_batch: Token budget per model call
+            batch_size: Maximum texts per model call
+        """
+        self.model_path = os.path.expanduser(model_path)
+        self.num_workers = max(1, num_workers)
+        self.n_threads = n_threads or max(1, (os.cpu_count() or 1) // self.num_workers)
+        self._initargs = (self.model_path, n_ctx, n_batch, self.n_threads, batch_size)
+
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.restarts = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        """Create the worker processes' executor (workers start on first submit)."""
+        # spawn: llama-cpp's threads do not survive fork()
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self._initargs
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor, error: BaseException) -> None:
+        """
+        Replace a broken executor with fresh workers.
+
+        Args:
+            broken: The executor that raised BrokenProcessPool
+            error: The error it raised
+        """
+        with self._lock:
+            if self._closed or self._executor is not broken:
+                # Closed, or another caller already replaced it
+                return
+            logger.warning(f"Embedding worker pool broke ({error}); starting new workers")
+            self._executor = self._new_executor()
+            self.restarts += 1
+        broken.shutdown(wait=False)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts across the worker processes.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding per text, in input order (empty where embedding failed)
+        """
+        if not texts:
+            return []
+        if self._closed:
+            raise RuntimeError("Embedding worker pool is closed")
+
+        executor = self._executor
+        buffer, offsets = pack_texts(texts)
+        try:
+            order = np.argsort(offsets[1:] - offsets[:-1], kind="stable")
+            shards = [order[k::self.num_workers].tolist() for k in range(min(self.num_workers, len(texts)))]
+            try:
+                futures = [
+                    executor.submit(_embed_shard, buffer.name, [(int(offsets[i]), int(offsets[i + 1])) for i in shard])
+                    for shard in shards
+                ]
+            except BrokenProcessPool as e:
+                self._restart(executor, e)
+                raise
+
+            # Wait for every shard so no result block is left behind
+            results: List[List[float]] = [[] for _ in texts]
+            error: Optional[BaseException] = None
+            for shard, future in zip(shards, futures):
+                try:
+                    vectors = collect_vectors(future.result())
+                except Exception as e:
+                    error = error or e
+                    continue
+                for i, vector in zip(shard, vectors):
+                    results[i] = vector
+            if error is not None:
+                if isinstance(error, BrokenProcessPool):
+                    # This call fails; the next one gets fresh workers
+                    self._restart(executor, error)
+                raise error
+            return results
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True)
@@ -30,10 +30,12 @@ Note: These are lessons from experience, not guaranteed facts.
 "
 """
 
-import sqlite3
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 
+from .connection_pool import get_database_pool
+from .episodic_store import FTS_TABLE, fts_any_term_query, has_fts_index
+
 
 class EpisodicReader:
     """
@@ -62,14 +64,22 @@ class EpisodicReader:
     # Maximum episodes to include in context
     MAX_EPISODES_IN_CONTEXT = 5
 
-    def __init__(self, db_path: str = "./data/episodic.db"):
+    def __init__(self, db_path: str = "./data/episodic.db", pool_size: Optional[int] = None):
         """
         Initialize episodic reader.
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Pooled read connections (default: sqlite_read_pool_size
+                from rag_config.json)
         """
         self.db_path = db_path
+        self.pool_size = pool_size
+
+    @property
+    def _db(self):
+        """Shared connection pool of the episodic database, opened on first use."""
+        return get_database_pool(self.db_path, self.pool_size)
 
     def get_relevant_episodes(
         self,
@@ -92,11 +102,12 @@ class EpisodicReader:
         # In production, could use embeddings or semantic search
         episodes = []
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             # Extract keywords from task description
             keywords = self._extract_keywords(task_description)
+            match = fts_any_term_query(keywords)
 
             if not keywords:
                 # If no keywords, return recent high-confidence episodes
@@ -107,6 +118,16 @@ class EpisodicReader:
                        ORDER BY confidence DESC, created_at DESC LIMIT ?""",
                     (min_confidence, limit)
                 )
+            elif match is not None and has_fts_index(conn):
+                # Keyword matches from the full-text index; BM25 breaks
+                # confidence ties in place of recency
+                cursor.execute(
+                    f"""SELECT e.id, e.situation, e.action, e.outcome, e.lesson, e.confidence, e.created_at
+                       FROM {FTS_TABLE} f JOIN episodic_memory e ON e.rowid = f.rowid
+                       WHERE {FTS_TABLE} MATCH ? AND e.confidence >= ?
+                       ORDER BY e.confidence DESC, bm25({FTS_TABLE}), e.created_at DESC LIMIT ?""",
+                    (match, min_confidence, limit)
+                )
             else:
                 # Search for episodes with matching keywords
                 # Match in lesson or situation
@@ -203,7 +224,7 @@ class EpisodicReader:
         Returns:
             Dictionary with summary statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             # Total episodes
@@ -232,7 +253,8 @@ class EpisodicReader:
                 "average_confidence": round(avg_confidence, 3),
                 "recent_episodes_30_days": recent_episodes,
                 "high_confidence_episodes": high_conf_episodes,
-                "db_path": self.db_path
+                "db_path": self.db_path,
+                "connection_pool": self._db.get_stats()
             }
 
     def list_episodes_by_confidence(
@@ -252,7 +274,7 @@ class EpisodicReader:
         Returns:
             List of episode dicts
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
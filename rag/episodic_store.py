@@ -24,13 +24,78 @@ Episodic memory boundaries:
 - CAN improve planning
 """
 
-import sqlite3
 import json
+import sqlite3
 import uuid
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .connection_pool import get_database_pool
+from .logger import get_logger
+logger = get_logger(__name__)
+
+# Full-text index over situation and lesson. The trigram tokenizer matches
+# substrings, like the LIKE '%...%' filters it replaces, for terms of at
+# least FTS_MIN_TERM_LENGTH characters.
+FTS_TABLE = "episodic_fts"
+FTS_MIN_TERM_LENGTH = 3
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS episodic_fts USING fts5(
+    situation,
+    lesson,
+    content='episodic_memory',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS episodic_fts_insert
+AFTER INSERT ON episodic_memory
+BEGIN
+    INSERT INTO episodic_fts(rowid, situation, lesson)
+    VALUES (NEW.rowid, NEW.situation, NEW.lesson);
+END;
+
+CREATE TRIGGER IF NOT EXISTS episodic_fts_delete
+AFTER DELETE ON episodic_memory
+BEGIN
+    INSERT INTO episodic_fts(episodic_fts, rowid, situation, lesson)
+    VALUES ('delete', OLD.rowid, OLD.situation, OLD.lesson);
+END;
+
+CREATE TRIGGER IF NOT EXISTS episodic_fts_update
+AFTER UPDATE OF situation, lesson ON episodic_memory
+BEGIN
+    INSERT INTO episodic_fts(episodic_fts, rowid, situation, lesson)
+    VALUES ('delete', OLD.rowid, OLD.situation, OLD.lesson);
+    INSERT INTO episodic_fts(rowid, situation, lesson)
+    VALUES (NEW.rowid, NEW.situation, NEW.lesson);
+END;
+"""
+
+
+def has_fts_index(conn: sqlite3.Connection) -> bool:
+    """Whether the episodic database on this connection has the full-text index."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone() is not None
+
+
+def fts_any_term_query(terms: Iterable[str]) -> Optional[str]:
+    """
+    Build an FTS5 MATCH expression matching any of the terms as a substring.
+
+    Args:
+        terms: Search terms
+
+    Returns:
+        MATCH expression, or None if a term is too short for the trigram index
+    """
+    terms = list(terms)
+    if not terms or any(len(term) < FTS_MIN_TERM_LENGTH for term in terms):
+        return None
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
 
 class Episode:
     """
@@ -130,15 +195,18 @@ class EpisodicStore:
         >>> store.store_episode(episode)
     """
 
-    def __init__(self, db_path: str = "./data/episodic.db"):
+    def __init__(self, db_path: str = "./data/episodic.db", pool_size: Optional[int] = None):
         """
         Initialize episodic store.
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Pooled read connections (default: sqlite_read_pool_size
+                from rag_config.json)
         """
         self.db_path = db_path
         self._ensure_db_directory()
+        self._db = get_database_pool(db_path, pool_size)
         self._init_db()
 
     def _ensure_db_directory(self) -> None:
@@ -149,9 +217,30 @@ class EpisodicStore:
         """Initialize database schema."""
         schema = self._get_schema()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.writer() as conn:
             conn.executescript(schema)
-            conn.commit()
+            self.fts_enabled = self._init_fts(conn)
+
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        Create the full-text index, indexing existing episodes if it is new.
+
+        Args:
+            conn: Writer connection
+
+        Returns:
+            True if the index is available, False if this SQLite build
+            lacks FTS5 or the trigram tokenizer (queries then use LIKE)
+        """
+        if has_fts_index(conn):
+            return True
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text index unavailable for {self.db_path}, using LIKE scans: {e}")
+            return False
+        return True
 
     def _get_schema(self) -> str:
         """Get database schema."""
@@ -201,7 +290,7 @@ class EpisodicStore:
         if not episode.validate():
             raise ValueError("Episode validation failed: lesson not abstracted or missing required fields")
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.writer() as conn:
             cursor = conn.cursor()
 
             # Insert episode
@@ -213,14 +302,62 @@ class EpisodicStore:
                  episode.lesson, episode.confidence, episode.created_at)
             )
 
-            conn.commit()
-
             # Return the stored episode
-            result = self.get_episode(episode.id)
+            result = self._fetch_episode(conn, episode.id)
             if result is None:
                 raise RuntimeError(f"Failed to retrieve stored episode {episode.id}")
             return result
 
+    def store_episodes_bulk(self, episodes: List[Episode]) -> List[Episode]:
+        """
+        Store many episodes in one transaction.
+
+        An episode whose id already exists replaces the stored one.
+
+        Args:
+            episodes: Episodes to store
+
+        Returns:
+            The stored Episode for each input episode, in input order
+
+        Raises:
+            ValueError: If any episode fails validation (nothing is stored)
+        """
+        for episode in episodes:
+            if not episode.validate():
+                raise ValueError("Episode validation failed: lesson not abstracted or missing required fields")
+        if not episodes:
+            return []
+
+        with self._db.writer() as conn:
+            conn.executemany(
+                """INSERT INTO episodic_memory
+                   (id, project_id, situation, action, outcome, lesson, confidence, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       project_id = excluded.project_id,
+                       situation = excluded.situation,
+                       action = excluded.action,
+                       outcome = excluded.outcome,
+                       lesson = excluded.lesson,
+                       confidence = excluded.confidence""",
+                [
+                    (episode.id, episode.project_id, episode.situation, episode.action, episode.outcome,
+                     episode.lesson, episode.confidence, episode.created_at)
+                    for episode in episodes
+                ]
+            )
+
+            stored: Dict[str, Episode] = {}
+            for episode in episodes:
+                if episode.id not in stored:
+                    result = self._fetch_episode(conn, episode.id)
+                    if result is None:
+                        raise RuntimeError(f"Failed to retrieve stored episode {episode.id}")
+                    stored[episode.id] = result
+
+        return [stored[episode.id] for episode in episodes]
+
     def get_episode(self, episode_id: str) -> Optional[Episode]:
         """
         Retrieve an episode by ID.
@@ -231,30 +368,35 @@ class EpisodicStore:
         Returns:
             Episode if found, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """SELECT id, project_id, situation, action, outcome, lesson, confidence, created_at
-                   FROM episodic_memory WHERE id = ?""",
-                (episode_id,)
-            )
-            
-            row = cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            return Episode(
-                id=row[0],
-                project_id=row[1],
-                situation=row[2],
-                action=row[3],
-                outcome=row[4],
-                lesson=row[5],
-                confidence=row[6],
-                created_at=row[7]
-            )
+        with self._db.reader() as conn:
+            return self._fetch_episode(conn, episode_id)
+
+    @staticmethod
+    def _fetch_episode(conn, episode_id: str) -> Optional[Episode]:
+        """Read an episode by ID on the given connection."""
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """SELECT id, project_id, situation, action, outcome, lesson, confidence, created_at
+               FROM episodic_memory WHERE id = ?""",
+            (episode_id,)
+        )
+
+        row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        return Episode(
+            id=row[0],
+            project_id=row[1],
+            situation=row[2],
+            action=row[3],
+            outcome=row[4],
+            lesson=row[5],
+            confidence=row[6],
+            created_at=row[7]
+        )
 
     def query_episodes(
         self,
@@ -277,7 +419,7 @@ class EpisodicStore:
         Returns:
             List of matching Episode objects
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             # Build query dynamically
@@ -296,7 +438,11 @@ class EpisodicStore:
             params.append(float(min_confidence))
             
             if situation_contains:
-                conditions.append("situation LIKE ?")
+                if self.fts_enabled:
+                    # The trigram index answers LIKE on its own columns
+                    conditions.append(f"rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE situation LIKE ?)")
+                else:
+                    conditions.append("situation LIKE ?")
                 params.append(f"%{situation_contains}%")
             
             where_clause = " AND ".join(conditions) if conditions else "1=1"
@@ -343,7 +489,7 @@ class EpisodicStore:
         Returns:
             List of recent Episode objects
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -382,12 +528,11 @@ class EpisodicStore:
         Returns:
             True if deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.writer() as conn:
             cursor = conn.cursor()
 
             cursor.execute("DELETE FROM episodic_memory WHERE id = ?", (episode_id,))
             deleted = cursor.rowcount > 0
-            conn.commit()
 
             return deleted
 
@@ -398,7 +543,7 @@ class EpisodicStore:
         Returns:
             Dictionary with statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             # Total episodes
@@ -438,7 +583,8 @@ class EpisodicStore:
                 "by_confidence": by_confidence,
                 "oldest_episode": oldest_newest[0],
                 "newest_episode": oldest_newest[1],
-                "db_path": self.db_path
+                "db_path": self.db_path,
+                "connection_pool": self._db.get_stats()
             }
 
     def cleanup_old_episodes(self, days: int = 90, min_confidence: float = 0.5) -> int:
@@ -452,7 +598,7 @@ class EpisodicStore:
         Returns:
             Number of episodes deleted
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.writer() as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -463,7 +609,6 @@ class EpisodicStore:
             )
 
             deleted_count = cursor.rowcount
-            conn.commit()
 
             return deleted_count
 
@@ -472,17 +617,18 @@ class EpisodicStore:
 _episodic_store: Optional[EpisodicStore] = None
 
 
-def get_episodic_store(db_path: str = "./data/episodic.db") -> EpisodicStore:
+def get_episodic_store(db_path: str = "./data/episodic.db", pool_size: Optional[int] = None) -> EpisodicStore:
     """
     Get or create the episodic store singleton.
 
     Args:
         db_path: Path to SQLite database file
+        pool_size: Pooled read connections (default from rag_config.json)
 
     Returns:
         EpisodicStore instance
     """
     global _episodic_store
     if _episodic_store is None:
-        _episodic_store = EpisodicStore(db_path)
+        _episodic_store = EpisodicStore(db_path, pool_size)
     return _episodic_store
@@ -4,13 +4,17 @@ Document Ingestion - Single file ingestion with chunking.
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from pathlib import Path
 
+from .chunking import ENCODINGS, detect_encoding, iter_chunks, iter_file_blocks, iter_paragraphs, iter_text_chunks
 from .retriever import get_retriever
 from .logger import get_logger
 logger = get_logger(__name__)
 
+# Chunks added to the index together by ingest_file()
+INGEST_BATCH_CHUNKS = 1024
+
 
 def chunk_text(
     text: str,
@@ -30,65 +34,13 @@ def chunk_text(
     """
     if not text:
         return []
-    
-    # Split by paragraphs first
-    paragraphs = text.split('\n\n')
-    
-    chunks = []
-    current_chunk = ""
-    
-    for para in paragraphs:
-        para = para.strip()
-        if not para:
-            continue
-        
-        # If adding this paragraph exceeds chunk size
-        if len(current_chunk) + len(para) + 2 > chunk_size:
-            # Save current chunk if not empty
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            
-            # If paragraph itself is too long, split it
-            if len(para) > chunk_size:
-                # Split by sentences or fixed size
-                words = para.split()
-                current_chunk = ""
-                for word in words:
-                    if len(current_chunk) + len(word) + 1 > chunk_size:
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                        current_chunk = word
-                    else:
-                        current_chunk = f"{current_chunk} {word}".strip()
-            else:
-                current_chunk = para
-        else:
-            current_chunk = f"{current_chunk}\n\n{para}".strip()
-    
-    # Don't forget the last chunk
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-    
-    # Apply overlap
-    if chunk_overlap > 0 and len(chunks) > 1:
-        overlapped = []
-        for i, chunk in enumerate(chunks):
-            if i > 0:
-                # Get overlap from previous chunk
-                prev_chunk = chunks[i-1]
-                overlap_text = prev_chunk[-chunk_overlap:] if len(prev_chunk) > chunk_overlap else prev_chunk
-                chunk = f"...{overlap_text}...\n{chunk}"
-            overlapped.append(chunk)
-        chunks = overlapped
-    
-    return chunks
+
+    return list(iter_chunks(iter_paragraphs([text]), chunk_size, chunk_overlap, split_long="words"))
 
 
 def read_file(file_path: str) -> str:
     """Read file content with encoding detection."""
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
-    
-    for encoding in encodings:
+    for encoding in ENCODINGS:
         try:
             with open(file_path, 'r', encoding=encoding) as f:
                 return f.read()
@@ -126,42 +78,68 @@ def ingest_file(
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    # Read file content
-    content = read_file(str(path))
-    
-    if not content.strip():
+    # Count chunks first (for total_chunks), then stream them into the
+    # index in batches, so large files never sit in memory whole
+    encoding = detect_encoding(str(path))
+    total_chunks = sum(1 for _ in _iter_file_chunks(str(path), chunk_size, chunk_overlap, encoding))
+
+    if not total_chunks:
         logger.warning(f"Empty file: {file_path}")
         return 0
-    
-    # Chunk the content
-    chunks = chunk_text(content, chunk_size, chunk_overlap)
-    
-    if not chunks:
-        return 0
-    
+
     # Prepare metadata for each chunk
     base_metadata = {
         "source": str(path.absolute()),
         "filename": path.name,
         "extension": path.suffix.lower(),
     }
-    
+
     if metadata:
         base_metadata.update(metadata)
-    
+
+    retriever = get_retriever(config_path)
+    count = 0
+    start_index = 0
+    batch: List[str] = []
+    for chunk in _iter_file_chunks(str(path), chunk_size, chunk_overlap, encoding):
+        batch.append(chunk)
+        if len(batch) >= INGEST_BATCH_CHUNKS:
+            count += _add_chunk_batch(retriever, batch, start_index, total_chunks, base_metadata)
+            start_index += len(batch)
+            batch = []
+    if batch:
+        count += _add_chunk_batch(retriever, batch, start_index, total_chunks, base_metadata)
+
+    logger.info(f"Ingested {count} chunks from {path.name}")
+    return count
+
+
+def _add_chunk_batch(
+    retriever,
+    chunks: List[str],
+    start_index: int,
+    total_chunks: int,
+    base_metadata: Dict[str, Any]
+) -> int:
+    """Add consecutive chunks of one file to the index; returns the number added."""
     chunk_metadata = []
-    for i, chunk in enumerate(chunks):
+    for i in range(start_index, start_index + len(chunks)):
         meta = base_metadata.copy()
         meta["chunk_index"] = i
-        meta["total_chunks"] = len(chunks)
+        meta["total_chunks"] = total_chunks
         chunk_metadata.append(meta)
-    
-    # Add to index
-    retriever = get_retriever(config_path)
-    count = retriever.add_documents(chunks, chunk_metadata)
-    
-    logger.info(f"Ingested {count} chunks from {path.name}")
-    return count
+    return retriever.add_documents(chunks, chunk_metadata)
+
+
+def _iter_file_chunks(
+    file_path: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    encoding: Optional[str] = None
+) -> Iterator[str]:
+    """Lazily chunk a file as chunk_text() would chunk its content."""
+    blocks = iter_file_blocks(file_path, encoding=encoding)
+    return iter_text_chunks(blocks, chunk_size, chunk_overlap, split_long="words")
 
 
 def ingest_text(
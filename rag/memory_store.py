@@ -11,13 +11,97 @@ Design Principles (NON-NEGOTIABLE):
 Every memory entry MUST have: scope, category, confidence, source
 """
 
-import sqlite3
 import json
+import sqlite3
+import threading
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
+import weakref
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from .connection_pool import SQLiteDatabasePool, get_database_pool
+from .logger import get_logger
+logger = get_logger(__name__)
+
+# Full-text index over fact keys and values. The trigram tokenizer matches
+# substrings of at least FTS_MIN_QUERY_LENGTH characters.
+FTS_TABLE = "memory_facts_fts"
+FTS_MIN_QUERY_LENGTH = 3
+
+# BM25 weights of the key and value columns
+FTS_KEY_WEIGHT = 2.0
+FTS_VALUE_WEIGHT = 1.0
+
+# Most (scope, min_confidence) fact lists kept by the read-through cache
+FACT_CACHE_MAX_ENTRIES = 256
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memory_facts_fts USING fts5(
+    key,
+    value,
+    content='memory_facts',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS memory_facts_fts_insert
+AFTER INSERT ON memory_facts
+BEGIN
+    INSERT INTO memory_facts_fts(rowid, key, value)
+    VALUES (NEW.rowid, NEW.key, NEW.value);
+END;
+
+CREATE TRIGGER IF NOT EXISTS memory_facts_fts_delete
+AFTER DELETE ON memory_facts
+BEGIN
+    INSERT INTO memory_facts_fts(memory_facts_fts, rowid, key, value)
+    VALUES ('delete', OLD.rowid, OLD.key, OLD.value);
+END;
+
+CREATE TRIGGER IF NOT EXISTS memory_facts_fts_update
+AFTER UPDATE OF key, value ON memory_facts
+BEGIN
+    INSERT INTO memory_facts_fts(memory_facts_fts, rowid, key, value)
+    VALUES ('delete', OLD.rowid, OLD.key, OLD.value);
+    INSERT INTO memory_facts_fts(rowid, key, value)
+    VALUES (NEW.rowid, NEW.key, NEW.value);
+END;
+"""
+
+
+class _FactCache:
+    """
+    Read-through cache of fact lists by (scope, min_confidence), shared by
+    every MemoryStore on one database.
+
+    Entries are tagged with their scope's generation (None = all scopes),
+    which writes bump once committed. Commits by other processes change
+    the writer connection's PRAGMA data_version, which clears the cache.
+    """
+
+    def __init__(self, data_version: int):
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple[Optional[str], float], Tuple[int, List["MemoryFact"]]] = {}
+        self.generations: Dict[Optional[str], int] = {}
+        self.data_version = data_version
+        self.hits = 0
+        self.misses = 0
+
+
+# Fact caches by database pool
+_fact_caches: "weakref.WeakKeyDictionary[SQLiteDatabasePool, _FactCache]" = weakref.WeakKeyDictionary()
+_fact_caches_lock = threading.Lock()
+
+
+def _get_fact_cache(db: SQLiteDatabasePool) -> _FactCache:
+    """Get the fact cache shared by the stores on a database."""
+    with _fact_caches_lock:
+        cache = _fact_caches.get(db)
+        if cache is None:
+            cache = _fact_caches[db] = _FactCache(db.data_version())
+        return cache
+
 
 class MemoryFact:
     """
@@ -125,16 +209,20 @@ class MemoryStore:
     # Valid source values
     VALID_SOURCES = {"user", "agent", "tool"}
 
-    def __init__(self, db_path: str = "./data/memory.db"):
+    def __init__(self, db_path: str = "./data/memory.db", pool_size: Optional[int] = None):
         """
         Initialize memory store.
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Pooled read connections (default: sqlite_read_pool_size
+                from rag_config.json)
         """
         self.db_path = db_path
         self._ensure_db_directory()
+        self._db = get_database_pool(db_path, pool_size)
         self._init_db()
+        self._cache = _get_fact_cache(self._db)
 
     def _ensure_db_directory(self) -> None:
         """Ensure database directory exists."""
@@ -145,7 +233,7 @@ class MemoryStore:
         # Read schema file if it exists, otherwise use inline schema
         schema_path = Path(__file__).parent.parent / "data" / "memory_db_schema.sql"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.writer() as conn:
             if schema_path.exists():
                 with open(schema_path, 'r') as f:
                     schema = f.read()
@@ -153,7 +241,31 @@ class MemoryStore:
             else:
                 # Inline schema as fallback
                 conn.executescript(self._get_inline_schema())
-            conn.commit()
+            self.fts_enabled = self._init_fts(conn)
+
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        Create the full-text index, indexing existing facts if it is new.
+
+        Args:
+            conn: Writer connection
+
+        Returns:
+            True if the index is available, False if this SQLite build
+            lacks FTS5 or the trigram tokenizer (search then uses LIKE)
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text index unavailable for {self.db_path}, using LIKE scans: {e}")
+            return False
+        return True
 
     def _get_inline_schema(self) -> str:
         """Get inline database schema."""
@@ -317,8 +429,9 @@ class MemoryStore:
         """
         self._validate_fact(fact)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._writing() as (conn, changed_scopes):
             cursor = conn.cursor()
+            changed_scopes.add(fact.scope)
 
             # Check if fact already exists
             cursor.execute(
@@ -341,7 +454,7 @@ class MemoryStore:
                     fact.id = existing_id
                 else:
                     # Return existing fact without modification
-                    result = self.get_memory(existing_id)
+                    result = self._fetch_memory(conn, existing_id)
                     if result is None:
                         # This should never happen, but handle it
                         raise RuntimeError(f"Failed to retrieve existing fact {existing_id}")
@@ -357,14 +470,68 @@ class MemoryStore:
                      fact.created_at, fact.updated_at)
                 )
 
-            conn.commit()
-
             # Return the stored fact
-            result = self.get_memory(fact.id)
+            result = self._fetch_memory(conn, fact.id)
             if result is None:
                 raise RuntimeError(f"Failed to retrieve stored fact {fact.id}")
             return result
 
+    def store_memories_bulk(self, facts: List[MemoryFact]) -> List[MemoryFact]:
+        """
+        Store many memory facts in one transaction.
+
+        Same conflict resolution as store_memory(): a fact whose (scope, key)
+        already exists replaces it only if its confidence is higher. Facts
+        are upserted in order, so within a batch the first of equally
+        confident duplicates wins.
+
+        Args:
+            facts: MemoryFacts to store
+
+        Returns:
+            The stored MemoryFact for each input fact, in input order
+
+        Raises:
+            ValueError: If any fact fails validation (nothing is stored)
+        """
+        for fact in facts:
+            self._validate_fact(fact)
+        if not facts:
+            return []
+
+        with self._writing() as (conn, changed_scopes):
+            changed_scopes.update(fact.scope for fact in facts)
+            conn.executemany(
+                """INSERT INTO memory_facts
+                   (id, scope, category, key, value, confidence, source, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(scope, key) DO UPDATE SET
+                       category = excluded.category,
+                       value = excluded.value,
+                       confidence = excluded.confidence,
+                       source = excluded.source
+                   WHERE excluded.confidence > memory_facts.confidence""",
+                [
+                    (fact.id, fact.scope, fact.category, fact.key, fact.value,
+                     fact.confidence, fact.source, fact.created_at, fact.updated_at)
+                    for fact in facts
+                ]
+            )
+
+            stored: Dict[Tuple[str, str], MemoryFact] = {}
+            for fact in facts:
+                scope_key = (fact.scope, fact.key)
+                if scope_key not in stored:
+                    row = conn.execute(
+                        "SELECT id FROM memory_facts WHERE scope = ? AND key = ?", scope_key
+                    ).fetchone()
+                    result = self._fetch_memory(conn, row[0]) if row else None
+                    if result is None:
+                        raise RuntimeError(f"Failed to retrieve stored fact {fact.key}")
+                    stored[scope_key] = result
+
+        return [stored[(fact.scope, fact.key)] for fact in facts]
+
     def update_memory(self, fact: MemoryFact) -> Optional[MemoryFact]:
         """
         Update an existing memory fact by ID.
@@ -380,13 +547,15 @@ class MemoryStore:
         """
         self._validate_fact(fact)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._writing() as (conn, changed_scopes):
             cursor = conn.cursor()
 
             # Check if fact exists
-            cursor.execute("SELECT id FROM memory_facts WHERE id = ?", (fact.id,))
-            if not cursor.fetchone():
+            cursor.execute("SELECT scope FROM memory_facts WHERE id = ?", (fact.id,))
+            row = cursor.fetchone()
+            if not row:
                 raise ValueError(f"Memory fact with id {fact.id} not found")
+            changed_scopes.add(row[0])
 
             # Update fact
             cursor.execute(
@@ -396,9 +565,7 @@ class MemoryStore:
                 (fact.category, fact.key, fact.value, fact.confidence, fact.source, fact.id)
             )
 
-            conn.commit()
-
-            result = self.get_memory(fact.id)
+            result = self._fetch_memory(conn, fact.id)
             if result is None:
                 raise RuntimeError(f"Failed to retrieve updated fact {fact.id}")
             return result
@@ -424,7 +591,26 @@ class MemoryStore:
         Returns:
             List of matching MemoryFact objects
         """
-        with sqlite3.connect(self.db_path) as conn:
+        if key:
+            return self._query_facts(scope, category, key, min_confidence, source)
+
+        # Served from the per-scope cache; category and source filters keep
+        # the cached confidence/recency order
+        return [
+            fact for fact in self._cached_facts(scope or None, min_confidence)
+            if (not category or fact.category == category) and (not source or fact.source == source)
+        ]
+
+    def _query_facts(
+        self,
+        scope: Optional[str] = None,
+        category: Optional[str] = None,
+        key: Optional[str] = None,
+        min_confidence: float = 0.0,
+        source: Optional[str] = None
+    ) -> List[MemoryFact]:
+        """Run query_memory() against the database."""
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             # Build query dynamically
@@ -479,6 +665,132 @@ class MemoryStore:
                 for row in rows
             ]
 
+    def search_memory(
+        self,
+        query: str,
+        scope: Optional[str] = None,
+        min_confidence: float = 0.0,
+        limit: int = 10
+    ) -> List[MemoryFact]:
+        """
+        Search fact keys and values for a substring.
+
+        Uses the full-text index and ranks matches by BM25 relevance (keys
+        weigh more than values) scaled by confidence. Queries containing
+        LIKE wildcards (% or _), or shorter than the index can match, are
+        LIKE patterns over the scope's facts instead, ranked by confidence.
+
+        Args:
+            query: Text to find
+            scope: Restrict to this scope/project_id (optional)
+            min_confidence: Minimum confidence threshold (default: 0.0)
+            limit: Maximum number of results (default: 10)
+
+        Returns:
+            List of matching MemoryFact objects, best first
+        """
+        conditions = ["m.confidence >= ?"]
+        params: List[Any] = [min_confidence]
+        if scope:
+            conditions.append("m.scope = ?")
+            params.append(scope)
+
+        use_fts = (
+            self.fts_enabled
+            and len(query) >= FTS_MIN_QUERY_LENGTH
+            and '%' not in query and '_' not in query
+        )
+        if use_fts:
+            sql = f"""SELECT m.id, m.scope, m.category, m.key, m.value, m.confidence, m.source,
+                             m.created_at, m.updated_at
+                      FROM {FTS_TABLE} f JOIN memory_facts m ON m.rowid = f.rowid
+                      WHERE {FTS_TABLE} MATCH ? AND {" AND ".join(conditions)}
+                      ORDER BY bm25({FTS_TABLE}, ?, ?) * m.confidence, m.updated_at DESC
+                      LIMIT ?"""
+            params = ['"' + query.replace('"', '""') + '"'] + params + [FTS_KEY_WEIGHT, FTS_VALUE_WEIGHT, limit]
+        else:
+            pattern = query if '%' in query or '_' in query else f"%{query}%"
+            sql = f"""SELECT m.id, m.scope, m.category, m.key, m.value, m.confidence, m.source,
+                             m.created_at, m.updated_at
+                      FROM memory_facts m
+                      WHERE (m.key LIKE ? OR m.value LIKE ?) AND {" AND ".join(conditions)}
+                      ORDER BY m.confidence DESC, m.updated_at DESC
+                      LIMIT ?"""
+            params = [pattern, pattern] + params + [limit]
+
+        with self._db.reader() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [
+            MemoryFact(
+                id=row[0],
+                scope=row[1],
+                category=row[2],
+                key=row[3],
+                value=row[4],
+                confidence=row[5],
+                source=row[6],
+                created_at=row[7],
+                updated_at=row[8]
+            )
+            for row in rows
+        ]
+
+    def _cached_facts(self, scope: Optional[str], min_confidence: float) -> List[MemoryFact]:
+        """
+        Facts of a scope (None = all scopes) above a confidence, through the cache.
+
+        The returned MemoryFact objects are shared with the cache and must
+        not be modified.
+        """
+        cache = self._cache
+        cache_key = (scope, float(min_confidence))
+        version = self._db.data_version()
+        with cache.lock:
+            if version != cache.data_version:
+                # Another process committed to the database
+                cache.entries.clear()
+                cache.data_version = version
+            generation = cache.generations.get(scope, 0)
+            entry = cache.entries.get(cache_key)
+            if entry is not None and entry[0] == generation:
+                cache.hits += 1
+                return list(entry[1])
+            cache.misses += 1
+
+        facts = self._query_facts(scope=scope, min_confidence=min_confidence)
+
+        with cache.lock:
+            # Skip caching if a write committed while querying
+            if cache.generations.get(scope, 0) == generation and cache.data_version == version:
+                cache.entries.pop(cache_key, None)
+                cache.entries[cache_key] = (generation, facts)
+                while len(cache.entries) > FACT_CACHE_MAX_ENTRIES:
+                    del cache.entries[next(iter(cache.entries))]
+        return list(facts)
+
+    @contextmanager
+    def _writing(self):
+        """
+        Writer transaction that invalidates cached facts of changed scopes.
+
+        Yields:
+            (connection, set to add changed scopes to); their generations
+            are bumped after the transaction commits
+        """
+        changed_scopes: Set[str] = set()
+        try:
+            with self._db.writer() as conn:
+                yield conn, changed_scopes
+        finally:
+            if changed_scopes:
+                generations = self._cache.generations
+                with self._cache.lock:
+                    for scope in changed_scopes:
+                        generations[scope] = generations.get(scope, 0) + 1
+                    # Entries for all scopes depend on every scope
+                    generations[None] = generations.get(None, 0) + 1
+
     def list_memory(self, scope: str) -> List[MemoryFact]:
         """
         List all memory facts for a given scope/project_id.
@@ -504,12 +816,14 @@ class MemoryStore:
         Returns:
             True if deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._writing() as (conn, changed_scopes):
             cursor = conn.cursor()
 
+            row = cursor.execute("SELECT scope FROM memory_facts WHERE id = ?", (fact_id,)).fetchone()
+            if row:
+                changed_scopes.add(row[0])
             cursor.execute("DELETE FROM memory_facts WHERE id = ?", (fact_id,))
             deleted = cursor.rowcount > 0
-            conn.commit()
 
             return deleted
 
@@ -523,31 +837,36 @@ class MemoryStore:
         Returns:
             MemoryFact if found, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._db.reader() as conn:
+            return self._fetch_memory(conn, fact_id)
 
-            cursor.execute(
-                """SELECT id, scope, category, key, value, confidence, source, created_at, updated_at
-                   FROM memory_facts WHERE id = ?""",
-                (fact_id,)
-            )
-
-            row = cursor.fetchone()
-
-            if not row:
-                return None
-
-            return MemoryFact(
-                id=row[0],
-                scope=row[1],
-                category=row[2],
-                key=row[3],
-                value=row[4],
-                confidence=row[5],
-                source=row[6],
-                created_at=row[7],
-                updated_at=row[8]
-            )
+    @staticmethod
+    def _fetch_memory(conn, fact_id: str) -> Optional[MemoryFact]:
+        """Read a memory fact by ID on the given connection."""
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """SELECT id, scope, category, key, value, confidence, source, created_at, updated_at
+               FROM memory_facts WHERE id = ?""",
+            (fact_id,)
+        )
+
+        row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        return MemoryFact(
+            id=row[0],
+            scope=row[1],
+            category=row[2],
+            key=row[3],
+            value=row[4],
+            confidence=row[5],
+            source=row[6],
+            created_at=row[7],
+            updated_at=row[8]
+        )
 
     def get_audit_log(self, fact_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -559,7 +878,7 @@ class MemoryStore:
         Returns:
             List of audit log entries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             if fact_id:
@@ -596,7 +915,7 @@ class MemoryStore:
         Returns:
             Dictionary with statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.reader() as conn:
             cursor = conn.cursor()
 
             # Total facts by scope
@@ -628,13 +947,24 @@ class MemoryStore:
                 "by_scope": by_scope,
                 "by_category": by_category,
                 "average_confidence": round(avg_confidence, 3),
-                "db_path": self.db_path
+                "db_path": self.db_path,
+                "connection_pool": self._db.get_stats(),
+                "fact_cache": self._get_cache_stats()
+            }
+
+    def _get_cache_stats(self) -> Dict[str, int]:
+        """Get read-through fact cache statistics."""
+        with self._cache.lock:
+            return {
+                "entries": len(self._cache.entries),
+                "hits": self._cache.hits,
+                "misses": self._cache.misses
             }
 
     def close(self) -> None:
         """Close database connection (if using persistent connection pattern)."""
-        # SQLite with sqlite3.connect() handles connections per method
-        # This is a no-op but provided for API consistency
+        # Connections come from the pool shared by every store on this
+        # database (see get_database_pool()), so they stay open
         pass
 
 
@@ -642,17 +972,18 @@ class MemoryStore:
 _memory_store: Optional[MemoryStore] = None
 
 
-def get_memory_store(db_path: str = "./data/memory.db") -> MemoryStore:
+def get_memory_store(db_path: str = "./data/memory.db", pool_size: Optional[int] = None) -> MemoryStore:
     """
     Get or create the memory store singleton.
 
     Args:
         db_path: Path to SQLite database file
+        pool_size: Pooled read connections (default from rag_config.json)
 
     Returns:
         MemoryStore instance
     """
     global _memory_store
     if _memory_store is None:
-        _memory_store = MemoryStore(db_path)
+        _memory_store = MemoryStore(db_path, pool_size)
     return _memory_store
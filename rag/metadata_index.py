@@ -0,0 +1,214 @@
+"""
+Metadata Index - Posting lists over chunk metadata for filtered search.
+
+Filtered searches in SemanticStore and VectorStore used to evaluate the
+filter on every row. MetadataIndex keeps, per metadata key, a
+dictionary-encoded column aligned with the store's rows:
+
+    codes    int32 (rows,)    value code per row (-1 = key missing,
+                              -2 = value not hashable)
+    values   {value: code}
+
+Posting lists (the rows holding each code) are built lazily from the
+column with one stable argsort, so a filter resolves to its matching rows
+without touching the others. Rows appended since the last build are
+matched directly on the column.
+
+Columns are created on demand, the first time a key is filtered on, and
+then maintained incrementally as rows are appended or dropped.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+_MISSING = -1
+_UNHASHABLE = -2
+
+
+class _Column:
+    """Dictionary-encoded values of one metadata key."""
+
+    def __init__(self):
+        self.values: Dict[Hashable, int] = {}
+        self._codes = np.zeros(0, dtype=np.int32)
+        self._size = 0
+
+        # Posting lists over the first _built rows: rows with code c are
+        # _order[_bounds[c]:_bounds[c + 1]], in ascending row order
+        self._order: Optional[np.ndarray] = None
+        self._bounds: Optional[np.ndarray] = None
+        self._built = 0
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes[:self._size]
+
+    def append(self, metadatas: List[Dict[str, Any]], key: str) -> None:
+        """Append the codes of new rows."""
+        size = self._size + len(metadatas)
+        if size > self._codes.shape[0]:
+            grown = np.full(max(size, self._codes.shape[0] * 2, 64), _MISSING, dtype=np.int32)
+            grown[:self._size] = self._codes[:self._size]
+            self._codes = grown
+
+        for offset, metadata in enumerate(metadatas):
+            self._codes[self._size + offset] = self._encode(metadata, key)
+        self._size = size
+
+    def keep(self, keep: np.ndarray) -> None:
+        """Drop rows (keep is a bool mask over current rows)."""
+        self._codes = self._codes[:self._size][keep]
+        self._size = self._codes.shape[0]
+        self._order = None
+        self._built = 0
+
+    def rows(self, values: List[Hashable]) -> np.ndarray:
+        """Sorted rows whose value is one of values."""
+        codes = list(dict.fromkeys(self.values[value] for value in values if value in self.values))
+        if not codes:
+            return np.zeros(0, dtype=np.int64)
+
+        self._build()
+        # Values first seen after the last build only occur in the tail
+        n_built_values = self._bounds.shape[0] - 1
+        parts = [
+            self._order[self._bounds[code]:self._bounds[code + 1]]
+            for code in codes if code < n_built_values
+        ]
+        if self._built < self._size:
+            tail = self._codes[self._built:self._size]
+            parts.append(self._built + np.flatnonzero(np.isin(tail, codes)))
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+
+        rows = np.concatenate(parts)
+        return rows if len(codes) == 1 else np.sort(rows)
+
+    def _encode(self, metadata: Dict[str, Any], key: str) -> int:
+        if key not in metadata:
+            return _MISSING
+        value = metadata[key]
+        try:
+            return self.values.setdefault(value, len(self.values))
+        except TypeError:
+            return _UNHASHABLE
+
+    def _build(self) -> None:
+        """(Re)build posting lists once enough rows were appended since the last build."""
+        if self._order is not None and self._size - self._built <= max(1024, self._built // 8):
+            return
+
+        codes = self._codes[:self._size]
+        order = np.argsort(codes, kind="stable")
+        self._bounds = np.searchsorted(codes[order], np.arange(len(self.values) + 1))
+        self._order = order.astype(np.int64)
+        self._built = self._size
+
+
+class MetadataIndex:
+    """
+    Per-key posting lists over row metadata.
+
+    The index does not store metadata itself; callers pass a row accessor
+    so columns for new keys can be built on first use.
+
+    Example:
+        >>> index = MetadataIndex()
+        >>> index.add([{"type": "code"}, {"type": "doc"}])
+        >>> rows, residual = index.match({"type": "code"}, lambda i: metadata[i], 2)
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, _Column] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Append rows.
+
+        Args:
+            metadatas: Metadata of the appended rows, in row order
+        """
+        for key, column in self._columns.items():
+            column.append(metadatas, key)
+        self._size += len(metadatas)
+
+    def keep(self, keep: np.ndarray) -> None:
+        """
+        Drop rows, mirroring a delete in the store.
+
+        Args:
+            keep: bool (rows,) mask of rows to keep
+        """
+        for column in self._columns.values():
+            column.keep(keep)
+        self._size = int(np.count_nonzero(keep))
+
+    def reset(self, size: int = 0) -> None:
+        """
+        Forget all columns; they are rebuilt on demand.
+
+        Args:
+            size: Current number of rows in the store
+        """
+        self._columns = {}
+        self._size = size
+
+    def match(
+        self,
+        filters: Dict[str, Any],
+        metadata_at: Callable[[int], Dict[str, Any]],
+        size: int,
+        in_semantics: bool = True
+    ) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        Resolve filters to candidate rows.
+
+        All filters must match (AND). With in_semantics, a list/tuple value
+        matches rows whose value is any of its elements (IN).
+
+        Args:
+            filters: Metadata filters
+            metadata_at: Returns the metadata of a row, used to build new columns
+            size: Current number of rows in the store
+            in_semantics: Treat list/tuple filter values as IN
+
+        Returns:
+            (sorted rows matching the indexable filters or None if no filter
+            was indexable, filters the index could not evaluate)
+        """
+        if size != self._size:
+            # Out of sync with the store; start over
+            self.reset(size)
+
+        rows: Optional[np.ndarray] = None
+        residual: Dict[str, Any] = {}
+        for key, value in filters.items():
+            if in_semantics and isinstance(value, (list, tuple)):
+                values = list(value)
+            else:
+                values = [value]
+            try:
+                for item in values:
+                    hash(item)
+            except TypeError:
+                residual[key] = value
+                continue
+
+            column = self._columns.get(key)
+            if column is None:
+                column = _Column()
+                column.append([metadata_at(i) for i in range(size)], key)
+                self._columns[key] = column
+
+            key_rows = column.rows(values)
+            rows = key_rows if rows is None else np.intersect1d(rows, key_rows, assume_unique=True)
+            if rows.size == 0:
+                break
+
+        return rows, residual
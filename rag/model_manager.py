@@ -11,6 +11,7 @@ Features:
 - Dynamic model loading/unloading to manage memory
 - Model caching with LRU eviction
 - Thread-safe operations
+- Token-budgeted batched embedding with throughput stats
 - Configurable GPU layers and context size
 - Support for external APIs
 """
@@ -36,7 +37,7 @@ class ModelConfig:
     """Configuration for a single model."""
     def __init__(self, path, model_type, n_ctx=4096, n_gpu_layers=-1, n_batch=512, 
                  embedding=False, verbose=False, is_external=False, api_url="", 
-                 api_key="", model_name=""):
+                 api_key="", model_name="", n_threads=None):
         self.path = path
         self.model_type = model_type
         self.n_ctx = n_ctx
@@ -44,6 +45,7 @@ class ModelConfig:
         self.n_batch = n_batch
         self.embedding = embedding
         self.verbose = verbose
+        self.n_threads = n_threads  # None: llama-cpp default
         # For external models
         self.is_external = is_external
         self.api_url = api_url
@@ -91,6 +93,9 @@ class ModelManager:
         self._registry = {}
         self._loaded = {}
         self._lock = threading.RLock()
+
+        # Cumulative embedding throughput (see generate_embeddings)
+        self._embedding_stats = {"batches": 0, "texts": 0, "tokens": 0, "seconds": 0.0}
         
         # Load configuration if exists
         self._load_config()
@@ -189,7 +194,8 @@ class ModelManager:
                     n_gpu_layers=config.n_gpu_layers,
                     n_batch=config.n_batch,
                     embedding=config.embedding,
-                    verbose=config.verbose
+                    verbose=config.verbose,
+                    n_threads=config.n_threads
                 )
 
                 load_time = time.time() - start_time
@@ -376,7 +382,8 @@ class ModelManager:
         return {
             "registered_models": list(self._registry.keys()),
             "loaded_models": list(self._loaded.keys()),
-            "max_loaded": self.max_loaded
+            "max_loaded": self.max_loaded,
+            "embedding_throughput": self.get_embedding_throughput()
         }
     
     # Convenience methods for chat and embedding
@@ -410,14 +417,23 @@ class ModelManager:
     def generate_embeddings(
         self,
         model_name,
-        texts
+        texts,
+        max_batch_size=None
     ):
         """
         Generate embeddings for a list of texts.
 
+        Texts are sorted by estimated token count (~4 characters per token)
+        and grouped so each group fits in the model's n_batch token budget;
+        every group is embedded with one model call. Results are returned in
+        input order. The texts are only tokenized by the model itself: a
+        group whose real token count overshoots the budget is split into
+        several decodes inside llama-cpp, so an estimate costs no accuracy.
+
         Args:
             model_name: Name of embedding model (must be registered)
             texts: List of strings to embed
+            max_batch_size: Optional cap on texts per model call
 
         Returns:
             List of embedding vectors (each is a list of floats)
@@ -433,23 +449,102 @@ class ModelManager:
         if not LLAMA_CPP_AVAILABLE:
             raise ImportError("llama-cpp-python is required for embedding generation")
 
-        embeddings = []
-        # Use lock to protect thread-unsafe llama-cpp-python model
+        token_budget = config.n_batch if config else 512
+        token_counts = [self._estimate_tokens(text, token_budget) for text in texts]
+
+        embeddings = [[] for _ in texts]
+        for indices in self._embedding_batches(token_counts, token_budget, max_batch_size):
+            batch = [texts[i] for i in indices]
+            tokens = sum(token_counts[i] for i in indices)
+            # Use lock to protect thread-unsafe llama-cpp-python model
+            start_time = time.perf_counter()
+            try:
+                with self._lock:
+                    vectors = model.embed(batch) if len(batch) > 1 else [model.embed(batch[0])]
+            except Exception as e:
+                # Llama-cpp-python tokenizer may crash on certain inputs;
+                # retry one by one so a bad text only blanks itself
+                logger.warning(f"Batched embedding failed for {len(batch)} texts, retrying one by one: {e}")
+                vectors = [self._embed_one(model, text) for text in batch]
+            self._record_embedding_batch(len(batch), tokens, time.perf_counter() - start_time)
+
+            for i, vector in zip(indices, vectors):
+                embeddings[i] = vector
+
+        return embeddings
+
+    def _embed_one(self, model, text):
+        """Embed a single text, returning an empty vector on failure."""
         try:
             with self._lock:
-                for text in texts:
-                    # Call the model's embed method (returns a list)
-                    embedding = model.embed(text)
-                    embeddings.append(embedding)
+                return model.embed(text)
         except Exception as e:
-            # Llama-cpp-python tokenizer may crash on certain inputs
-            # Return empty embeddings on failure to prevent crashes
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Embedding generation failed for {len(texts)} texts: {e}")
-            return [[] for _ in texts]
+            logger.warning(f"Embedding generation failed for text of {len(text)} chars: {e}")
+            return []
 
-        return embeddings
+    @staticmethod
+    def _estimate_tokens(text, token_budget):
+        """
+        Estimate the tokens the model will see for a text (at most
+        token_budget, since llama-cpp truncates longer inputs).
+        """
+        return max(1, min(len(text) // 4 + 1, token_budget))
+
+    @staticmethod
+    def _embedding_batches(token_counts, token_budget, max_batch_size=None):
+        """
+        Group text indices into token-budgeted batches.
+
+        Texts are sorted by token count so each batch holds texts of similar
+        length (little padding and KV cache waste); a batch is closed when the
+        next text would exceed token_budget or max_batch_size.
+
+        Args:
+            token_counts: Token count per text
+            token_budget: Maximum tokens per batch
+            max_batch_size: Optional maximum texts per batch
+
+        Returns:
+            List of batches, each a list of indices into token_counts
+        """
+        batches = []
+        batch, batch_tokens = [], 0
+        for i in sorted(range(len(token_counts)), key=lambda i: token_counts[i]):
+            full = max_batch_size is not None and len(batch) >= max_batch_size
+            if batch and (full or batch_tokens + token_counts[i] > token_budget):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(i)
+            batch_tokens += token_counts[i]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _record_embedding_batch(self, texts, tokens, seconds):
+        """Accumulate embedding throughput and log the batch."""
+        with self._lock:
+            stats = self._embedding_stats
+            stats["batches"] += 1
+            stats["texts"] += texts
+            stats["tokens"] += tokens
+            stats["seconds"] += seconds
+        rate = tokens / seconds if seconds > 0 else 0.0
+        logger.debug(f"Embedded batch of {texts} texts ({tokens} tokens) in {seconds:.3f}s ({rate:.0f} tokens/s)")
+
+    def get_embedding_throughput(self):
+        """
+        Get cumulative embedding throughput.
+
+        Returns:
+            Dict with batches, texts, tokens, seconds, texts_per_second and
+            tokens_per_second
+        """
+        with self._lock:
+            stats = dict(self._embedding_stats)
+        seconds = stats["seconds"]
+        stats["texts_per_second"] = stats["texts"] / seconds if seconds > 0 else 0.0
+        stats["tokens_per_second"] = stats["tokens"] / seconds if seconds > 0 else 0.0
+        return stats
 
 
 # Singleton instance
@@ -0,0 +1,246 @@
+"""
+Quantization - Compact int8 storage for embedding matrices.
+
+Each vector is stored as int8 codes plus one float32 scale
+(scale = max|x| / 127), cutting memory to about a quarter of float32.
+
+Search uses asymmetric distance computation: the float query is scored
+against the int8 codes directly (codes @ query * scale), so vectors are
+never dequantized as a whole. The best candidates can then be re-ranked
+with their exact float vectors, which stay on disk (memory-mapped) and
+are located through MappedRows.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+STORAGE_MODES = {"float32", "int8"}
+
+# Rows converted per step, bounding temporary float32 buffers
+_BLOCK_ROWS = 65536
+
+
+def quantize_int8(vectors: np.ndarray, normalize: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize vectors to int8 with one scale per vector.
+
+    Args:
+        vectors: float (rows, dim) matrix (may be memory-mapped)
+        normalize: Scale rows to unit length first, so code scores are
+            cosine similarities (zero rows stay zero)
+
+    Returns:
+        (int8 (rows, dim) codes, float32 (rows,) scales)
+    """
+    rows = vectors.shape[0]
+    dim = vectors.shape[1] if vectors.ndim == 2 else 0
+    codes = np.zeros((rows, dim), dtype=np.int8)
+    scales = np.ones(rows, dtype=np.float32)
+    if rows == 0 or dim == 0:
+        return codes, scales
+
+    for start in range(0, rows, _BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + _BLOCK_ROWS], dtype=np.float32)
+        if normalize:
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            block = block / norms
+        block_scales = np.abs(block).max(axis=1) / 127.0
+        block_scales[block_scales == 0] = 1.0
+        codes[start:start + block.shape[0]] = np.rint(block / block_scales[:, None])
+        scales[start:start + block.shape[0]] = block_scales
+
+    return codes, scales
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Approximate float32 vectors from int8 codes.
+
+    Args:
+        codes: int8 (rows, dim) codes
+        scales: float32 (rows,) scales
+
+    Returns:
+        float32 (rows, dim) matrix
+    """
+    return codes.astype(np.float32) * scales[:, None]
+
+
+def int8_scores(
+    codes: np.ndarray,
+    scales: np.ndarray,
+    query: np.ndarray,
+    rows: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Asymmetric dot products between float queries and int8-coded rows.
+
+    Args:
+        codes: int8 (capacity, dim) codes
+        scales: float32 (capacity,) scales
+        query: float32 (dim,) query vector, or (dim, queries) matrix
+        rows: Rows to score (all rows when None)
+
+    Returns:
+        float32 scores, one per scored row (one row of scores per scored
+        row when query is a matrix)
+    """
+    count = codes.shape[0] if rows is None else rows.shape[0]
+    scores = np.empty((count,) + query.shape[1:], dtype=np.float32)
+    for start in range(0, count, _BLOCK_ROWS):
+        if rows is None:
+            block_codes = codes[start:start + _BLOCK_ROWS]
+            block_scales = scales[start:start + _BLOCK_ROWS]
+        else:
+            block_rows = rows[start:start + _BLOCK_ROWS]
+            block_codes = codes[block_rows]
+            block_scales = scales[block_rows]
+        if query.ndim == 2:
+            block_scales = block_scales[:, None]
+        scores[start:start + block_codes.shape[0]] = (block_codes @ query) * block_scales
+    return scores
+
+
+def top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, in no particular order.
+
+    Args:
+        scores: float (n,) scores
+        k: Number of indices
+
+    Returns:
+        int64 indices (all of them when k >= n)
+    """
+    if k >= scores.shape[0]:
+        return np.arange(scores.shape[0])
+    return np.argpartition(-scores, k - 1)[:k]
+
+
+class MappedRows:
+    """
+    Row-aligned locator of float vectors held in other arrays.
+
+    Each row maps to (block, position in block). Blocks are typically
+    memory-mapped segment embedding files, so float vectors only cost
+    page cache when they are read for re-ranking.
+
+    Example:
+        >>> mapped = MappedRows()
+        >>> block = mapped.add_block(np.load("embeddings.npy", mmap_mode="r"))
+        >>> mapped.append(block, np.arange(100))
+        >>> vectors = mapped.gather(np.array([3, 7]))
+    """
+
+    def __init__(self):
+        self._blocks: List[np.ndarray] = []
+        self._block_ids = np.zeros(0, dtype=np.int32)
+        self._positions = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self.dim = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_block(self, array: np.ndarray) -> int:
+        """
+        Register an array of float vectors.
+
+        Args:
+            array: (rows, dim) float matrix
+
+        Returns:
+            Block id for append()
+        """
+        self._blocks.append(array)
+        if array.ndim == 2 and array.shape[1]:
+            self.dim = array.shape[1]
+        return len(self._blocks) - 1
+
+    def replace_block(self, block_id: int, array: np.ndarray) -> None:
+        """
+        Swap a block for an equivalent array (e.g. its on-disk copy).
+
+        Args:
+            block_id: Block to replace
+            array: Array with the same rows
+        """
+        self._blocks[block_id] = array
+
+    def append(self, block_id: int, positions: np.ndarray) -> None:
+        """
+        Append rows located at positions of a block.
+
+        Args:
+            block_id: Block holding the rows
+            positions: Row positions inside the block
+        """
+        size = self._size + positions.shape[0]
+        if size > self._block_ids.shape[0]:
+            capacity = max(size, self._block_ids.shape[0] * 2, 64)
+            block_ids = np.zeros(capacity, dtype=np.int32)
+            block_ids[:self._size] = self._block_ids[:self._size]
+            local = np.zeros(capacity, dtype=np.int64)
+            local[:self._size] = self._positions[:self._size]
+            self._block_ids, self._positions = block_ids, local
+
+        self._block_ids[self._size:size] = block_id
+        self._positions[self._size:size] = positions
+        self._size = size
+
+    def keep(self, keep: np.ndarray) -> None:
+        """
+        Drop rows, mirroring a delete in the store.
+
+        Args:
+            keep: bool (rows,) mask of rows to keep
+        """
+        self._block_ids = self._block_ids[:self._size][keep]
+        self._positions = self._positions[:self._size][keep]
+        self._size = self._block_ids.shape[0]
+
+    def reset(self) -> None:
+        """Forget all rows and blocks."""
+        self.__init__()
+
+    def snapshot(self) -> "MappedRows":
+        """
+        Copy of the locator, safe to read while the original keeps changing.
+
+        Shares the row arrays: append() only writes past the current size
+        and keep() builds new arrays, so existing rows never change in place.
+        """
+        copy = MappedRows()
+        copy._blocks = list(self._blocks)
+        copy._block_ids = self._block_ids[:self._size]
+        copy._positions = self._positions[:self._size]
+        copy._size = self._size
+        copy.dim = self.dim
+        return copy
+
+    def gather(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read float vectors of rows.
+
+        Args:
+            rows: Row positions (all rows when None)
+
+        Returns:
+            float32 (len(rows), dim) matrix
+        """
+        if rows is None:
+            rows = np.arange(self._size)
+        block_ids = self._block_ids[rows]
+        positions = self._positions[rows]
+
+        vectors = np.zeros((rows.shape[0], self.dim), dtype=np.float32)
+        for block_id in np.unique(block_ids):
+            block = self._blocks[block_id]
+            if block.ndim != 2 or block.shape[1] != self.dim:
+                continue
+            selected = np.flatnonzero(block_ids == block_id)
+            vectors[selected] = block[positions[selected]]
+        return vectors
@@ -176,38 +176,30 @@ class Retriever:
 
         # Get query expander
         expander = get_query_expander(num_expansions=expansions)
+        expanded_queries = expander.expand_query(query)
 
-        # Define search function for expander
-        def _search_func(q: str, top_k: int, metadata_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-            """Internal search function."""
-            query_embedding = self.embedding_service.embed_single(q)
-            if not query_embedding:
-                return []
-
-            results = self.vector_store.search(
-                query_vector=query_embedding,
-                top_k=top_k,
-                metadata_filters=metadata_filters
-            )
-
-            formatted = []
-            for content, score, metadata in results:
-                if score >= score_threshold:
-                    formatted.append({
-                        "content": content,
-                        "score": score,
-                        "metadata": metadata
-                    })
-
-            return formatted
+        # Embed all expansions in one batch, then score them in one pass
+        query_embeddings = self.embedding_service.embed(expanded_queries)
+        if not query_embeddings:
+            return []
 
-        # Use expander's expand_and_search
-        return expander.expand_and_search(
-            query=query,
-            search_func=lambda q, **kw: _search_func(q, kw.get('top_k', k), kw.get('metadata_filters')),
+        all_results = []
+        for results in self.vector_store.search_many(
+            query_vectors=query_embeddings,
             top_k=k,
             metadata_filters=metadata_filters
-        )
+        ):
+            all_results.append([
+                {
+                    "content": content,
+                    "score": score,
+                    "metadata": metadata
+                }
+                for content, score, metadata in results
+                if score >= score_threshold
+            ])
+
+        return expander.merge_results(all_results, top_k=k)
 
     def add_documents(
         self,
@@ -236,8 +228,8 @@ class Retriever:
         # Add to vector store
         self.vector_store.add(documents, embeddings, metadata)
         
-        # Save to disk
-        self.vector_store.save()
+        # Append the new rows to disk (compacted once the journal grows)
+        self.vector_store.save(append=True)
         
         return len(documents)
     
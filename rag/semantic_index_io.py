@@ -0,0 +1,411 @@
+"""
+Semantic Index I/O - Binary, memory-mapped on-disk format for SemanticStore.
+
+The index is an append-only log of immutable segments plus a manifest.
+
+Layout (format version 3), relative to the index directory:
+
+    manifest.json                 Log manifest: base, segments, tombstones
+    segments/base-00000007/       Compacted base segment
+    segments/seg-00000008/        Segment appended by add_document(), or a
+                                  merge of adjacent appended segments
+    segments/seg-00000009/        ...
+
+Every segment directory uses the same file set (segment format version 2):
+
+    manifest.json        Format version, row count, embedding dimension, seq
+    embeddings.npy       float32 (rows, dim) matrix of unit-length embeddings
+    embedding_mask.npy   bool (rows,) - False for chunks without an embedding
+    chunk_rows.bin       Concatenated compact JSON records (chunk text + metadata)
+    chunk_offsets.npy    int64 (rows + 1,) byte offsets into chunk_rows.bin
+    chunk_ids.npy        str (rows, 2) chunk_id and document_id per row (ID
+                         index for lazy loading; optional, older segments
+                         lack it)
+
+All .npy files are opened with np.load(mmap_mode='r'), so opening a segment
+costs a handful of syscalls regardless of its size. Rows are decoded from
+chunk_rows.bin on demand.
+
+A compacted base segment may also carry ANN index data (ivf_centroids.npy,
+ivf_assignments.npy, see ann_index) described by an "ann" manifest entry.
+
+Deletes are recorded as tombstones {"document_id", "seq", "rows"}: a
+tombstone hides rows of that document in every segment whose seq is lower
+than its own ("rows" counts the rows it hid, for scheduling compactions).
+
+Every file is written to a temporary name, fsync'ed and moved into place
+with os.replace(). A segment only becomes visible once the root manifest
+lists it, so a crash at any point leaves the previous state readable;
+unreferenced segment directories are removed on the next load.
+"""
+
+import json
+import mmap
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .logger import get_logger
+logger = get_logger(__name__)
+
+
+INDEX_FORMAT_VERSION = 3
+SEGMENT_FORMAT_VERSION = 2
+
+MANIFEST_FILE = "manifest.json"
+SEGMENTS_DIR = "segments"
+EMBEDDINGS_FILE = "embeddings.npy"
+MASK_FILE = "embedding_mask.npy"
+ROWS_FILE = "chunk_rows.bin"
+OFFSETS_FILE = "chunk_offsets.npy"
+IDS_FILE = "chunk_ids.npy"
+
+SEGMENT_FILES = [MANIFEST_FILE, EMBEDDINGS_FILE, MASK_FILE, ROWS_FILE, OFFSETS_FILE]
+
+
+class ChunkRowStore:
+    """
+    Read-only view over chunk_rows.bin and its offset table.
+
+    Records are decoded lazily, one row at a time.
+
+    Example:
+        >>> rows = ChunkRowStore("./data/semantic_index/segments/base-00000001")
+        >>> rows.get(0)["chunk_id"]
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open the row store in a directory.
+
+        Args:
+            directory: Directory containing chunk_rows.bin and chunk_offsets.npy
+        """
+        self.offsets = _load_npy(os.path.join(directory, OFFSETS_FILE))
+        self._file = open(os.path.join(directory, ROWS_FILE), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map empty files
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    def get(self, row: int) -> Dict[str, Any]:
+        """
+        Decode a single row.
+
+        Args:
+            row: Row position
+
+        Returns:
+            Chunk record dict (without embedding)
+        """
+        start = int(self.offsets[row])
+        end = int(self.offsets[row + 1])
+        return json.loads(self._data[start:end].decode("utf-8"))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.get(row)
+
+    def close(self) -> None:
+        """Release the mapping and file handle."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+class SegmentFiles:
+    """
+    An opened segment: manifest, mapped vectors and row store.
+
+    Attributes:
+        manifest: Parsed segment manifest.json
+        vectors: Memory-mapped float32 (rows, dim) embedding matrix
+        mask: Memory-mapped bool (rows,) embedding validity mask
+        rows: ChunkRowStore for chunk text and metadata
+        ids: Memory-mapped str (rows, 2) chunk_id/document_id index, or
+            None for segments written without one
+    """
+
+    def __init__(
+        self,
+        manifest: Dict[str, Any],
+        vectors: np.ndarray,
+        mask: np.ndarray,
+        rows: ChunkRowStore,
+        ids: Optional[np.ndarray] = None
+    ):
+        self.manifest = manifest
+        self.vectors = vectors
+        self.mask = mask
+        self.rows = rows
+        self.ids = ids
+
+    @property
+    def seq(self) -> int:
+        """Log sequence number of the segment."""
+        return int(self.manifest.get("seq", 0))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """
+    Read manifest.json from an index or segment directory.
+
+    Args:
+        directory: Index or segment directory
+
+    Returns:
+        Manifest dict, or None if the directory holds no manifest
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(directory: str, manifest: Dict[str, Any]) -> None:
+    """
+    Atomically replace manifest.json in a directory.
+
+    Args:
+        directory: Index or segment directory
+        manifest: Manifest contents
+    """
+    with _atomic_open(os.path.join(directory, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def new_log_manifest() -> Dict[str, Any]:
+    """Return the manifest of an empty index."""
+    return {
+        "format_version": INDEX_FORMAT_VERSION,
+        "base": None,
+        "segments": [],
+        "tombstones": [],
+        "next_seq": 1
+    }
+
+
+def segment_path(index_path: str, name: str) -> str:
+    """Directory of a named segment inside an index."""
+    return os.path.join(index_path, SEGMENTS_DIR, name)
+
+
+def open_segment(directory: str) -> Optional[SegmentFiles]:
+    """
+    Open a segment without reading vectors or rows into memory.
+
+    Args:
+        directory: Segment directory
+
+    Returns:
+        SegmentFiles, or None if the directory holds no segment
+
+    Raises:
+        ValueError: If the segment has an unsupported format version or is inconsistent
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+
+    version = manifest.get("format_version")
+    if version != SEGMENT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported semantic segment format version: {version} "
+            f"(expected {SEGMENT_FORMAT_VERSION})"
+        )
+
+    vectors = _load_npy(os.path.join(directory, EMBEDDINGS_FILE))
+    mask = _load_npy(os.path.join(directory, MASK_FILE))
+    rows = ChunkRowStore(directory)
+    ids = load_array(directory, IDS_FILE)
+
+    count = manifest.get("count", 0)
+    if ids is not None and ids.shape[0] != count:
+        ids = None
+    if not (len(rows) == len(mask) == vectors.shape[0] == count):
+        rows.close()
+        raise ValueError(
+            f"Semantic segment {directory} is inconsistent: manifest={count}, rows={len(rows)}, "
+            f"mask={len(mask)}, vectors={vectors.shape[0]}"
+        )
+
+    return SegmentFiles(manifest, vectors, mask, rows, ids)
+
+
+def write_segment(
+    directory: str,
+    records: Iterable[Dict[str, Any]],
+    vectors: np.ndarray,
+    mask: np.ndarray,
+    extra: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Write a complete segment to a directory.
+
+    Args:
+        directory: Segment directory (created if missing)
+        records: Chunk records (without embeddings), in row order
+        vectors: float32 (rows, dim) embedding matrix
+        mask: bool (rows,) embedding validity mask
+        extra: Optional extra manifest fields (e.g. seq)
+
+    Returns:
+        The segment manifest that was written
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    offsets: List[int] = [0]
+    ids: List[List[str]] = []
+    with _atomic_open(os.path.join(directory, ROWS_FILE)) as f:
+        for record in records:
+            data = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            f.write(data)
+            offsets.append(offsets[-1] + len(data))
+            ids.append([record["chunk_id"], record["document_id"]])
+
+    count = len(offsets) - 1
+    if vectors.shape[0] != count or mask.shape[0] != count:
+        raise ValueError(
+            f"Row count mismatch: records={count}, vectors={vectors.shape[0]}, mask={mask.shape[0]}"
+        )
+
+    _atomic_save_npy(os.path.join(directory, OFFSETS_FILE), np.asarray(offsets, dtype=np.int64))
+    _atomic_save_npy(os.path.join(directory, EMBEDDINGS_FILE), np.ascontiguousarray(vectors, dtype=np.float32))
+    _atomic_save_npy(os.path.join(directory, MASK_FILE), np.ascontiguousarray(mask, dtype=bool))
+    _atomic_save_npy(
+        os.path.join(directory, IDS_FILE),
+        np.array(ids, dtype=str) if ids else np.zeros((0, 2), dtype="U1")
+    )
+
+    manifest = {
+        "format_version": SEGMENT_FORMAT_VERSION,
+        "count": count,
+        "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+        **(extra or {})
+    }
+    write_manifest(directory, manifest)
+
+    return manifest
+
+
+def save_array(directory: str, name: str, array: np.ndarray) -> None:
+    """
+    Atomically write an auxiliary array (e.g. ANN index data) into a segment.
+
+    Args:
+        directory: Segment directory
+        name: File name inside the segment
+        array: Array to save
+    """
+    _atomic_save_npy(os.path.join(directory, name), np.ascontiguousarray(array))
+
+
+def load_array(directory: str, name: str) -> Optional[np.ndarray]:
+    """
+    Memory-map an auxiliary array written with save_array().
+
+    Args:
+        directory: Segment directory
+        name: File name inside the segment
+
+    Returns:
+        The array, or None if the segment has no such file
+    """
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        return None
+    return _load_npy(path)
+
+
+def remove_segment(directory: str) -> None:
+    """Delete a segment directory, ignoring errors."""
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def remove_unreferenced_segments(index_path: str, manifest: Dict[str, Any]) -> List[str]:
+    """
+    Delete segment directories the manifest does not reference.
+
+    These are left behind by crashes between writing a segment and
+    committing the manifest, or between committing a compaction and
+    deleting the segments it replaced.
+
+    Args:
+        index_path: Index directory
+        manifest: Current log manifest
+
+    Returns:
+        Names of removed segments
+    """
+    segments_root = os.path.join(index_path, SEGMENTS_DIR)
+    if not os.path.isdir(segments_root):
+        return []
+
+    referenced = set(manifest.get("segments", []))
+    if manifest.get("base"):
+        referenced.add(manifest["base"])
+
+    removed = []
+    for name in os.listdir(segments_root):
+        if name in referenced or not (name.startswith("seg-") or name.startswith("base-")):
+            continue
+        remove_segment(os.path.join(segments_root, name))
+        removed.append(name)
+
+    if removed:
+        logger.info(f"Removed {len(removed)} unreferenced semantic index segment(s)")
+    return removed
+
+
+def remove_root_segment_files(index_path: str) -> None:
+    """Delete format-2 segment files stored directly in the index directory."""
+    for name in SEGMENT_FILES[1:]:
+        try:
+            os.remove(os.path.join(index_path, name))
+        except OSError:
+            pass
+
+
+def _load_npy(path: str) -> np.ndarray:
+    """Memory-map a .npy file, falling back to a regular load for empty arrays."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Zero-length arrays cannot be memory-mapped
+        return np.load(path)
+
+
+def _atomic_save_npy(path: str, array: np.ndarray) -> None:
+    """Save a .npy file via a temporary file and os.replace()."""
+    with _atomic_open(path) as f:
+        np.save(f, array)
+
+
+@contextmanager
+def _atomic_open(path: str, mode: str = "wb"):
+    """Open path + '.tmp' for writing, then fsync and move it over path on success."""
+    tmp_path = path + ".tmp"
+    f = open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"}))
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    except BaseException:
+        f.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    f.close()
+    os.replace(tmp_path, path)
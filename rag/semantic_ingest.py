@@ -27,14 +27,15 @@ Content Policy:
 
 import os
 import json
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 from .logger import get_logger
 logger = get_logger(__name__)
 from pathlib import Path
 
 from .semantic_store import DocumentChunk, SemanticStore, get_semantic_store
-from .embedding import EmbeddingService, get_embedding_service
+from .chunking import detect_encoding, iter_file_blocks
+from .embedding import EmbeddingService, ParallelEmbeddingService, get_parallel_embedding_service
 
 
 class SemanticIngestor:
@@ -44,7 +45,7 @@ class SemanticIngestor:
     Features:
     - Deterministic chunking with semantic boundaries
     - Stable chunk and document IDs
-    - Embedding generation
+    - Embedding generation (sharded across the parallel embedding service)
     - Metadata validation
     - Batch ingestion support
 
@@ -59,17 +60,18 @@ class SemanticIngestor:
     def __init__(
         self,
         semantic_store: Optional[SemanticStore] = None,
-        embedding_service: Optional[EmbeddingService] = None
+        embedding_service: Optional[Union[EmbeddingService, ParallelEmbeddingService]] = None
     ):
         """
         Initialize semantic ingestor.
 
         Args:
             semantic_store: Semantic store instance
-            embedding_service: Embedding service instance
+            embedding_service: Service embedding ingested chunks
+                (default: the parallel embedding service)
         """
         self.semantic_store = semantic_store or get_semantic_store()
-        self.embedding_service = embedding_service or get_embedding_service()
+        self.embedding_service = embedding_service or get_parallel_embedding_service()
 
     def ingest_file(
         self,
@@ -96,9 +98,6 @@ class SemanticIngestor:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Read file content
-        content = self._read_file(file_path)
-
         # Build metadata with source path
         file_metadata = metadata or {}
         file_metadata["source"] = file_path
@@ -106,12 +105,14 @@ class SemanticIngestor:
         file_metadata["filename"] = os.path.basename(file_path)
         file_metadata["size"] = os.path.getsize(file_path)
 
-        # Add document to semantic store
-        chunk_ids = self.semantic_store.add_document(
-            content=content,
+        # Stream the file into the semantic store in bounded-memory batches
+        encoding = detect_encoding(file_path)
+        chunk_ids = self.semantic_store.add_document_stream(
+            lambda: iter_file_blocks(file_path, encoding=encoding),
             metadata=file_metadata,
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
+            chunk_overlap=chunk_overlap,
+            embedding_service=self.embedding_service
         )
 
         logger.info(f"Ingested {file_path}: {len(chunk_ids)} chunks created")
@@ -149,7 +150,8 @@ class SemanticIngestor:
             content=text,
             metadata=text_metadata,
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
+            chunk_overlap=chunk_overlap,
+            embedding_service=self.embedding_service
         )
 
         logger.info(f"Ingested text: {len(chunk_ids)} chunks created")
@@ -240,9 +242,6 @@ class SemanticIngestor:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Code file not found: {file_path}")
 
-        # Read file content
-        content = self._read_file(file_path)
-
         # Build metadata for code
         code_metadata = metadata or {}
         code_metadata["source"] = file_path
@@ -254,12 +253,14 @@ class SemanticIngestor:
         # For now, use same chunking as documents
         # Could be enhanced with AST-based chunking for code
 
-        # Add document to semantic store
-        chunk_ids = self.semantic_store.add_document(
-            content=content,
+        # Stream the file into the semantic store in bounded-memory batches
+        encoding = detect_encoding(file_path)
+        chunk_ids = self.semantic_store.add_document_stream(
+            lambda: iter_file_blocks(file_path, encoding=encoding),
             metadata=code_metadata,
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
+            chunk_overlap=chunk_overlap,
+            embedding_service=self.embedding_service
         )
 
         logger.info(f"Ingested code file {file_path}: {len(chunk_ids)} chunks created")
@@ -343,7 +344,7 @@ _semantic_ingestor: Optional[SemanticIngestor] = None
 
 def get_semantic_ingestor(
     semantic_store: Optional[SemanticStore] = None,
-    embedding_service: Optional[EmbeddingService] = None
+    embedding_service: Optional[Union[EmbeddingService, ParallelEmbeddingService]] = None
 ) -> SemanticIngestor:
     """
     Get or create the semantic ingestor singleton.
@@ -31,13 +31,15 @@ It does NOT answer:
 "What is true?"
 """
 
+import asyncio
+import functools
 import json
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 from .semantic_store import SemanticStore, get_semantic_store
-from .embedding import EmbeddingService, get_embedding_service
+from .embedding import EmbeddingMemo, EmbeddingService, get_embedding_service
 from .query_expander import get_query_expander
 
 
@@ -100,7 +102,10 @@ class SemanticRetriever:
         metadata_filters: Optional[Dict[str, Any]] = None,
         min_score: float = 0.0,
         include_recency: bool = True,
-        max_results: int = 5
+        max_results: int = 5,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+        embedding_memo: Optional[EmbeddingMemo] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant documents based on query (query-driven).
@@ -113,6 +118,9 @@ class SemanticRetriever:
             min_score: Minimum similarity score
             include_recency: Whether to boost recent documents
             max_results: Maximum number of results to return
+            nprobe: ANN clusters to scan (recall/latency trade-off; default from config)
+            exact: Bypass the ANN index and scan every chunk
+            embedding_memo: Per-request memo shared with other subsystems
 
         Returns:
             List of retrieved documents with scores, metadata, and citations
@@ -120,7 +128,66 @@ class SemanticRetriever:
         Raises:
             ValueError: If trigger is invalid
         """
-        # Validate trigger (prevent auto-retrieval)
+        self._validate_trigger(trigger)
+
+        # Generate query embedding
+        query_embedding = self._embedder(embedding_memo).embed_single(query)
+
+        if not query_embedding:
+            return []
+
+        return self._search_and_rank(
+            query, query_embedding, top_k, metadata_filters, min_score,
+            include_recency, max_results, nprobe, exact
+        )
+
+    async def retrieve_async(
+        self,
+        query: str,
+        trigger: str = "external_info_needed",
+        top_k: int = 3,
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        min_score: float = 0.0,
+        include_recency: bool = True,
+        max_results: int = 5,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+        embedding_memo: Optional[EmbeddingMemo] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async retrieve() for concurrent callers (e.g. MCP tool calls).
+
+        The query is embedded through EmbeddingService.embed_async, so queries
+        arriving together share one batched model call; the search runs in
+        the default executor. Arguments and results are as for retrieve().
+
+        Raises:
+            ValueError: If trigger is invalid
+        """
+        self._validate_trigger(trigger)
+
+        query_embedding = await self._embedder(embedding_memo).embed_async(query)
+
+        if not query_embedding:
+            return []
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(
+            self._search_and_rank, query, query_embedding, top_k, metadata_filters,
+            min_score, include_recency, max_results, nprobe, exact
+        ))
+
+    def _embedder(self, embedding_memo: Optional[EmbeddingMemo]) -> Union[EmbeddingMemo, EmbeddingService]:
+        """Embed through the request's memo when one is given."""
+        return embedding_memo if embedding_memo is not None else self.embedding_service
+
+    def _validate_trigger(self, trigger: str) -> None:
+        """
+        Validate a retrieval trigger (prevent auto-retrieval).
+
+        Raises:
+            ValueError: If trigger is invalid
+        """
         if trigger not in self.VALID_TRIGGERS:
             raise ValueError(
                 f"Invalid retrieval trigger: {trigger}. "
@@ -128,18 +195,31 @@ class SemanticRetriever:
                 "Retrieval must be explicitly triggered, not automatic."
             )
 
-        # Generate query embedding
-        query_embedding = self.embedding_service.embed_single(query)
-
-        if not query_embedding:
-            return []
+    def _search_and_rank(
+        self,
+        query: str,
+        query_embedding: List[float],
+        top_k: int,
+        metadata_filters: Optional[Dict[str, Any]],
+        min_score: float,
+        include_recency: bool,
+        max_results: int,
+        nprobe: Optional[int],
+        exact: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the semantic store with a query embedding and rank the results.
 
+        Returns:
+            Top-k ranked results
+        """
         # Search semantic store
         raw_results = self.semantic_store.search(
             query_embedding=query_embedding,
             top_k=max_results,
             metadata_filters=metadata_filters,
-            min_score=min_score
+            min_score=min_score,
+            **self._ann_search_kwargs(nprobe, exact)
         )
 
         # Rank results (similarity + metadata relevance + recency)
@@ -156,7 +236,10 @@ class SemanticRetriever:
         metadata_filters: Optional[Dict[str, Any]] = None,
         min_score: float = 0.0,
         include_recency: bool = True,
-        num_expansions: Optional[int] = None
+        num_expansions: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+        embedding_memo: Optional[EmbeddingMemo] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve with query expansion for better recall.
@@ -171,6 +254,9 @@ class SemanticRetriever:
             min_score: Minimum similarity score
             include_recency: Whether to boost recent documents
             num_expansions: Number of expansions (default: from config)
+            nprobe: ANN clusters to scan (recall/latency trade-off; default from config)
+            exact: Bypass the ANN index and scan every chunk
+            embedding_memo: Per-request memo shared with other subsystems
 
         Returns:
             List of retrieved documents with scores, metadata, and citations
@@ -180,7 +266,10 @@ class SemanticRetriever:
         """
         if not self.query_expansion_enabled:
             # Fall back to normal retrieval
-            return self.retrieve(query, trigger, top_k, metadata_filters, min_score, include_recency)
+            return self.retrieve(
+                query, trigger, top_k, metadata_filters, min_score, include_recency,
+                nprobe=nprobe, exact=exact, embedding_memo=embedding_memo
+            )
 
         expansions = num_expansions or self.num_expansions
         expander = get_query_expander(num_expansions=expansions)
@@ -188,16 +277,16 @@ class SemanticRetriever:
         # Expand query
         expanded_queries = expander.expand_query(query)
 
-        # Search with each query
-        all_results = []
-        for expanded_query in expanded_queries:
-            results = self._search_without_trigger(
-                expanded_query,
-                top_k=top_k * 2,  # Get more results per query
-                metadata_filters=metadata_filters,
-                min_score=min_score
-            )
-            all_results.append(results)
+        # Embed all expansions in one batch and score them in one pass
+        all_results = self._search_many_without_trigger(
+            expanded_queries,
+            top_k=top_k * 2,  # Get more results per query
+            metadata_filters=metadata_filters,
+            min_score=min_score,
+            nprobe=nprobe,
+            exact=exact,
+            embedding_memo=embedding_memo
+        )
 
         # Merge and deduplicate results
         merged_results = self._merge_retrieval_results(all_results)
@@ -213,7 +302,10 @@ class SemanticRetriever:
         query: str,
         top_k: int = 3,
         metadata_filters: Optional[Dict[str, Any]] = None,
-        min_score: float = 0.0
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+        embedding_memo: Optional[EmbeddingMemo] = None
     ) -> List[Dict[str, Any]]:
         """
         Search without trigger validation (internal use).
@@ -225,12 +317,15 @@ class SemanticRetriever:
             top_k: Number of top results to return
             metadata_filters: Optional metadata filters
             min_score: Minimum similarity score
+            nprobe: ANN clusters to scan
+            exact: Bypass the ANN index
+            embedding_memo: Per-request memo shared with other subsystems
 
         Returns:
             List of retrieved documents with scores, metadata, and citations
         """
         # Generate query embedding
-        query_embedding = self.embedding_service.embed_single(query)
+        query_embedding = self._embedder(embedding_memo).embed_single(query)
 
         if not query_embedding:
             return []
@@ -240,11 +335,68 @@ class SemanticRetriever:
             query_embedding=query_embedding,
             top_k=top_k,
             metadata_filters=metadata_filters,
-            min_score=min_score
+            min_score=min_score,
+            **self._ann_search_kwargs(nprobe, exact)
         )
 
         return raw_results
 
+    def _search_many_without_trigger(
+        self,
+        queries: List[str],
+        top_k: int = 3,
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+        embedding_memo: Optional[EmbeddingMemo] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search several queries without trigger validation (internal use).
+
+        All queries are embedded in one batch and scored with one
+        semantic_store.search_many() call.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of top results per query
+            metadata_filters: Optional metadata filters
+            min_score: Minimum similarity score
+            nprobe: ANN clusters to scan
+            exact: Bypass the ANN index
+            embedding_memo: Per-request memo shared with other subsystems
+
+        Returns:
+            One list of retrieved documents per query
+        """
+        query_embeddings = self._embedder(embedding_memo).embed(queries)
+
+        if not query_embeddings:
+            return []
+
+        return self.semantic_store.search_many(
+            query_embeddings=query_embeddings,
+            top_k=top_k,
+            metadata_filters=metadata_filters,
+            min_score=min_score,
+            **self._ann_search_kwargs(nprobe, exact)
+        )
+
+    @staticmethod
+    def _ann_search_kwargs(nprobe: Optional[int], exact: bool) -> Dict[str, Any]:
+        """
+        ANN knobs for semantic_store.search().
+
+        Only non-default knobs are passed, so stores without an ANN index
+        (e.g. the ChromaDB backend) keep working.
+        """
+        kwargs: Dict[str, Any] = {}
+        if nprobe is not None:
+            kwargs["nprobe"] = nprobe
+        if exact:
+            kwargs["exact"] = True
+        return kwargs
+
     def _merge_retrieval_results(
         self,
         all_results: List[List[Dict[str, Any]]]
@@ -33,9 +33,11 @@ Content Policy:
 import json
 import os
 import hashlib
+import threading
 import uuid
 import logging
-from typing import List, Dict, Any, Optional, Tuple, Set
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -45,6 +47,35 @@ logger = logging.getLogger(__name__)
 
 # Import embedding service at module level (no lazy import needed)
 from .embedding import get_embedding_service
+from .chunking import iter_text_chunks
+from .ann_index import ASSIGNMENTS_FILE, CENTROIDS_FILE, IVFIndex, create_ann_index
+from .metadata_index import MetadataIndex
+from .quantization import STORAGE_MODES, MappedRows, dequantize_int8, int8_scores, quantize_int8, top_indices
+from .semantic_index_io import (
+    EMBEDDINGS_FILE,
+    ChunkRowStore,
+    INDEX_FORMAT_VERSION,
+    SEGMENT_FORMAT_VERSION,
+    load_array,
+    new_log_manifest,
+    open_segment,
+    read_manifest,
+    remove_root_segment_files,
+    remove_segment,
+    remove_unreferenced_segments,
+    save_array,
+    segment_path,
+    write_manifest,
+    write_segment,
+)
+
+# Chunks embedded and persisted together by add_document_stream()
+STREAM_BATCH_CHUNKS = 1024
+
+# Compaction rewrites the base segment once the rows in appended segments
+# plus the rows hidden by tombstones reach this fraction of the base's rows;
+# until then, appended segments are merged with segments of similar size
+BASE_REWRITE_RATIO = 0.5
 
 
 class DocumentChunk:
@@ -76,7 +107,8 @@ class DocumentChunk:
         self.chunk_id = chunk_id or str(uuid.uuid4())
         self.document_id = document_id
         self.content = content
-        self.embedding = embedding or []
+        # May be a row view into the store's embedding matrix after load
+        self.embedding = embedding if embedding is not None else []
         self.metadata = metadata or {}
         self.chunk_index = chunk_index
         self.created_at = created_at or datetime.now(timezone.utc).isoformat()
@@ -87,7 +119,7 @@ class DocumentChunk:
             "chunk_id": self.chunk_id,
             "document_id": self.document_id,
             "content": self.content,
-            "embedding": self.embedding,
+            "embedding": self.embedding.tolist() if isinstance(self.embedding, np.ndarray) else self.embedding,
             "metadata": self.metadata,
             "chunk_index": self.chunk_index,
             "created_at": self.created_at
@@ -157,6 +189,100 @@ class DocumentChunk:
         return True
 
 
+class _ChunkList:
+    """
+    Row-aligned chunks of a SemanticStore, decoded on first access.
+
+    Lazily loaded rows are held as (ChunkRowStore, position) references
+    and replaced by DocumentChunk objects the first time they are read,
+    so only rows that are actually returned pay for JSON decoding.
+    Supports the list operations the store uses (len, indexing,
+    iteration, extend). Rows are only ever appended in place; deletes
+    build a new list (kept()), so a reader holding a list and its length
+    sees a consistent set of rows.
+    """
+
+    def __init__(self, materialize: Callable[[Dict[str, Any], int, "_ChunkList"], DocumentChunk], lock: threading.RLock):
+        """
+        Args:
+            materialize: Builds the chunk of row i of a list from its row-store record
+            lock: Store lock, held while a reference is replaced
+        """
+        self._items: List[Union[DocumentChunk, Tuple[ChunkRowStore, int]]] = []
+        self._materialize = materialize
+        self._lock = lock
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[DocumentChunk]:
+        for index in range(len(self._items)):
+            yield self[index]
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+
+        item = self._items[index]
+        if isinstance(item, DocumentChunk):
+            return item
+        with self._lock:
+            row = index % len(self._items)
+            item = self._items[row]
+            if not isinstance(item, DocumentChunk):
+                rows, position = item
+                item = self._materialize(rows.get(position), row, self)
+                self._items[row] = item
+            return item
+
+    def kept(self, keep: np.ndarray) -> "_ChunkList":
+        """
+        New list holding the rows selected by a mask.
+
+        Args:
+            keep: bool (rows,) mask of rows to keep
+        """
+        copy = _ChunkList(self._materialize, self._lock)
+        copy._items = [item for item, kept in zip(self._items, keep.tolist()) if kept]
+        return copy
+
+    def extend(self, chunks: List[DocumentChunk]) -> None:
+        """Append decoded chunks."""
+        self._items.extend(chunks)
+
+    def extend_refs(self, rows: ChunkRowStore, positions: List[int]) -> None:
+        """Append rows that are decoded from rows on first access."""
+        self._items.extend((rows, position) for position in positions)
+
+    def metadata(self, index: int) -> Dict[str, Any]:
+        """Metadata of a row, without keeping the decoded chunk."""
+        item = self._items[index]
+        if isinstance(item, DocumentChunk):
+            return item.metadata
+        rows, position = item
+        return rows.get(position)["metadata"]
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Row-store record of a row, without keeping the decoded chunk."""
+        item = self._items[index]
+        if isinstance(item, DocumentChunk):
+            return SemanticStore._chunk_record(item)
+        rows, position = item
+        return rows.get(position)
+
+    def snapshot(self) -> "_ChunkList":
+        """Shallow copy, safe to read while the original keeps changing."""
+        copy = _ChunkList(self._materialize, self._lock)
+        copy._items = list(self._items)
+        return copy
+
+    def rebase(self, rows: ChunkRowStore, count: int) -> None:
+        """Point undecoded references among the first count rows at rows (e.g. a new base segment)."""
+        for index in range(count):
+            if not isinstance(self._items[index], DocumentChunk):
+                self._items[index] = (rows, index)
+
+
 class SemanticStore:
     """
     Enhanced vector store for semantic memory with metadata.
@@ -174,32 +300,109 @@ class SemanticStore:
         >>> results = store.search("How does authentication work?", top_k=3)
     """
 
-    def __init__(self, index_path: str = "./data/semantic_index"):
+    def __init__(
+        self,
+        index_path: str = "./data/semantic_index",
+        compaction_threshold: int = 16,
+        background_compaction: bool = True,
+        ann_config: Optional[Dict[str, Any]] = None,
+        storage_mode: str = "float32",
+        rerank_factor: int = 4,
+        lazy_load: bool = False,
+        warm_up: bool = False
+    ):
         """
         Initialize semantic store.
 
         Args:
             index_path: Path to store vector index and metadata
+            compaction_threshold: Number of pending segments and tombstones
+                that triggers a compaction (a base rewrite, or a merge of
+                similar-size segments while the base is large in comparison)
+            background_compaction: Compact in a background thread instead of
+                blocking the writer
+            ann_config: Optional "semantic_index" config block selecting an
+                approximate index ({"ann_index": "ivf", "ivf_n_lists": ...});
+                flat (exact) search when omitted
+            storage_mode: In-memory embedding representation: "float32", or
+                "int8" (per-vector scaled codes, ~4x smaller; float vectors
+                stay memory-mapped on disk)
+            rerank_factor: With int8 storage, re-rank top_k * rerank_factor
+                candidates with their float vectors (0 disables re-ranking)
+            lazy_load: Load only the manifest, embedding matrix and ID index;
+                chunk text and metadata are decoded when a row is first read
+                (e.g. a search hit)
+            warm_up: With lazy_load, page in the embedding matrix and build
+                the source table in a background thread after loading
         """
         self.index_path = index_path
+        self.compaction_threshold = compaction_threshold
+        self.background_compaction = background_compaction
+        self.lazy_load = lazy_load
+
+        if storage_mode not in STORAGE_MODES:
+            logger.warning(f"Unknown storage_mode '{storage_mode}', using float32")
+            storage_mode = "float32"
+        self.storage_mode = storage_mode
+        self.rerank_factor = rerank_factor
+        self._quantized = storage_mode == "int8"
+
+        self._lock = threading.RLock()
 
         # Core data structures
-        self.chunks: List[DocumentChunk] = []
+        self.chunks = _ChunkList(self._materialize_chunk, self._lock)
         self.document_ids: Set[str] = set()
 
+        # Lookup indexes, maintained incrementally alongside self.chunks:
+        # chunk_id -> document_id, document_id -> sorted row positions, and
+        # source -> type -> {"chunk_count", "last_updated"} (None until
+        # first needed after a lazy load)
+        self._chunk_documents: Dict[str, str] = {}
+        self._document_rows: Dict[str, np.ndarray] = {}
+        self._source_stats: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        # Posting lists over chunk metadata, for filtered search
+        self._metadata_index = MetadataIndex()
+        self._warm_up_thread: Optional[threading.Thread] = None
+
+        # Pre-normalized embedding matrix, row i <-> self.chunks[i].
+        # Allocated with spare capacity so appends are amortized O(1).
+        # With int8 storage it holds codes, scaled by _scales, and
+        # _mapped locates each row's float vector in the segment files.
+        self._vectors: np.ndarray = np.zeros((0, 0), dtype=self._matrix_dtype)
+        self._vector_mask: np.ndarray = np.zeros(0, dtype=bool)
+        self._scales: np.ndarray = np.zeros(0, dtype=np.float32)
+        self._mapped = MappedRows()
+        self._dim: Optional[int] = None
+
+        # Optional ANN index over the embedding matrix (None = flat search).
+        # Trained during compaction once the index is large enough.
+        self._ann: Optional[IVFIndex] = create_ann_index(ann_config)
+        self._mutations = 0
+
+        # Append-only segment log (see semantic_index_io)
+        self._manifest: Dict[str, Any] = new_log_manifest()
+        # Row counts of the base and of each appended segment, for choosing merges
+        self._base_rows = 0
+        self._segment_rows: Dict[str, int] = {}
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
         # Ensure index directory exists
         os.makedirs(index_path, exist_ok=True)
         os.makedirs(os.path.join(index_path, "metadata"), exist_ok=True)
 
         # Load existing index
         self.load()
+        if lazy_load and warm_up:
+            self.start_warm_up()
 
     def add_document(
         self,
         content: str,
         metadata: Dict[str, Any],
         chunk_size: int = 500,
-        chunk_overlap: int = 50
+        chunk_overlap: int = 50,
+        embedding_service=None
     ) -> List[str]:
         """
         Add a document to semantic store with automatic chunking.
@@ -209,6 +412,57 @@ class SemanticStore:
             metadata: Document metadata (source, type, etc.)
             chunk_size: Target chunk size
             chunk_overlap: Overlap between chunks
+            embedding_service: Service embedding the chunks, e.g. a
+                ParallelEmbeddingService (default: the shared EmbeddingService)
+
+        Returns:
+            List of chunk_ids created
+
+        Raises:
+            ValueError: If metadata contains forbidden content
+        """
+        self._validate_document(content[:100], metadata)
+
+        # Generate document ID from source if provided
+        source = metadata.get("source", "")
+        document_id = self._generate_document_id(source) if source else str(uuid.uuid4())
+
+        # Chunk the content
+        chunks = self._chunk_content(content, chunk_size, chunk_overlap)
+
+        chunk_ids = self._store_chunks(document_id, metadata, chunks, 0, len(chunks), embedding_service)
+
+        self._maybe_compact()
+        return chunk_ids
+
+    def add_document_stream(
+        self,
+        read_blocks: Callable[[], Iterable[str]],
+        metadata: Dict[str, Any],
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        embedding_service=None,
+        batch_size: int = STREAM_BATCH_CHUNKS
+    ) -> List[str]:
+        """
+        Add a document read as a stream of text blocks, in bounded memory.
+
+        Creates the same chunks as add_document() on the joined blocks, but
+        chunks, embeds and persists batch_size chunks at a time. The blocks
+        are read twice: once to count the chunks (for total_chunks) and once
+        to store them. If storing fails part-way, the batches stored so far
+        are deleted again, so a new document is added whole or not at all
+        (a document_id already in the store is left as it is, since
+        deleting would also drop its earlier chunks).
+
+        Args:
+            read_blocks: Returns a fresh iterable of the document's text
+                blocks, e.g. lambda: iter_file_blocks(path)
+            metadata: Document metadata (source, type, etc.)
+            chunk_size: Target chunk size
+            chunk_overlap: Overlap between chunks
+            embedding_service: Service embedding the chunks
+            batch_size: Chunks embedded and persisted together
 
         Returns:
             List of chunk_ids created
@@ -216,8 +470,63 @@ class SemanticStore:
         Raises:
             ValueError: If metadata contains forbidden content
         """
-        # Validate metadata doesn't contain forbidden content
-        temp_chunk = DocumentChunk(document_id="temp", content=content[:100], metadata=metadata)
+        head: List[str] = []
+
+        def blocks_with_head() -> Iterator[str]:
+            seen = 0
+            for block in read_blocks():
+                if seen < 100:
+                    head.append(block[:100 - seen])
+                    seen += len(head[-1])
+                yield block
+
+        total_chunks = sum(1 for _ in self._iter_chunks(blocks_with_head(), chunk_size, chunk_overlap))
+        self._validate_document("".join(head), metadata)
+
+        source = metadata.get("source", "")
+        document_id = self._generate_document_id(source) if source else str(uuid.uuid4())
+
+        with self._lock:
+            existed = document_id in self.document_ids
+
+        chunk_ids: List[str] = []
+        batch: List[str] = []
+        try:
+            for chunk in self._iter_chunks(read_blocks(), chunk_size, chunk_overlap):
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    chunk_ids.extend(self._store_chunks(
+                        document_id, metadata, batch, len(chunk_ids), total_chunks, embedding_service
+                    ))
+                    batch = []
+            if batch or not chunk_ids:
+                chunk_ids.extend(self._store_chunks(
+                    document_id, metadata, batch, len(chunk_ids), total_chunks, embedding_service
+                ))
+        except Exception:
+            if chunk_ids and not existed:
+                logger.warning(
+                    f"Streaming {document_id} failed after {len(chunk_ids)}/{total_chunks} chunks; "
+                    "deleting the stored chunks"
+                )
+                self.delete_document(document_id)
+            raise
+
+        self._maybe_compact()
+        return chunk_ids
+
+    def _validate_document(self, head: str, metadata: Dict[str, Any]) -> None:
+        """
+        Reject documents whose metadata or opening text is forbidden content.
+
+        Args:
+            head: First 100 characters of the document
+            metadata: Document metadata
+
+        Raises:
+            ValueError: If metadata contains forbidden content
+        """
+        temp_chunk = DocumentChunk(document_id="temp", content=head, metadata=metadata)
         if not temp_chunk.validate_metadata():
             forbidden_types = [
                 "User preferences",
@@ -231,19 +540,36 @@ class SemanticStore:
                 "Use Symbolic Memory for preferences/decisions and Episodic Memory for agent lessons."
             )
 
-        # Generate document ID from source if provided
-        source = metadata.get("source", "")
-        document_id = self._generate_document_id(source) if source else str(uuid.uuid4())
+    def _store_chunks(
+        self,
+        document_id: str,
+        metadata: Dict[str, Any],
+        chunks: List[str],
+        start_index: int,
+        total_chunks: int,
+        embedding_service=None
+    ) -> List[str]:
+        """
+        Embed chunks of a document and append them as one segment.
 
-        # Chunk the content
-        chunks = self._chunk_content(content, chunk_size, chunk_overlap)
+        Args:
+            document_id: Document the chunks belong to
+            metadata: Document metadata
+            chunks: Chunk texts
+            start_index: chunk_index of the first chunk
+            total_chunks: Number of chunks in the whole document
+            embedding_service: Service embedding the chunks
+
+        Returns:
+            List of chunk_ids created
+        """
+        # Embed all chunks in batches
+        embeddings = _generate_embeddings(chunks, embedding_service)
 
         # Create DocumentChunk objects with embeddings
         chunk_ids = []
-        for i, chunk_text in enumerate(chunks):
-            # Generate embedding for the chunk
-            embedding = _generate_embedding(chunk_text)
-
+        new_chunks = []
+        for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings), start=start_index):
             chunk = DocumentChunk(
                 document_id=document_id,
                 content=chunk_text,
@@ -253,14 +579,20 @@ class SemanticStore:
                     **metadata,
                     "document_id": document_id,
                     "chunk_index": i,
-                    "total_chunks": len(chunks)
+                    "total_chunks": total_chunks
                 }
             )
-            self.chunks.append(chunk)
+            new_chunks.append(chunk)
             chunk_ids.append(chunk.chunk_id)
 
-        self.document_ids.add(document_id)
-        self.save()
+        with self._lock:
+            vectors, block_id = self._append_vectors(new_chunks)
+            self._index_chunks(new_chunks, start=len(self.chunks))
+            self.chunks.extend(new_chunks)
+            self.document_ids.add(document_id)
+            self._mutations += 1
+            self._append_segment(new_chunks, vectors, block_id)
+
         return chunk_ids
 
     def _generate_document_id(self, source: str) -> str:
@@ -297,114 +629,373 @@ class SemanticStore:
         Returns:
             List of text chunks
         """
-        if not content:
-            return []
+        return list(self._iter_chunks([content], chunk_size, chunk_overlap))
 
-        chunks = []
+    @staticmethod
+    def _iter_chunks(blocks: Iterable[str], chunk_size: int, chunk_overlap: int) -> Iterator[str]:
+        """
+        Lazily chunk text given as consecutive blocks.
 
-        # Split by paragraphs first (semantic boundaries)
-        paragraphs = content.split('\n\n')
+        Paragraphs are packed up to chunk_size, long paragraphs are split by
+        sentences, and each chunk after the first carries chunk_overlap
+        characters of the previous one.
 
-        current_chunk = ""
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
+        Args:
+            blocks: Consecutive pieces of the content
+            chunk_size: Target chunk size
+            chunk_overlap: Overlap between chunks
 
-            # If adding this paragraph exceeds chunk size
-            if len(current_chunk) + len(para) + 2 > chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-
-                # If paragraph itself is too long, split it
-                if len(para) > chunk_size:
-                    # Split by sentences
-                    sentences = para.split('. ')
-                    current = ""
-                    for sent in sentences:
-                        if len(current) + len(sent) + 1 > chunk_size:
-                            if current:
-                                chunks.append(current.strip() + ".")
-                            current = sent
-                        else:
-                            current = f"{current} {sent}".strip() if current else sent
-                    if current:
-                        chunks.append(current.strip() + ".")
-                else:
-                    current_chunk = para
-            else:
-                current_chunk = f"{current_chunk}\n\n{para}".strip()
-
-        # Don't forget last chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-
-        # Apply overlap (preserve context between chunks)
-        if chunk_overlap > 0 and len(chunks) > 1:
-            overlapped = []
-            for i, chunk in enumerate(chunks):
-                if i > 0:
-                    prev_chunk = chunks[i - 1]
-                    # Get overlap from end of previous chunk
-                    overlap_text = prev_chunk[-chunk_overlap:] if len(prev_chunk) > chunk_overlap else prev_chunk
-                    chunk = f"...{overlap_text}...\n{chunk}"
-                overlapped.append(chunk)
-            chunks = overlapped
-
-        return chunks
+        Returns:
+            Iterator over text chunks
+        """
+        return iter_text_chunks(blocks, chunk_size, chunk_overlap, split_long="sentences")
 
     def search(
         self,
         query_embedding: List[float],
         top_k: int = 3,
         metadata_filters: Optional[Dict[str, Any]] = None,
-        min_score: float = 0.0
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        exact: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Search for relevant chunks using cosine similarity.
 
+        With an IVF index configured and trained, only rows in the nprobe
+        clusters nearest to the query are scored, unless metadata filters
+        match fewer rows than those clusters hold; the filtered rows are
+        then scanned exactly.
+
         Args:
             query_embedding: Query vector embedding
             top_k: Number of results to return
             metadata_filters: Optional metadata filters
             min_score: Minimum similarity score
+            nprobe: IVF clusters to scan (higher = better recall, slower);
+                defaults to the configured value
+            exact: Force a flat scan even when an ANN index is available
 
         Returns:
             List of dicts with chunk content, score, metadata, and citations
         """
-        if not self.chunks:
+        return self.search_many(
+            [query_embedding],
+            top_k=top_k,
+            metadata_filters=metadata_filters,
+            min_score=min_score,
+            nprobe=nprobe,
+            exact=exact
+        )[0]
+
+    def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 3,
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        min_score: float = 0.0,
+        nprobe: Optional[int] = None,
+        exact: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries at once (e.g. query expansions).
+
+        Filters are resolved once and all queries are scored with one
+        matrix-matrix product; each query is then ranked as in search().
+
+        Args:
+            query_embeddings: Query vector embeddings
+            top_k: Number of results per query
+            metadata_filters: Optional metadata filters (shared by all queries)
+            min_score: Minimum similarity score
+            nprobe: IVF clusters to scan per query; defaults to the configured value
+            exact: Force a flat scan even when an ANN index is available
+
+        Returns:
+            One result list per query, in query order (see search())
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in query_embeddings]
+        dim = self._dim
+        if dim is None or top_k <= 0:
+            return results
+
+        # Queries that cannot be scored keep an empty result list
+        slots, rows = [], []
+        for slot, embedding in enumerate(query_embeddings):
+            query = _to_unit_vector(embedding)
+            if query is None:
+                continue
+            if query.shape[0] != dim:
+                logger.warning(
+                    f"Query embedding dimension {query.shape[0]} does not match index dimension {dim}"
+                )
+                continue
+            slots.append(slot)
+            rows.append(query)
+        if not rows:
+            return results
+        queries = np.stack(rows)
+
+        # Snapshot the rows under the lock and score them outside it. Appends
+        # only write past n and deletes swap in new containers, so the
+        # snapshot stays consistent while other threads keep writing.
+        with self._lock:
+            chunks = self.chunks
+            n = len(chunks)
+            if n == 0:
+                return results
+            vectors, vector_mask, scales = self._vectors, self._vector_mask, self._scales
+            mapped = self._mapped.snapshot() if self._quantized else None
+            use_ann = not exact and self._ann is not None and self._ann.is_trained
+
+            # Filters are resolved on the metadata posting lists before scoring
+            filtered_rows, residual_filters = None, {}
+            if metadata_filters:
+                filtered_rows, residual_filters = self._metadata_index.match(
+                    metadata_filters,
+                    chunks.metadata,
+                    n
+                )
+
+            # Approximate: only rows in each query's probed IVF lists are candidates
+            probes = [self._ann.probe(query, nprobe) for query in queries] if use_ann else None
+
+        if use_ann:
+            candidates = np.unique(np.concatenate(probes))
+            if filtered_rows is not None and filtered_rows.size <= candidates.size:
+                # A selective filter: scanning its rows exactly is no more
+                # work than the probed lists, which may miss every match
+                use_ann = False
+                candidates = filtered_rows
+            elif filtered_rows is not None:
+                candidates = candidates[np.isin(candidates, filtered_rows, assume_unique=True)]
+        elif filtered_rows is not None:
+            candidates = filtered_rows
+        else:
+            candidates = None
+
+        if candidates is not None:
+            candidates = candidates[vector_mask[candidates]]
+        else:
+            candidates = np.flatnonzero(vector_mask[:n])
+        if residual_filters:
+            # Filters the index cannot evaluate (unhashable values)
+            candidates = candidates[np.fromiter(
+                (self._matches_metadata(chunks.metadata(i), residual_filters) for i in candidates),
+                dtype=bool,
+                count=candidates.size
+            )]
+        if candidates.size == 0:
+            return results
+
+        # (candidates, queries) score matrix
+        if self._quantized:
+            # Asymmetric distance: float queries against int8 codes
+            scores = int8_scores(vectors, scales, queries.T, candidates)
+        elif use_ann or candidates.size < n // 2:
+            # Score only the surviving rows
+            scores = vectors[candidates] @ queries.T
+        else:
+            # One matrix-matrix product scores every row (rows are unit length)
+            scores = (vectors[:n] @ queries.T)[candidates]
+
+        for column, slot in enumerate(slots):
+            if use_ann:
+                probed = np.isin(candidates, probes[column], assume_unique=True)
+                ranked = (candidates[probed], scores[probed, column])
+            else:
+                ranked = (candidates, scores[:, column])
+            results[slot] = self._rank(chunks, mapped, *ranked, queries[column], top_k, min_score)
+
+        return results
+
+    def _rank(
+        self,
+        chunks: _ChunkList,
+        mapped: Optional[MappedRows],
+        candidates: np.ndarray,
+        scores: np.ndarray,
+        query: np.ndarray,
+        top_k: int,
+        min_score: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Select, order and format the top_k scored candidates of one query.
+
+        Args:
+            chunks: Chunk list snapshot the candidate rows index
+            mapped: Float vector locator snapshot (int8 storage only)
+            candidates: Candidate rows
+            scores: Their scores
+            query: Unit-length query vector (for int8 re-ranking)
+            top_k: Number of results
+            min_score: Minimum similarity score
+
+        Returns:
+            List of dicts with chunk content, score, metadata, and citations
+        """
+        if candidates.size == 0:
             return []
 
-        # Compute similarities for all chunks
+        k = min(top_k, candidates.size)
+        if self._quantized and self.rerank_factor > 0:
+            # Re-rank the best approximate candidates with their float vectors
+            pool = top_indices(scores, min(k * self.rerank_factor, candidates.size))
+            candidates = candidates[pool]
+            scores = mapped.gather(candidates) @ query
+
+        # Top-k selection without sorting the whole score vector
+        top = top_indices(scores, k)
+        # Sort by score (descending), ties broken by insertion order
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+
         results = []
-        for idx, chunk in enumerate(self.chunks):
-            # Check metadata filters
-            if metadata_filters and not self._matches_metadata(chunk.metadata, metadata_filters):
-                continue
+        for pos in top:
+            score = float(scores[pos])
+            if score < min_score:
+                break
+            chunk = chunks[int(candidates[pos])]
+            results.append({
+                "chunk_id": chunk.chunk_id,
+                "document_id": chunk.document_id,
+                "content": chunk.content,
+                "score": score,
+                "metadata": chunk.metadata,
+                "chunk_index": chunk.chunk_index,
+                "citation": f"{chunk.metadata.get('source', 'unknown')}:{chunk.chunk_index}"
+            })
+
+        return results
+
+    def _append_vectors(self, chunks: List[DocumentChunk]) -> Tuple[np.ndarray, Optional[int]]:
+        """
+        Append normalized embeddings for new chunks to the search matrix.
 
-            # Check if chunk has embedding
-            if not chunk.embedding:
-                continue
+        Must be called before the chunks are added to self.chunks so that
+        row positions stay aligned with chunk positions.
 
-            # Compute cosine similarity
-            score = self._cosine_similarity(query_embedding, chunk.embedding)
-
-            if score >= min_score:
-                results.append({
-                    "chunk_id": chunk.chunk_id,
-                    "document_id": chunk.document_id,
-                    "content": chunk.content,
-                    "score": score,
-                    "metadata": chunk.metadata,
-                    "chunk_index": chunk.chunk_index,
-                    "citation": f"{chunk.metadata.get('source', 'unknown')}:{chunk.chunk_index}"
-                })
+        Args:
+            chunks: Newly created chunks, in insertion order
 
-        # Sort by score (descending)
-        results.sort(key=lambda x: x["score"], reverse=True)
+        Returns:
+            (float32 (len(chunks), dim) normalized embeddings, MappedRows
+            block id holding them with int8 storage, else None)
+        """
+        if not chunks:
+            return np.zeros((0, self._dim or 0), dtype=np.float32), None
+
+        rows = [_to_unit_vector(chunk.embedding) for chunk in chunks]
+        if self._dim is None:
+            # The first usable embedding fixes the index dimension
+            self._dim = next((row.shape[0] for row in rows if row is not None), None)
+            if self._dim is not None:
+                self._vectors = np.zeros((self._vector_mask.shape[0], self._dim), dtype=self._matrix_dtype)
+
+        start = len(self.chunks)
+        end = start + len(chunks)
+        self._reserve(end)
+
+        vectors = np.zeros((len(chunks), self._dim or 0), dtype=np.float32)
+        for offset, row in enumerate(rows):
+            if row is not None and row.shape[0] != self._dim:
+                logger.warning(
+                    f"Skipping embedding with dimension {row.shape[0]} (index dimension is {self._dim})"
+                )
+                row = None
+            if row is not None:
+                vectors[offset] = row
+            self._vector_mask[start + offset] = row is not None
+
+        block_id = None
+        if self._quantized:
+            self._vectors[start:end], self._scales[start:end] = quantize_int8(vectors)
+            # Held in memory until the segment is written, then mapped from disk
+            block_id = self._mapped.add_block(vectors)
+            self._mapped.append(block_id, np.arange(len(chunks)))
+        else:
+            self._vectors[start:end] = vectors
+
+        if self._ann is not None:
+            self._ann.add(vectors, self._vector_mask[start:end])
+        return vectors, block_id
+
+    @property
+    def _matrix_dtype(self) -> type:
+        """dtype of the in-memory embedding matrix."""
+        return np.int8 if self._quantized else np.float32
+
+    def _dense_rows(self, start: int, end: int) -> np.ndarray:
+        """
+        float32 view of rows [start, end) of the embedding matrix.
 
-        # Return top-k results
-        return results[:top_k]
+        Dequantizes int8 codes; used where approximate vectors suffice
+        (e.g. assigning rows to ANN lists).
+        """
+        if self._dim is None:
+            return np.zeros((end - start, 0), dtype=np.float32)
+        if self._quantized:
+            return dequantize_int8(self._vectors[start:end], self._scales[start:end])
+        return self._vectors[start:end]
+
+    def _reserve(self, size: int) -> None:
+        """
+        Grow the embedding matrix so it can hold at least size rows.
+
+        Capacity doubles on growth, so repeated appends are amortized O(1).
+
+        Args:
+            size: Required number of rows
+        """
+        capacity = self._vector_mask.shape[0]
+        if size <= capacity:
+            return
+
+        new_capacity = max(size, capacity * 2, 64)
+        vectors = np.zeros((new_capacity, self._dim or 0), dtype=self._matrix_dtype)
+        mask = np.zeros(new_capacity, dtype=bool)
+        used = len(self.chunks)
+        vectors[:used] = self._vectors[:used]
+        mask[:used] = self._vector_mask[:used]
+        self._vectors = vectors
+        self._vector_mask = mask
+        if self._quantized:
+            scales = np.ones(new_capacity, dtype=np.float32)
+            scales[:used] = self._scales[:used]
+            self._scales = scales
+
+    def _materialize_chunk(self, record: Dict[str, Any], row: int, chunks: _ChunkList) -> DocumentChunk:
+        """
+        Build the chunk of a lazily loaded row.
+
+        Args:
+            record: Row-store record (chunk text and metadata)
+            row: Row position in chunks
+            chunks: List the row belongs to
+
+        Returns:
+            DocumentChunk whose embedding is read from the matrix (int8
+            storage: from the mapped float vectors); without an embedding
+            when chunks was replaced by a delete (a search snapshot), as
+            its rows no longer line up with the matrix
+        """
+        embedding = None
+        if chunks is self.chunks and self._dim is not None and self._vector_mask[row]:
+            embedding = self._mapped.gather(np.array([row]))[0] if self._quantized else self._vectors[row]
+        return DocumentChunk(**record, embedding=embedding)
+
+    def _rebuild_vectors(self) -> None:
+        """Rebuild the embedding matrix from self.chunks (used after load)."""
+        chunks = self.chunks
+        self.chunks = _ChunkList(self._materialize_chunk, self._lock)
+        self._vectors = np.zeros((0, 0), dtype=self._matrix_dtype)
+        self._vector_mask = np.zeros(0, dtype=bool)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._mapped.reset()
+        self._dim = None
+        if self._ann is not None:
+            self._ann.reset()
+        self._append_vectors(chunks)
+        self.chunks = chunks
 
     def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
         """
@@ -466,26 +1057,174 @@ class SemanticStore:
         Returns:
             DocumentChunk if found, None otherwise
         """
-        for chunk in self.chunks:
-            if chunk.chunk_id == chunk_id:
-                return chunk
+        with self._lock:
+            rows = self._document_rows.get(self._chunk_documents.get(chunk_id))
+            for row in rows if rows is not None else []:
+                chunk = self.chunks[int(row)]
+                if chunk.chunk_id == chunk_id:
+                    return chunk
         return None
 
+    def list_sources(self, source_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List document sources with per-source chunk counts.
+
+        Served from the source aggregate table, so the cost depends on the
+        number of sources, not chunks.
+
+        Args:
+            source_type: Optional filter by document type
+
+        Returns:
+            List of dicts with path, type, doc_type, chunk_count and last_updated
+        """
+        sources = []
+        with self._lock:
+            for source, by_type in self._source_table().items():
+                if source_type:
+                    if source_type not in by_type:
+                        continue
+                    doc_type, stats = source_type, by_type[source_type]
+                    chunk_count = stats["chunk_count"]
+                else:
+                    doc_type, stats = next(iter(by_type.items()))
+                    chunk_count = sum(entry["chunk_count"] for entry in by_type.values())
+
+                sources.append({
+                    "path": source,
+                    "type": doc_type,
+                    "doc_type": doc_type,
+                    "chunk_count": chunk_count,
+                    "last_updated": stats["last_updated"]
+                })
+        return sources
+
+    def _index_chunks(self, chunks: List[DocumentChunk], start: int) -> None:
+        """
+        Add new chunks to the lookup indexes.
+
+        Args:
+            chunks: Newly added chunks, in insertion order
+            start: Row position of the first new chunk
+        """
+        self._metadata_index.add([chunk.metadata for chunk in chunks])
+        if self._source_stats is not None:
+            for chunk in chunks:
+                self._count_source(chunk.metadata, chunk.created_at, 1)
+        self._index_ids([chunk.chunk_id for chunk in chunks], [chunk.document_id for chunk in chunks], start)
+
+    def _index_ids(self, chunk_ids: List[str], document_ids: List[str], start: int) -> None:
+        """
+        Add new rows to the chunk and document ID indexes.
+
+        Args:
+            chunk_ids: Chunk ID per new row
+            document_ids: Document ID per new row
+            start: Row position of the first new row
+        """
+        rows_by_document: Dict[str, List[int]] = {}
+        for offset, (chunk_id, document_id) in enumerate(zip(chunk_ids, document_ids)):
+            self._chunk_documents[chunk_id] = document_id
+            rows_by_document.setdefault(document_id, []).append(start + offset)
+
+        for document_id, rows in rows_by_document.items():
+            new_rows = np.asarray(rows, dtype=np.int64)
+            existing = self._document_rows.get(document_id)
+            self._document_rows[document_id] = (
+                new_rows if existing is None else np.concatenate([existing, new_rows])
+            )
+
+    def _rebuild_lookup(self) -> None:
+        """Rebuild the lookup indexes from self.chunks (used after load)."""
+        self._chunk_documents = {}
+        self._document_rows = {}
+        self._source_stats = {}
+        self._metadata_index.reset()
+        self._index_chunks(self.chunks, start=0)
+
+    def _source_table(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        The source aggregate table, built from the row records if a lazy
+        load left it unbuilt. Must be called with self._lock held.
+        """
+        if self._source_stats is None:
+            self._source_stats = {}
+            for row in range(len(self.chunks)):
+                record = self.chunks.record(row)
+                self._count_source(record["metadata"], record["created_at"], 1)
+        return self._source_stats
+
+    def _count_source(self, metadata: Dict[str, Any], created_at: str, delta: int) -> None:
+        """
+        Update the source aggregate table for an added (+1) or removed (-1) chunk.
+
+        Args:
+            metadata: Chunk metadata
+            created_at: Chunk creation timestamp
+            delta: +1 or -1
+        """
+        source = metadata.get("source", "unknown")
+        doc_type = metadata.get("type", "unknown")
+        by_type = self._source_stats.setdefault(source, {})
+        stats = by_type.setdefault(doc_type, {"chunk_count": 0, "last_updated": created_at})
+        stats["chunk_count"] += delta
+
+        if stats["chunk_count"] <= 0:
+            del by_type[doc_type]
+            if not by_type:
+                del self._source_stats[source]
+
     def delete_document(self, document_id: str) -> int:
         """
         Delete all chunks for a document.
 
+        The delete is persisted as a tombstone; chunk data is dropped from
+        disk at the next compaction.
+
         Args:
             document_id: ID of the document
 
         Returns:
             Number of chunks deleted
         """
-        before_count = len(self.chunks)
-        self.chunks = [c for c in self.chunks if c.document_id != document_id]
-        self.document_ids.discard(document_id)
-        self.save()
-        return before_count - len(self.chunks)
+        with self._lock:
+            rows = self._document_rows.pop(document_id, None)
+            deleted = 0 if rows is None else int(rows.size)
+
+            if deleted:
+                before_count = len(self.chunks)
+                for row in rows:
+                    chunk = self.chunks[int(row)]
+                    self._chunk_documents.pop(chunk.chunk_id, None)
+                    if self._source_stats is not None:
+                        self._count_source(chunk.metadata, chunk.created_at, -1)
+
+                # New row containers rather than in-place deletes, so
+                # concurrent searches keep reading the rows they started with
+                keep = np.ones(before_count, dtype=bool)
+                keep[rows] = False
+                self.chunks = self.chunks.kept(keep)
+                self._vectors = self._vectors[:before_count][keep]
+                self._vector_mask = self._vector_mask[:before_count][keep]
+                if self._quantized:
+                    self._scales = self._scales[:before_count][keep]
+                    self._mapped.keep(keep)
+                self._metadata_index.keep(keep)
+                if self._ann is not None:
+                    self._ann.keep(keep)
+
+                # Shift positions of rows that followed the deleted ones
+                for other_id, other_rows in self._document_rows.items():
+                    if other_rows[-1] > rows[0]:
+                        self._document_rows[other_id] = other_rows - np.searchsorted(rows, other_rows)
+                self._mutations += 1
+
+            if deleted or document_id in self.document_ids:
+                self._append_tombstone(document_id, deleted)
+            self.document_ids.discard(document_id)
+
+        self._maybe_compact()
+        return deleted
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -503,37 +1242,437 @@ class SemanticStore:
 
         # Count by type
         type_counts = {}
-        for chunk in self.chunks:
-            doc_type = chunk.metadata.get("type", "unknown")
-            type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
+        with self._lock:
+            source_table = self._source_table()
+        for by_type in source_table.values():
+            for doc_type, stats in by_type.items():
+                type_counts[doc_type] = type_counts.get(doc_type, 0) + stats["chunk_count"]
 
         return {
             "total_chunks": len(self.chunks),
             "total_documents": len(self.document_ids),
             "by_type": type_counts,
+            "ann_index": self._ann.params() if self._ann is not None and self._ann.is_trained else "flat",
+            "storage_mode": self.storage_mode,
             "index_path": self.index_path
         }
 
     def save(self) -> None:
         """
         Persist semantic store to disk.
+
+        Writes the full in-memory state as a new base segment (a synchronous
+        compaction). add_document() and delete_document() persist on their
+        own, so calling this is only needed to force a compaction.
         """
-        # Save chunks with embeddings
-        chunks_file = os.path.join(self.index_path, "chunks.json")
-        with open(chunks_file, 'w') as f:
-            chunks_data = [chunk.to_dict() for chunk in self.chunks]
-            json.dump(chunks_data, f, indent=2)
+        self.compact()
 
-        # Save metadata separately
-        metadata_file = os.path.join(self.index_path, "metadata", "documents.json")
-        documents_metadata = {}
-        for chunk in self.chunks:
-            doc_id = chunk.document_id
-            if doc_id not in documents_metadata:
-                documents_metadata[doc_id] = {
-                    k: v for k, v in chunk.metadata.items()
-                    if k not in ["document_id", "chunk_index", "total_chunks"]
+    def compact(self) -> None:
+        """
+        Merge the base segment, appended segments and tombstones into a new base.
+
+        Segments and tombstones appended while the new base is being written
+        are kept in the manifest, so writers are only blocked while the
+        in-memory state is snapshotted and while the manifest is swapped.
+
+        With an IVF index configured, the index is (re)trained here once
+        enough rows exist, and its centroids and assignments are stored in
+        the new base segment.
+        """
+        with self._compaction_lock:
+            with self._lock:
+                count = len(self.chunks)
+                chunks = self.chunks.snapshot()
+                if self._quantized:
+                    # Float vectors are read from their segments outside the lock
+                    mapped = self._mapped.snapshot()
+                    vectors = None
+                else:
+                    vectors = (
+                        np.array(self._vectors[:count], dtype=np.float32)
+                        if self._dim is not None else np.zeros((count, 0), dtype=np.float32)
+                    )
+                mask = np.array(self._vector_mask[:count], dtype=bool)
+                ann = self._ann
+                assignments = np.array(ann.assignments) if ann is not None else None
+                mutations = self._mutations
+                base_seq = self._manifest["next_seq"]
+                self._manifest["next_seq"] = base_seq + 1
+
+            if vectors is None:
+                vectors = mapped.gather() if self._dim is not None else np.zeros((count, 0), dtype=np.float32)
+
+            # Train outside the lock; the new index is swapped in below
+            trained = self._train_ann(vectors, mask) if ann is not None else None
+            if trained is not None:
+                ann, assignments = trained
+
+            base_name = f"base-{base_seq:08d}"
+            base_dir = segment_path(self.index_path, base_name)
+            extra: Dict[str, Any] = {"seq": base_seq}
+            if ann is not None and ann.is_trained:
+                extra["ann"] = ann.params()
+
+            # First metadata seen per document, for metadata/documents.json
+            documents: Dict[str, Dict[str, Any]] = {}
+
+            def records():
+                # Undecoded rows are copied from their segment without building chunks
+                for row in range(count):
+                    record = chunks.record(row)
+                    documents.setdefault(record["document_id"], record["metadata"])
+                    yield record
+
+            write_segment(base_dir, records(), vectors, mask, extra=extra)
+            if "ann" in extra:
+                save_array(base_dir, CENTROIDS_FILE, ann.centroids)
+                save_array(base_dir, ASSIGNMENTS_FILE, assignments)
+
+            with self._lock:
+                if trained is not None:
+                    if self._mutations == mutations:
+                        ann.reset(assignments)
+                    else:
+                        # Rows changed while training; assign the current rows
+                        n = len(self.chunks)
+                        ann.reset(ann.assign(self._dense_rows(0, n), self._vector_mask[:n]))
+                    self._ann = ann
+
+                if self._quantized and self._mutations == mutations:
+                    # Map float vectors to the new base instead of the replaced segments
+                    self._mapped.reset()
+                    if self._dim is not None:
+                        block_id = self._mapped.add_block(load_array(base_dir, EMBEDDINGS_FILE))
+                        self._mapped.append(block_id, np.arange(count))
+
+                if self.lazy_load and self._mutations == mutations:
+                    # Decode undecoded rows from the new base instead of the replaced segments
+                    self.chunks.rebase(ChunkRowStore(base_dir), count)
+
+                replaced = [self._manifest["base"]] if self._manifest.get("base") else []
+                replaced += [name for name in self._manifest["segments"] if _segment_seq(name) < base_seq]
+                self._manifest = {
+                    **self._manifest,
+                    "base": base_name,
+                    "segments": [name for name in self._manifest["segments"] if _segment_seq(name) > base_seq],
+                    "tombstones": [t for t in self._manifest["tombstones"] if t["seq"] > base_seq]
                 }
+                self._base_rows = count
+                self._segment_rows = {name: self._segment_rows.get(name, 0) for name in self._manifest["segments"]}
+                write_manifest(self.index_path, self._manifest)
+
+            for name in replaced:
+                remove_segment(segment_path(self.index_path, name))
+
+            self._write_documents_metadata(documents)
+            logger.info(f"Compacted semantic index: {count} chunks, {len(replaced)} segment(s) merged")
+
+    def _train_ann(self, vectors: np.ndarray, mask: np.ndarray) -> Optional[Tuple[IVFIndex, np.ndarray]]:
+        """
+        Train a fresh IVF index on a snapshot, if the index is due for training.
+
+        The index is trained once the snapshot holds min_train_size embedded
+        rows, and retrained whenever it has doubled since the last training.
+
+        Args:
+            vectors: Snapshot of the embedding matrix
+            mask: Snapshot of the embedding validity mask
+
+        Returns:
+            (new index, list id per snapshot row), or None if no training was needed
+        """
+        current = self._ann
+        embedded = int(mask.sum())
+        if embedded < current.min_train_size:
+            return None
+        if current.is_trained and embedded < 2 * current.trained_size:
+            return None
+
+        ann = IVFIndex(
+            n_lists=current.n_lists,
+            nprobe=current.nprobe,
+            min_train_size=current.min_train_size,
+            max_iter=current.max_iter,
+            seed=current.seed
+        )
+        assignments = np.full(mask.shape[0], -1, dtype=np.int32)
+        assignments[mask] = ann.train(vectors[mask])
+        return ann, assignments
+
+    def _append_segment(self, chunks: List[DocumentChunk], vectors: np.ndarray, block_id: Optional[int]) -> None:
+        """
+        Persist newly added chunks as an immutable segment.
+
+        Must be called with self._lock held, after the chunks were appended
+        to self.chunks and the embedding matrix.
+
+        Args:
+            chunks: Newly added chunks
+            vectors: Their normalized float32 embeddings (from _append_vectors)
+            block_id: MappedRows block holding vectors (int8 storage only)
+        """
+        if not chunks:
+            return
+
+        end = len(self.chunks)
+        start = end - len(chunks)
+        seq = self._manifest["next_seq"]
+        name = f"seg-{seq:08d}"
+        directory = segment_path(self.index_path, name)
+
+        write_segment(
+            directory,
+            (self._chunk_record(chunk) for chunk in chunks),
+            vectors,
+            self._vector_mask[start:end],
+            extra={"seq": seq}
+        )
+
+        if block_id is not None and self._dim is not None:
+            # Release the in-memory floats; re-ranking reads the segment file
+            mapped = load_array(directory, EMBEDDINGS_FILE)
+            self._mapped.replace_block(block_id, mapped)
+            for offset, chunk in enumerate(chunks):
+                if self._vector_mask[start + offset]:
+                    chunk.embedding = mapped[offset]
+
+        self._manifest["segments"].append(name)
+        self._manifest["next_seq"] = seq + 1
+        self._segment_rows[name] = len(chunks)
+        write_manifest(self.index_path, self._manifest)
+
+    def _append_tombstone(self, document_id: str, rows: int) -> None:
+        """
+        Record a document delete in the manifest.
+
+        Must be called with self._lock held.
+
+        Args:
+            document_id: ID of the deleted document
+            rows: Number of rows the delete hid
+        """
+        seq = self._manifest["next_seq"]
+        self._manifest["tombstones"].append({"document_id": document_id, "seq": seq, "rows": rows})
+        self._manifest["next_seq"] = seq + 1
+        write_manifest(self.index_path, self._manifest)
+
+    def _maybe_compact(self, force: bool = False) -> None:
+        """
+        Start a compaction once enough segments and tombstones have accumulated.
+
+        The base segment is rewritten only when the pending rows (appended
+        segments plus tombstoned rows) reach BASE_REWRITE_RATIO of it;
+        otherwise adjacent segments of similar size are merged (see
+        _merge_plan()), so every row is rewritten O(log n) times over a
+        bulk ingest instead of once per compaction.
+
+        Args:
+            force: Rewrite the base regardless of the number of pending changes
+        """
+        with self._lock:
+            segments = self._manifest["segments"]
+            tombstones = self._manifest["tombstones"]
+            if len(segments) + len(tombstones) < self.compaction_threshold and not force:
+                return
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+
+            sizes = [self._segment_rows.get(name, 0) for name in segments]
+            pending_rows = sum(sizes) + sum(t.get("rows", 1) for t in tombstones)
+            if force or pending_rows >= BASE_REWRITE_RATIO * self._base_rows:
+                task = self.compact
+            else:
+                groups = [segments[start:end] for start, end in _merge_plan(sizes)]
+                if not groups:
+                    return
+                task = partial(self._merge_segments, groups)
+
+            if not self.background_compaction:
+                run_inline = True
+            else:
+                run_inline = False
+                self._compaction_thread = threading.Thread(
+                    target=self._compact_in_background,
+                    args=(task,),
+                    name="semantic-store-compaction",
+                    daemon=True
+                )
+                self._compaction_thread.start()
+
+        if run_inline:
+            task()
+
+    def _compact_in_background(self, task: Callable[[], None]) -> None:
+        """Thread target for background compaction."""
+        try:
+            task()
+        except Exception as e:
+            logger.warning(f"Background compaction of semantic index failed: {e}")
+
+    def _merge_segments(self, groups: List[List[str]]) -> None:
+        """
+        Merge runs of adjacent appended segments, leaving the base untouched.
+
+        Each run is rewritten as one segment with a new seq, without the
+        rows hidden by tombstones logged so far (a later seq would otherwise
+        let them reappear on load). Writers are only blocked while the
+        manifest is swapped.
+
+        Args:
+            groups: Runs of adjacent segment names, oldest first
+        """
+        with self._compaction_lock:
+            with self._lock:
+                segments = self._manifest["segments"]
+                if any(name not in segments for group in groups for name in group):
+                    # A compaction replaced them in the meantime
+                    return
+                deleted_at = _tombstone_seqs(self._manifest["tombstones"])
+                seqs = list(range(self._manifest["next_seq"], self._manifest["next_seq"] + len(groups)))
+                self._manifest["next_seq"] += len(groups)
+
+            merged = [self._write_merged_segment(group, seq, deleted_at) for group, seq in zip(groups, seqs)]
+
+            with self._lock:
+                segments = self._manifest["segments"]
+                for group, (name, rows) in zip(groups, merged):
+                    # Only appends happen meanwhile, so each run is still adjacent
+                    start = segments.index(group[0])
+                    segments[start:start + len(group)] = [name]
+                    for replaced in group:
+                        self._segment_rows.pop(replaced, None)
+                    self._segment_rows[name] = rows
+                write_manifest(self.index_path, self._manifest)
+
+        # Lazily decoded rows and int8 float vectors may still map the
+        # replaced files; the mappings stay valid after the unlink
+        for group in groups:
+            for name in group:
+                remove_segment(segment_path(self.index_path, name))
+        logger.info(f"Merged {sum(len(group) for group in groups)} semantic index segment(s) into {len(groups)}")
+
+    def _write_merged_segment(self, group: List[str], seq: int, deleted_at: Dict[str, int]) -> Tuple[str, int]:
+        """
+        Write the live rows of adjacent segments as one new segment.
+
+        Args:
+            group: Segment names, oldest first
+            seq: Seq of the new segment
+            deleted_at: Latest tombstone seq per document (see _tombstone_seqs())
+
+        Returns:
+            (name of the new segment, its row count)
+        """
+        opened = []
+        try:
+            for name in group:
+                segment = open_segment(segment_path(self.index_path, name))
+                if segment is None:
+                    raise ValueError(f"Missing semantic index segment: {name}")
+                opened.append(segment)
+
+            lives = []
+            for segment in opened:
+                document_ids = segment.ids[:, 1].tolist() if segment.ids is not None else [
+                    record["document_id"] for record in segment.rows
+                ]
+                lives.append(np.asarray([
+                    i for i, document_id in enumerate(document_ids)
+                    if deleted_at.get(document_id, -1) < segment.seq
+                ], dtype=np.int64))
+
+            dim = max((segment.vectors.shape[1] for segment in opened if segment.vectors.ndim == 2), default=0)
+            vectors = np.concatenate([
+                segment.vectors[live] if segment.vectors.ndim == 2 and segment.vectors.shape[1] == dim
+                else np.zeros((live.shape[0], dim), dtype=np.float32)
+                for segment, live in zip(opened, lives)
+            ])
+            mask = np.concatenate([np.asarray(segment.mask[live], dtype=bool) for segment, live in zip(opened, lives)])
+
+            def records():
+                for segment, live in zip(opened, lives):
+                    for i in live:
+                        yield segment.rows.get(int(i))
+
+            name = f"seg-{seq:08d}"
+            write_segment(segment_path(self.index_path, name), records(), vectors, mask, extra={"seq": seq})
+            return name, int(mask.shape[0])
+        finally:
+            for segment in opened:
+                segment.rows.close()
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until a running background compaction finishes.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def warm_up(self) -> None:
+        """
+        Prepare a lazily loaded store for its first requests.
+
+        Pages in the embedding matrix (memory-mapped after load) and builds
+        the source aggregate table, so neither cost lands on a request.
+        Chunk text is still decoded only for rows that are read.
+        """
+        with self._lock:
+            n = len(self.chunks)
+            vectors = self._vectors
+        # Touch every page of the matrix, a block of rows at a time
+        for start in range(0, n, 65536):
+            np.asarray(vectors[start:start + 65536]).sum()
+
+        with self._lock:
+            self._source_table()
+        logger.info(f"Semantic index warmed up: {n} chunks")
+
+    def start_warm_up(self) -> None:
+        """Run warm_up() in a background thread."""
+        self._warm_up_thread = threading.Thread(
+            target=self._warm_up_in_background,
+            name="semantic-store-warm-up",
+            daemon=True
+        )
+        self._warm_up_thread.start()
+
+    def _warm_up_in_background(self) -> None:
+        """Thread target for background warm-up."""
+        try:
+            self.warm_up()
+        except Exception as e:
+            logger.warning(f"Semantic index warm-up failed: {e}")
+
+    def wait_for_warm_up(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until a running background warm-up finishes.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        thread = self._warm_up_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _write_documents_metadata(self, documents: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write per-document metadata to metadata/documents.json.
+
+        Args:
+            documents: document_id -> metadata of one of its chunks
+        """
+        metadata_file = os.path.join(self.index_path, "metadata", "documents.json")
+        documents_metadata = {
+            doc_id: {
+                k: v for k, v in metadata.items()
+                if k not in ["document_id", "chunk_index", "total_chunks"]
+            }
+            for doc_id, metadata in documents.items()
+        }
 
         with open(metadata_file, 'w') as f:
             json.dump(documents_metadata, f, indent=2)
@@ -541,62 +1680,525 @@ class SemanticStore:
     def load(self) -> None:
         """
         Load semantic store from disk.
+
+        Replays the base segment and appended segments, hiding rows covered
+        by tombstones, without rewriting anything. Embeddings are
+        memory-mapped when the index is fully compacted. Legacy chunks.json
+        indexes are migrated to the segment format on first load.
         """
         chunks_file = os.path.join(self.index_path, "chunks.json")
-        metadata_file = os.path.join(self.index_path, "metadata", "documents.json")
 
-        # Load chunks
-        if os.path.exists(chunks_file):
-            try:
-                with open(chunks_file, 'r') as f:
-                    chunks_data = json.load(f)
-                    self.chunks = [DocumentChunk(**data) for data in chunks_data]
-            except Exception as e:
-                logger.warning(f"Failed to load chunks: {e}")
-
-        # Load document IDs
-        if os.path.exists(metadata_file):
-            try:
-                with open(metadata_file, 'r') as f:
-                    doc_metadata = json.load(f)
-                    self.document_ids = set(doc_metadata.keys())
-            except Exception as e:
-                logger.warning(f"Failed to load metadata: {e}")
+        try:
+            manifest = read_manifest(self.index_path)
+        except Exception as e:
+            logger.warning(f"Failed to read semantic index manifest: {e}")
+            return
+
+        if manifest is None:
+            if os.path.exists(chunks_file):
+                self._migrate_legacy_chunks(chunks_file)
+            return
+
+        version = manifest.get("format_version")
+        try:
+            if version == INDEX_FORMAT_VERSION:
+                self._manifest = manifest
+                remove_unreferenced_segments(self.index_path, manifest)
+                names = ([manifest["base"]] if manifest.get("base") else []) + manifest["segments"]
+                self._load_segments(
+                    [segment_path(self.index_path, name) for name in names],
+                    manifest["tombstones"]
+                )
+            elif version == SEGMENT_FORMAT_VERSION:
+                # Single-file-set layout written before the segment log existed
+                self._load_segments([self.index_path], [])
+                self._manifest = new_log_manifest()
+                self.compact()
+                remove_root_segment_files(self.index_path)
+            else:
+                logger.warning(f"Unsupported semantic index format version: {version}")
+        except Exception as e:
+            logger.warning(f"Failed to load semantic index: {e}")
+
+    def _load_segments(self, directories: List[str], tombstones: List[Dict[str, Any]]) -> None:
+        """
+        Populate the store from segments, in log order.
+
+        A fully compacted index (one segment, no tombstones) keeps its
+        embedding matrix memory-mapped; otherwise live rows are concatenated
+        into memory until the next compaction. With int8 storage the matrix
+        is quantized and the segment files stay mapped for re-ranking.
+
+        With lazy_load only the ID index of each segment is read; chunk
+        records stay in the mapped row stores until a row is accessed.
+
+        Args:
+            directories: Segment directories, oldest first
+            tombstones: Tombstones from the log manifest
+        """
+        deleted_at = _tombstone_seqs(tombstones)
+        # Row counts (including rows hidden by tombstones), for choosing merges
+        base_rows = 0
+        segment_rows: Dict[str, int] = {}
+
+        records: List[Dict[str, Any]] = []
+        # Lazy load: (row store, live positions) per segment and [chunk_id, document_id] per live row
+        refs: List[Tuple[ChunkRowStore, List[int]]] = []
+        live_ids: List[List[str]] = []
+        # (mapped vectors, mapped mask, live row positions or None for all rows)
+        blocks: List[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]] = []
+        dim = 0
+        # Persisted ANN assignments of the (first) base segment's live rows
+        base_assignments: Optional[np.ndarray] = None
+        base_ann: Dict[str, Any] = {}
+        centroids: Optional[np.ndarray] = None
+
+        for directory in directories:
+            segment = open_segment(directory)
+            if segment is None:
+                raise ValueError(f"Missing semantic index segment: {directory}")
+            name = os.path.basename(directory)
+            if name.startswith("base-"):
+                base_rows = len(segment)
+            else:
+                segment_rows[name] = len(segment)
+            if self.lazy_load:
+                # Segments written before the ID index existed are decoded once
+                ids = segment.ids.tolist() if segment.ids is not None else [
+                    [record["chunk_id"], record["document_id"]] for record in segment.rows
+                ]
+                document_ids = [document_id for _, document_id in ids]
+            else:
+                try:
+                    rows = list(segment.rows)
+                finally:
+                    segment.rows.close()
+                document_ids = [record["document_id"] for record in rows]
+
+            live = [
+                i for i, document_id in enumerate(document_ids)
+                if deleted_at.get(document_id, -1) < segment.seq
+            ]
+            if not blocks and self._ann is not None and "ann" in segment.manifest:
+                base_ann = segment.manifest["ann"]
+                centroids = load_array(directory, CENTROIDS_FILE)
+                persisted = load_array(directory, ASSIGNMENTS_FILE)
+                if persisted is not None and persisted.shape[0] == len(document_ids):
+                    base_assignments = np.asarray(persisted, dtype=np.int32)[live]
+            if len(live) == len(document_ids):
+                blocks.append((segment.vectors, segment.mask, None))
+            else:
+                blocks.append((segment.vectors, segment.mask, np.asarray(live, dtype=np.int64)))
+            if self.lazy_load:
+                refs.append((segment.rows, live))
+                live_ids.extend(ids[i] for i in live)
+            else:
+                records.extend(rows[i] for i in live)
+            dim = max(dim, segment.vectors.shape[1] if segment.vectors.ndim == 2 else 0)
+
+        self._dim = dim or None
+        if self._quantized:
+            embeddings = self._load_quantized(blocks, dim)
+        else:
+            embeddings = self._load_dense(blocks, dim)
+
+        self.chunks = _ChunkList(self._materialize_chunk, self._lock)
+        if self.lazy_load:
+            for rows, live in refs:
+                self.chunks.extend_refs(rows, live)
+            self.document_ids = {document_id for _, document_id in live_ids}
+            self._chunk_documents = {}
+            self._document_rows = {}
+            # Built on first use (list_sources, get_stats, warm-up)
+            self._source_stats = None
+            self._metadata_index.reset(len(live_ids))
+            self._index_ids([chunk_id for chunk_id, _ in live_ids], [document_id for _, document_id in live_ids], 0)
+        else:
+            mask = self._vector_mask
+            self.chunks.extend([
+                DocumentChunk(**record, embedding=embeddings[i] if mask[i] else None)
+                for i, record in enumerate(records)
+            ])
+            self.document_ids = {chunk.document_id for chunk in self.chunks}
+            self._rebuild_lookup()
+
+        self._base_rows = base_rows
+        self._segment_rows = segment_rows
+        if self._ann is not None:
+            self._restore_ann(base_ann, centroids, base_assignments)
+
+    def _load_dense(self, blocks: List[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]], dim: int) -> np.ndarray:
+        """
+        Build the float32 matrix from loaded segment blocks.
+
+        Args:
+            blocks: (vectors, mask, live rows or None) per segment
+            dim: Embedding dimension
+
+        Returns:
+            The matrix (memory-mapped when there is a single untouched segment)
+        """
+        vector_blocks = [vectors if live is None else vectors[live] for vectors, _, live in blocks]
+        mask_blocks = [mask if live is None else mask[live] for _, mask, live in blocks]
+
+        if len(vector_blocks) == 1:
+            vectors, mask = vector_blocks[0], mask_blocks[0]
+        elif vector_blocks:
+            vectors = np.concatenate([
+                block if block.shape[1] == dim else np.zeros((block.shape[0], dim), dtype=np.float32)
+                for block in vector_blocks
+            ])
+            mask = np.concatenate(mask_blocks)
+        else:
+            vectors, mask = np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=bool)
+
+        self._vectors = vectors
+        self._vector_mask = mask
+        return vectors
+
+    def _load_quantized(self, blocks: List[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]], dim: int) -> List[np.ndarray]:
+        """
+        Build the int8 matrix from loaded segment blocks.
+
+        Float vectors stay in the memory-mapped segment files and are
+        registered with self._mapped for re-ranking and compaction.
+
+        Args:
+            blocks: (vectors, mask, live rows or None) per segment
+            dim: Embedding dimension
+
+        Returns:
+            Row views into the mapped float vectors, one per loaded row
+        """
+        self._mapped.reset()
+        code_blocks, scale_blocks, mask_blocks = [], [], []
+        embeddings: List[np.ndarray] = []
+        for vectors, mask, live in blocks:
+            positions = np.arange(vectors.shape[0]) if live is None else live
+            block_id = self._mapped.add_block(vectors)
+            self._mapped.append(block_id, positions)
+
+            if vectors.ndim == 2 and vectors.shape[1] == dim:
+                codes, scales = quantize_int8(vectors if live is None else vectors[live])
+                embeddings.extend(vectors[position] for position in positions)
+            else:
+                codes = np.zeros((positions.shape[0], dim), dtype=np.int8)
+                scales = np.ones(positions.shape[0], dtype=np.float32)
+                embeddings.extend(None for _ in positions)
+            code_blocks.append(codes)
+            scale_blocks.append(scales)
+            mask_blocks.append(mask if live is None else mask[live])
+
+        if code_blocks:
+            self._vectors = np.concatenate(code_blocks)
+            self._scales = np.concatenate(scale_blocks)
+            self._vector_mask = np.concatenate(mask_blocks).astype(bool)
+        else:
+            self._vectors = np.zeros((0, 0), dtype=np.int8)
+            self._scales = np.zeros(0, dtype=np.float32)
+            self._vector_mask = np.zeros(0, dtype=bool)
+        return embeddings
+
+    def _restore_ann(
+        self,
+        params: Dict[str, Any],
+        centroids: Optional[np.ndarray],
+        base_assignments: Optional[np.ndarray]
+    ) -> None:
+        """
+        Rebuild the IVF index state after load.
+
+        Persisted assignments are reused for base rows; rows from appended
+        segments are assigned to the persisted centroids. Without usable
+        persisted data the index stays untrained (flat search) until the
+        next compaction trains it.
+
+        Args:
+            params: "ann" entry of the base segment manifest
+            centroids: Persisted centroids, if any
+            base_assignments: Persisted list ids of the live base rows, if any
+        """
+        n = len(self.chunks)
+        usable = (
+            centroids is not None
+            and params.get("type") == "ivf"
+            and params.get("n_lists") == self._ann.n_lists
+            and centroids.ndim == 2
+            and centroids.shape[1] == (self._dim or 0)
+        )
+        if not usable:
+            self._ann.centroids = None
+            self._ann.reset(np.full(n, -1, dtype=np.int32))
+            if int(self._vector_mask[:n].sum()) >= self._ann.min_train_size:
+                self._maybe_compact(force=True)
+            return
+
+        self._ann.centroids = np.array(centroids, dtype=np.float32)
+        self._ann.trained_size = int(params.get("trained_size", 0))
+        known = base_assignments.shape[0] if base_assignments is not None else 0
+        tail = self._ann.assign(self._dense_rows(known, n), self._vector_mask[known:n])
+        self._ann.reset(np.concatenate([base_assignments, tail]) if known else tail)
+
+    def _migrate_legacy_chunks(self, chunks_file: str) -> None:
+        """
+        Load a legacy chunks.json index and rewrite it in the segment format.
+
+        The original file is kept as chunks.json.bak.
+
+        Args:
+            chunks_file: Path to chunks.json
+        """
+        try:
+            with open(chunks_file, 'r') as f:
+                chunks_data = json.load(f)
+                self.chunks.extend([DocumentChunk(**data) for data in chunks_data])
+        except Exception as e:
+            logger.warning(f"Failed to load chunks: {e}")
+            return
+
+        self._rebuild_vectors()
+        self.document_ids = {chunk.document_id for chunk in self.chunks}
+        self._rebuild_lookup()
+
+        try:
+            self.compact()
+            os.replace(chunks_file, chunks_file + ".bak")
+            logger.info(f"Migrated {len(self.chunks)} chunks from {chunks_file} to binary index format")
+        except Exception as e:
+            logger.warning(f"Failed to migrate legacy chunks.json: {e}")
+
+    @staticmethod
+    def _chunk_record(chunk: DocumentChunk) -> Dict[str, Any]:
+        """Row-store record for a chunk (embedding is stored separately)."""
+        return {
+            "chunk_id": chunk.chunk_id,
+            "document_id": chunk.document_id,
+            "content": chunk.content,
+            "metadata": chunk.metadata,
+            "chunk_index": chunk.chunk_index,
+            "created_at": chunk.created_at
+        }
 
 
 # Singleton instance
 _semantic_store: Optional[SemanticStore] = None
 
 
-def get_semantic_store(index_path: str = "./data/semantic_index") -> SemanticStore:
+def get_semantic_store(
+    index_path: str = "./data/semantic_index",
+    ann_config: Optional[Dict[str, Any]] = None,
+    storage_mode: str = "float32",
+    rerank_factor: int = 4,
+    lazy_load: bool = False,
+    warm_up: bool = False
+) -> SemanticStore:
     """
     Get or create the semantic store singleton.
 
     Args:
         index_path: Path to vector index
+        ann_config: Optional ANN index configuration (see SemanticStore)
+        storage_mode: Embedding storage mode ("float32" or "int8")
+        rerank_factor: Float re-ranking pool size multiplier for int8 storage
+        lazy_load: Decode chunk text and metadata on first access (see SemanticStore)
+        warm_up: Warm up a lazily loaded store in the background
 
     Returns:
         SemanticStore instance
     """
     global _semantic_store
     if _semantic_store is None:
-        _semantic_store = SemanticStore(index_path)
+        _semantic_store = SemanticStore(
+            index_path,
+            ann_config=ann_config,
+            storage_mode=storage_mode,
+            rerank_factor=rerank_factor,
+            lazy_load=lazy_load,
+            warm_up=warm_up
+        )
     return _semantic_store
 
 
-def _generate_embedding(content: str) -> List[float]:
+def _generate_embedding(content: str, embedding_service=None) -> List[float]:
     """
     Generate embedding for content.
 
     Args:
         content: Text to generate embedding for
+        embedding_service: Embedding service (default: get_embedding_service())
 
     Returns:
         List of embedding values (empty list if service unavailable)
     """
     try:
-        embedding_service = get_embedding_service()
+        embedding_service = embedding_service or get_embedding_service()
         return embedding_service.embed_single(content)
     except Exception as e:
         logger.warning(f"Failed to generate embedding: {e}")
         return []
+
+
+def _generate_embeddings(texts: List[str], embedding_service=None) -> List[List[float]]:
+    """
+    Generate embeddings for many texts, in batches.
+
+    Texts are grouped into batches that fit the embedding model's context
+    (embedding_n_ctx tokens, at most embedding_batch_size texts, times the
+    number of embedding worker processes or parallel shards so each gets a
+    full batch). A failed batch is retried once, then its texts are embedded
+    one at a time.
+
+    Args:
+        texts: Texts to generate embeddings for
+        embedding_service: Embedding service (default: get_embedding_service())
+
+    Returns:
+        One embedding per text, in order (empty list where embedding failed)
+    """
+    if not texts:
+        return []
+
+    try:
+        embedding_service = embedding_service or get_embedding_service()
+    except Exception as e:
+        logger.warning(f"Failed to generate embeddings: {e}")
+        return [[] for _ in texts]
+
+    workers = max(
+        int(getattr(embedding_service, "num_workers", 0)),
+        int(getattr(embedding_service, "max_concurrency", 0)),
+        1
+    )
+    token_budget = max(int(getattr(embedding_service, "n_ctx", 2048)), 1) * workers
+    max_batch_size = max(int(getattr(embedding_service, "batch_size", 32)), 1) * workers
+
+    embeddings: List[List[float]] = []
+    for batch in _token_batches(texts, token_budget, max_batch_size):
+        embeddings.extend(_embed_batch(embedding_service, batch))
+    return embeddings
+
+
+def _embed_batch(embedding_service, batch: List[str], attempts: int = 2) -> List[List[float]]:
+    """
+    Embed one batch, retrying before falling back to per-text embedding.
+
+    Args:
+        embedding_service: Embedding service
+        batch: Texts of the batch
+        attempts: Number of batch attempts before falling back
+
+    Returns:
+        One embedding per text in the batch
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            embeddings = embedding_service.embed(batch)
+            if len(embeddings) != len(batch):
+                raise ValueError(f"expected {len(batch)} embeddings, got {len(embeddings)}")
+            return embeddings
+        except Exception as e:
+            logger.warning(f"Batch embedding of {len(batch)} chunks failed (attempt {attempt}/{attempts}): {e}")
+
+    return [_generate_embedding(text, embedding_service) for text in batch]
+
+
+def _token_batches(texts: List[str], token_budget: int, max_batch_size: int) -> List[List[str]]:
+    """
+    Split texts into consecutive batches within a token budget.
+
+    Token counts are estimated at ~4 characters per token; a text larger
+    than the budget gets a batch of its own.
+
+    Args:
+        texts: Texts to split
+        token_budget: Maximum estimated tokens per batch
+        max_batch_size: Maximum texts per batch
+
+    Returns:
+        List of batches, preserving text order
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = len(text) // 4 + 1
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _tombstone_seqs(tombstones: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Latest tombstone seq per document.
+
+    A row of a segment is hidden when its document's entry is higher than
+    the segment's seq.
+    """
+    deleted_at: Dict[str, int] = {}
+    for tombstone in tombstones:
+        doc_id = tombstone["document_id"]
+        deleted_at[doc_id] = max(deleted_at.get(doc_id, 0), tombstone["seq"])
+    return deleted_at
+
+
+def _merge_plan(sizes: List[int]) -> List[Tuple[int, int]]:
+    """
+    Choose runs of adjacent segments to merge, given their row counts.
+
+    Segments are replayed oldest first onto a stack of runs that is kept
+    shrinking geometrically towards the newest run (TimSort's invariants:
+    each run is larger than the next one, and than the next two combined),
+    merging neighbouring runs whenever that is violated. Runs therefore
+    only merge with runs of similar size, a row takes part in O(log n)
+    merges, and O(log n) segments remain.
+
+    Args:
+        sizes: Row count per segment, oldest first
+
+    Returns:
+        [start, end) ranges of segments to merge into one, oldest first
+    """
+    runs: List[List[int]] = []  # [start, end, rows]
+    for index, size in enumerate(sizes):
+        runs.append([index, index + 1, size])
+        while len(runs) > 1:
+            if len(runs) >= 3 and runs[-3][2] <= runs[-2][2] + runs[-1][2]:
+                at = len(runs) - 3 if runs[-3][2] < runs[-1][2] else len(runs) - 2
+            elif runs[-2][2] <= runs[-1][2]:
+                at = len(runs) - 2
+            else:
+                break
+            older, newer = runs[at], runs[at + 1]
+            runs[at:at + 2] = [[older[0], newer[1], older[2] + newer[2]]]
+    return [(start, end) for start, end, _ in runs if end - start > 1]
+
+
+def _segment_seq(name: str) -> int:
+    """Log sequence number encoded in a segment name (e.g. 'seg-00000012')."""
+    return int(name.rsplit("-", 1)[1])
+
+
+def _to_unit_vector(embedding: Optional[List[float]]) -> Optional[np.ndarray]:
+    """
+    Convert an embedding to a unit-length float32 vector.
+
+    Args:
+        embedding: Embedding values
+
+    Returns:
+        Normalized vector, or None if the embedding is empty or all zeros
+    """
+    if embedding is None or len(embedding) == 0:
+        return None
+
+    vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+
+    return vector / norm
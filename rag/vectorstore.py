@@ -4,20 +4,79 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple, Any
 
 from .logger import get_logger
+from .metadata_index import MetadataIndex
+from .quantization import STORAGE_MODES, MappedRows, int8_scores, quantize_int8, top_indices
 logger = get_logger(__name__)
 
+# Append journal written by save(append=True), next to the canonical files.
+# JOURNAL_VECTORS is a 16-byte header (magic, dim and the number of canonical
+# rows it extends, as little-endian uint32) followed by raw float32 rows;
+# JOURNAL_RECORDS holds one {"doc": ..., "meta": ...} JSON object per line.
+JOURNAL_VECTORS = 'vectors.append'
+JOURNAL_RECORDS = 'records.jsonl'
+JOURNAL_MAGIC = b'VSJRNL1\n'
+JOURNAL_HEADER_SIZE = 16
+
 
 class VectorStore:
     """
     CPU-based vector store with cosine similarity search.
     Persists to disk in data/rag_index/ directory.
+
+    Vectors are kept in a float32 (capacity, dim) matrix with spare rows
+    (the first _count are used) and a cached norm per row. With mmap=True,
+    load() maps vectors.npy instead of reading it; the mapping is copied
+    into memory the first time add() needs to grow it.
+
+    With storage_mode="int8", vectors are kept in memory as unit-length
+    int8 codes with one scale per vector (see rag.quantization) instead
+    of float rows. The float vectors stay in vectors.npy (memory-mapped)
+    and are only read to re-rank the best top_k * rerank_factor candidates.
+
+    save(append=True) only appends the rows added since the last save to a
+    journal; the journal is folded into vectors.npy/docs.json/meta.json once
+    it holds more rows than they do, so repeated saves cost linear I/O.
     """
 
-    def __init__(self, index_path: str = "./data/rag_index"):
+    def __init__(
+        self,
+        index_path: str = "./data/rag_index",
+        storage_mode: str = "float32",
+        rerank_factor: int = 4,
+        mmap: bool = False,
+        compaction_min_rows: int = 1024
+    ):
         self.index_path = index_path
         self.docs: List[str] = []
-        self.vectors: List[List[float]] = []
         self.metadata: List[Dict[str, Any]] = []
+        self.mmap = mmap
+        self.compaction_min_rows = compaction_min_rows
+
+        # Rows already on disk at index_path (None: unknown, the next save
+        # rewrites everything) and how many of them are in the journal
+        self._persisted: Optional[int] = None
+        self._journal_rows = 0
+
+        # Posting lists over self.metadata, for filtered search
+        self._metadata_index = MetadataIndex()
+
+        if storage_mode not in STORAGE_MODES:
+            logger.warning(f"Unknown storage_mode '{storage_mode}', using float32")
+            storage_mode = "float32"
+        self.storage_mode = storage_mode
+        self.rerank_factor = rerank_factor
+        self._quantized = storage_mode == "int8"
+
+        # float32 storage: matrix/norms with spare capacity (first _count rows used)
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+
+        # int8 storage: codes/scales with spare capacity (first _count rows
+        # used); _float_rows locates the float vectors of each row
+        self._codes = np.zeros((0, 0), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._count = 0
+        self._float_rows = MappedRows()
 
         # Ensure index directory exists
         os.makedirs(index_path, exist_ok=True)
@@ -25,38 +84,94 @@ class VectorStore:
         # Try to load existing index
         self.load(index_path)
 
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored float vectors as a (rows, dim) array (a view in float32 mode)."""
+        if self._quantized:
+            return self._float_rows.gather() if self._count else np.zeros((0, 0), dtype=np.float32)
+        return self._matrix[:self._count]
+
     def add(self, docs: List[str], vectors: List[List[float]], metadata: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Add documents with their embeddings and metadata to the store.
         """
         if len(docs) != len(vectors):
             raise ValueError(f"docs and vectors length mismatch: {len(docs)} vs {len(vectors)}")
+        if metadata is not None and len(metadata) != len(docs):
+            raise ValueError(f"metadata and docs length mismatch: {len(metadata)} vs {len(docs)}")
 
+        rows = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        if self._quantized:
+            self._append_codes(rows)
+        else:
+            self._append_rows(rows)
         self.docs.extend(docs)
-        self.vectors.extend(vectors)
 
         if metadata is not None:
-            if len(metadata) != len(docs):
-                raise ValueError(f"metadata and docs length mismatch: {len(metadata)} vs {len(docs)}")
             self.metadata.extend(metadata)
         else:
             self.metadata.extend([{} for _ in docs])
 
-    def _cosine(self, a: List[float], b: List[float]) -> float:
-        """
-        Compute cosine similarity between two vectors.
-        """
-        if not a or not b:
-            return 0.0
+        self._metadata_index.add(self.metadata[len(self.metadata) - len(docs):])
 
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
+    def _check_dimension(self, vectors: np.ndarray, dim: int) -> None:
+        """Reject vectors whose dimension differs from the stored ones."""
+        if self._count and vectors.shape[1] != dim:
+            raise ValueError(f"vector dimension mismatch: {vectors.shape[1]} vs {dim}")
 
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
+    def _append_rows(self, vectors: np.ndarray) -> None:
+        """
+        Append float vectors and their norms (float32 storage).
+
+        Args:
+            vectors: float32 (rows, dim) vectors
+        """
+        if vectors.shape[0] == 0:
+            return
+        self._check_dimension(vectors, self._matrix.shape[1])
+
+        size = self._count + vectors.shape[0]
+        if size > self._matrix.shape[0] or self._matrix.shape[1] != vectors.shape[1]:
+            # Amortized growth; also copies a read-only mapping into memory
+            capacity = max(size, self._matrix.shape[0] * 2, 64)
+            matrix = np.zeros((capacity, vectors.shape[1]), dtype=np.float32)
+            norms = np.zeros(capacity, dtype=np.float32)
+            if self._count:
+                matrix[:self._count] = self._matrix[:self._count]
+                norms[:self._count] = self._norms[:self._count]
+            self._matrix, self._norms = matrix, norms
+
+        self._matrix[self._count:size] = vectors
+        self._norms[self._count:size] = np.linalg.norm(vectors, axis=1)
+        self._count = size
+
+    def _append_codes(self, vectors: np.ndarray) -> None:
+        """
+        Quantize and append float vectors (int8 storage).
 
-        return dot / (norm_a * norm_b)
+        Args:
+            vectors: float32 (rows, dim) vectors
+        """
+        if vectors.shape[0] == 0:
+            return
+        self._check_dimension(vectors, self._codes.shape[1])
+        if self._count == 0:
+            self._codes = np.zeros((0, vectors.shape[1]), dtype=np.int8)
+
+        size = self._count + vectors.shape[0]
+        if size > self._codes.shape[0]:
+            capacity = max(size, self._codes.shape[0] * 2, 64)
+            codes = np.zeros((capacity, vectors.shape[1]), dtype=np.int8)
+            codes[:self._count] = self._codes[:self._count]
+            scales = np.ones(capacity, dtype=np.float32)
+            scales[:self._count] = self._scales[:self._count]
+            self._codes, self._scales = codes, scales
+
+        self._codes[self._count:size], self._scales[self._count:size] = quantize_int8(vectors, normalize=True)
+        # Held in memory until the next save, then mapped from vectors.npy
+        block_id = self._float_rows.add_block(vectors)
+        self._float_rows.append(block_id, np.arange(vectors.shape[0]))
+        self._count = size
 
     def _matches_filters(self, item_metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """
@@ -73,36 +188,160 @@ class VectorStore:
         Search for top-k most similar documents using cosine similarity.
         Returns: List of (document, score, metadata) tuples
         """
-        if not self.vectors:
-            return []
+        return self.search_many([query_vector], top_k=top_k, metadata_filters=metadata_filters)[0]
+
+    def search_many(self, query_vectors: List[List[float]], top_k: int = 3, metadata_filters: Optional[Dict[str, Any]] = None) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """
+        Search for several queries at once (e.g. query expansions).
+
+        Filters are resolved once and all queries are scored against the
+        candidate vectors with one matrix-matrix product.
+        Returns: One list of (document, score, metadata) tuples per query
+        """
+        if not self._count or not query_vectors or top_k <= 0:
+            return [[] for _ in query_vectors]
+
+        # Resolve filters on the metadata posting lists, then score only the survivors
+        candidates: Any = None
+        if metadata_filters:
+            rows, residual = self._metadata_index.match(
+                metadata_filters,
+                lambda i: self.metadata[i],
+                len(self.metadata),
+                in_semantics=False
+            )
+            candidates = rows if rows is not None else range(self._count)
+            if residual:
+                candidates = [idx for idx in candidates if self._matches_filters(self.metadata[idx], residual)]
+            candidates = np.asarray(candidates, dtype=np.int64)
+            if candidates.size == 0:
+                return [[] for _ in query_vectors]
+        if self._quantized:
+            if candidates is None:
+                candidates = np.arange(self._count)
+            return self._search_codes(query_vectors, top_k, candidates)
+
+        results: List[List[Tuple[str, float, Dict[str, Any]]]] = [[] for _ in query_vectors]
+        slots, queries = self._query_matrix(query_vectors, self._matrix.shape[1], np.float32)
+        if not slots:
+            return results
+
+        # Cosine similarities of every (candidate, query) pair; unfiltered
+        # searches score the stored rows in place, without a gather
+        if candidates is None:
+            candidates = np.arange(self._count)
+            vectors, norms = self._matrix[:self._count], self._norms[:self._count]
+        else:
+            vectors, norms = self._matrix[candidates], self._norms[candidates]
+        norms = np.where(norms == 0, np.inf, norms)
+        query_norms = np.linalg.norm(queries, axis=1)
+        query_norms[query_norms == 0] = np.inf
+        scores = (vectors @ queries.T) / norms[:, None] / query_norms[None, :]
+
+        for column, slot in enumerate(slots):
+            results[slot] = self._top_results(candidates, scores[:, column], top_k)
+        return results
+
+    def _query_matrix(self, query_vectors: List[List[float]], dim: int, dtype: type) -> Tuple[List[int], np.ndarray]:
+        """
+        Stack query vectors that match the index dimension.
+
+        Args:
+            query_vectors: Query embeddings
+            dim: Index dimension
+            dtype: Matrix dtype
 
-        # Compute similarities for all vectors
-        scores = []
-        for idx, vec in enumerate(self.vectors):
-            if metadata_filters and not self._matches_filters(self.metadata[idx], metadata_filters):
+        Returns:
+            (positions of the usable queries, (len(positions), dim) matrix)
+        """
+        slots, rows = [], []
+        for slot, query_vector in enumerate(query_vectors):
+            query = np.asarray(query_vector, dtype=dtype)
+            if query.ndim != 1 or query.shape[0] != dim:
+                logger.warning(f"Query dimension {query.shape[-1] if query.ndim else 0} does not match index dimension {dim}")
                 continue
-            score = self._cosine(query_vector, vec)
-            scores.append((idx, score))
+            slots.append(slot)
+            rows.append(query)
+        return slots, np.stack(rows) if rows else np.zeros((0, dim), dtype=dtype)
+
+    def _top_results(self, candidates: np.ndarray, scores: np.ndarray, top_k: int) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Top-k (document, score, metadata) tuples, best first, ties in insertion order.
+
+        Args:
+            candidates: Candidate rows
+            scores: Their scores
 
-        # Sort by score (descending)
-        scores.sort(key=lambda x: x[1], reverse=True)
+        Returns:
+            List of (document, score, metadata) tuples
+        """
+        top = top_indices(scores, min(top_k, candidates.size))
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+        return [
+            (self.docs[idx], float(scores[i]), self.metadata[idx])
+            for i, idx in zip(top, candidates[top].tolist())
+        ]
+
+    def _search_codes(self, query_vectors: List[List[float]], top_k: int, candidates: np.ndarray) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """
+        Search int8 storage: score codes, then re-rank with float vectors.
 
-        # Return top-k results
-        results = []
-        for idx, score in scores[:top_k]:
-            results.append((self.docs[idx], score, self.metadata[idx]))
+        Args:
+            query_vectors: Query embeddings
+            top_k: Number of results per query
+            candidates: Rows passing the metadata filters
 
+        Returns:
+            One list of (document, score, metadata) tuples per query
+        """
+        results: List[List[Tuple[str, float, Dict[str, Any]]]] = [[] for _ in query_vectors]
+        slots, queries = self._query_matrix(query_vectors, self._codes.shape[1], np.float32)
+        if not slots:
+            return results
+        norms = np.linalg.norm(queries, axis=1)
+        norms[norms == 0] = 1.0
+        queries = queries / norms[:, None]
+
+        # Asymmetric distance: float queries against int8 codes
+        scores = int8_scores(self._codes, self._scales, queries.T, candidates)
+
+        k = min(top_k, candidates.size)
+        for column, slot in enumerate(slots):
+            rows, row_scores = candidates, scores[:, column]
+            if self.rerank_factor > 0:
+                pool = top_indices(row_scores, min(k * self.rerank_factor, candidates.size))
+                rows = candidates[pool]
+                vectors = self._float_rows.gather(rows)
+                vector_norms = np.linalg.norm(vectors, axis=1)
+                vector_norms[vector_norms == 0] = 1.0
+                row_scores = (vectors @ queries[column]) / vector_norms
+            results[slot] = self._top_results(rows, row_scores, k)
         return results
 
-    def save(self, path: Optional[str] = None) -> None:
+    def save(self, path: Optional[str] = None, append: bool = False) -> None:
         """
         Persist vector store to disk.
+
+        Args:
+            path: Optional path to save to (uses index_path if not provided)
+            append: Only append the rows added since the last save to the
+                journal at index_path; falls back to a full save when the
+                files on disk do not match the store
         """
         target = path or self.index_path
+        if append and target == self.index_path and self._persisted is not None:
+            self._append_journal()
+            if self._journal_rows > max(self.compaction_min_rows, self._persisted - self._journal_rows):
+                self.compact()
+            return
+
         os.makedirs(target, exist_ok=True)
 
         # Save vectors as numpy array
-        np.save(os.path.join(target, 'vectors.npy'), np.array(self.vectors, dtype=np.float32))
+        if self._quantized:
+            self._save_float_rows(os.path.join(target, 'vectors.npy'), remap=target == self.index_path)
+        else:
+            _save_array(os.path.join(target, 'vectors.npy'), self._matrix[:self._count])
 
         # Save documents as JSON
         with open(os.path.join(target, 'docs.json'), 'w', encoding='utf-8') as f:
@@ -112,11 +351,70 @@ class VectorStore:
         with open(os.path.join(target, 'meta.json'), 'w', encoding='utf-8') as f:
             json.dump(self.metadata, f, ensure_ascii=False)
 
+        # The canonical files now hold every row; drop the journal
+        for name in (JOURNAL_VECTORS, JOURNAL_RECORDS):
+            if os.path.exists(os.path.join(target, name)):
+                os.remove(os.path.join(target, name))
+        if target == self.index_path:
+            self._persisted = self._count
+            self._journal_rows = 0
+
+    def compact(self) -> None:
+        """
+        Fold the append journal into the canonical files at index_path.
+        """
+        self.save()
+
+    def _append_journal(self) -> None:
+        """Append the rows added since the last save to the journal."""
+        start = self._persisted
+        if start >= self._count:
+            return
+        vectors = np.ascontiguousarray(self._rows(start, self._count), dtype=np.float32)
+        vectors_file = os.path.join(self.index_path, JOURNAL_VECTORS)
+        records_file = os.path.join(self.index_path, JOURNAL_RECORDS)
+
+        mode = 'a' if self._journal_rows else 'w'
+        with open(vectors_file, mode + 'b') as f:
+            if not self._journal_rows:
+                header = np.array([vectors.shape[1], start], dtype='<u4').tobytes()
+                f.write(JOURNAL_MAGIC + header)
+            f.write(vectors.tobytes())
+        with open(records_file, mode, encoding='utf-8') as f:
+            for doc, meta in zip(self.docs[start:self._count], self.metadata[start:self._count]):
+                f.write(json.dumps({"doc": doc, "meta": meta}, ensure_ascii=False) + '\n')
+
+        self._journal_rows += self._count - start
+        self._persisted = self._count
+
+    def _rows(self, start: int, stop: int) -> np.ndarray:
+        """Float vectors of rows [start, stop)."""
+        if self._quantized:
+            return self._float_rows.gather(np.arange(start, stop))
+        return self._matrix[start:stop]
+
+    def _save_float_rows(self, vectors_file: str, remap: bool) -> None:
+        """
+        Write the float vectors of int8 storage, replacing the file atomically.
+
+        Args:
+            vectors_file: Target vectors.npy path
+            remap: Map the float vectors from the written file afterwards
+        """
+        _save_array(vectors_file, self.vectors)
+
+        if remap and self._count:
+            self._float_rows.reset()
+            block_id = self._float_rows.add_block(np.load(vectors_file, mmap_mode='r'))
+            self._float_rows.append(block_id, np.arange(self._count))
+
     def load(self, path: Optional[str] = None) -> None:
         """
         Load vector store from disk.
         """
         target = path or self.index_path
+        self._persisted = None
+        self._journal_rows = 0
         if not os.path.exists(target):
             # Directory doesn't exist, initialize empty
             return
@@ -132,11 +430,14 @@ class VectorStore:
 
         # Load vectors
         try:
-            vectors = np.load(vectors_file)
-            self.vectors = vectors.tolist()
+            if self._quantized:
+                self._load_codes(np.load(vectors_file, mmap_mode='r'))
+            else:
+                self._load_rows(np.load(vectors_file, mmap_mode='r' if self.mmap else None))
         except Exception as e:
             logger.warning(f"Failed to load vectors: {e}")
-            self.vectors = []
+            self._clear_rows()
+            self._clear_codes()
 
         # Load documents
         try:
@@ -155,25 +456,168 @@ class VectorStore:
             self.metadata = []
 
         # Validate lengths
-        min_len = min(len(self.docs), len(self.vectors), len(self.metadata))
+        consistent = len(self.docs) == self._count == len(self.metadata)
+        min_len = min(len(self.docs), self._count, len(self.metadata))
         self.docs = self.docs[:min_len]
-        self.vectors = self.vectors[:min_len]
         self.metadata = self.metadata[:min_len]
+        if self._count > min_len:
+            self._count = min_len
+            if self._quantized:
+                self._float_rows.keep(np.arange(len(self._float_rows)) < min_len)
+
+        # Replay rows appended since the canonical files were written
+        journal = _read_journal(target, min_len)
+        if journal is not None:
+            # A torn tail cannot be appended to; the next save rewrites it
+            vectors, records, torn = journal
+            consistent = consistent and not torn and len(vectors) == len(records)
+            rows = min(len(vectors), len(records))
+            try:
+                if self._quantized:
+                    self._append_codes(vectors[:rows])
+                else:
+                    self._append_rows(vectors[:rows])
+                self.docs.extend(doc for doc, _ in records[:rows])
+                self.metadata.extend(meta for _, meta in records[:rows])
+                self._journal_rows = rows
+            except ValueError as e:
+                logger.warning(f"Failed to load append journal: {e}")
+                consistent = False
+        self._metadata_index.reset(len(self.docs))
+
+        if consistent and target == self.index_path:
+            self._persisted = self._count
+
+    def _load_rows(self, vectors: np.ndarray) -> None:
+        """
+        Adopt loaded float vectors as float32 storage, without copying them.
+
+        Args:
+            vectors: (rows, dim) vectors.npy, read or memory-mapped
+        """
+        self._clear_rows()
+        if vectors.ndim != 2 or vectors.shape[0] == 0:
+            return
+        if vectors.dtype != np.float32:
+            vectors = vectors.astype(np.float32)
+        self._matrix = vectors
+        self._norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+        self._count = vectors.shape[0]
+
+    def _clear_rows(self) -> None:
+        """Drop float32 storage."""
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._count = 0
+
+    def _load_codes(self, vectors: np.ndarray) -> None:
+        """
+        Quantize memory-mapped float vectors into int8 storage.
+
+        Args:
+            vectors: float32 (rows, dim) memory-mapped vectors.npy
+        """
+        self._clear_codes()
+        if vectors.ndim != 2 or vectors.shape[0] == 0:
+            return
+        self._codes, self._scales = quantize_int8(vectors, normalize=True)
+        self._count = vectors.shape[0]
+        block_id = self._float_rows.add_block(vectors)
+        self._float_rows.append(block_id, np.arange(self._count))
+
+    def _clear_codes(self) -> None:
+        """Drop int8 storage."""
+        self._codes = np.zeros((0, 0), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._count = 0
+        self._float_rows.reset()
 
     def clear(self) -> None:
         """
         Clear all data from vector store.
         """
         self.docs = []
-        self.vectors = []
         self.metadata = []
+        self._clear_rows()
+        self._clear_codes()
+        self._persisted = None
+        self._metadata_index.reset()
 
     def get_stats(self) -> Dict[str, int]:
         """
         Get statistics about the vector store.
         """
+        storage = self._codes if self._quantized else self._matrix
         return {
             "total_docs": len(self.docs),
-            "total_vectors": len(self.vectors),
-            "vector_dimension": len(self.vectors[0]) if self.vectors else 0
+            "total_vectors": self._count,
+            "vector_dimension": storage.shape[1] if self._count else 0
         }
+
+
+def _read_journal(directory: str, base_rows: int) -> Optional[Tuple[np.ndarray, List[Tuple[str, Dict[str, Any]]], bool]]:
+    """
+    Read the append journal extending the canonical files of a directory.
+
+    A torn tail (partial vector row or JSON line) is skipped.
+
+    Args:
+        directory: Index directory
+        base_rows: Rows in the canonical files
+
+    Returns:
+        (memory-mapped (rows, dim) vectors, [(doc, metadata)], whether a torn
+        tail was skipped), or None if there is no journal or it extends a
+        different set of canonical rows (i.e. it was already folded into them)
+    """
+    vectors_file = os.path.join(directory, JOURNAL_VECTORS)
+    records_file = os.path.join(directory, JOURNAL_RECORDS)
+    if not os.path.exists(vectors_file) or not os.path.exists(records_file):
+        return None
+
+    with open(vectors_file, 'rb') as f:
+        header = f.read(JOURNAL_HEADER_SIZE)
+    if len(header) < JOURNAL_HEADER_SIZE or not header.startswith(JOURNAL_MAGIC):
+        logger.warning(f"Ignoring append journal with a bad header: {vectors_file}")
+        return None
+    dim, journal_base = (int(value) for value in np.frombuffer(header[len(JOURNAL_MAGIC):], dtype='<u4'))
+    if journal_base != base_rows:
+        return None
+
+    size = os.path.getsize(vectors_file) - JOURNAL_HEADER_SIZE
+    rows = size // (4 * dim) if dim else 0
+    torn = size != rows * 4 * dim
+    if rows:
+        vectors = np.memmap(vectors_file, dtype=np.float32, mode='r', offset=JOURNAL_HEADER_SIZE, shape=(rows, dim))
+    else:
+        vectors = np.zeros((0, dim), dtype=np.float32)
+
+    records: List[Tuple[str, Dict[str, Any]]] = []
+    with open(records_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line) if line.endswith('\n') else None
+            except ValueError:
+                record = None
+            if record is None:
+                torn = True
+                break
+            records.append((record["doc"], record["meta"]))
+    return vectors, records, torn
+
+
+def _save_array(path: str, array: np.ndarray) -> None:
+    """
+    Write an .npy file via a temporary file, replacing the target atomically.
+
+    The target may still be memory-mapped by a store; it is never
+    truncated in place.
+
+    Args:
+        path: Target .npy path
+        array: Array to write
+    """
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_file, path)
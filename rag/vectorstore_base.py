@@ -16,6 +16,7 @@ class IVectorStore(ABC):
     Methods:
         add: Add documents with vectors to the store
         search: Search for similar vectors
+        search_many: Search for several query vectors at once
         save: Persist the store to disk
         load: Load the store from disk
         clear: Remove all vectors from the store
@@ -59,13 +60,37 @@ class IVectorStore(ABC):
         """
         pass
 
+    def search_many(
+        self,
+        query_vectors: List[List[float]],
+        top_k: int = 3,
+        metadata_filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[str, float, Dict[str, Any]]]]:
+        """
+        Search for several query vectors at once.
+
+        Backends that can score queries together should override this;
+        the default runs one search per query.
+
+        Args:
+            query_vectors: Query embedding vectors
+            top_k: Number of results per query
+            metadata_filters: Optional metadata filters (shared by all queries)
+
+        Returns:
+            One list of (doc_text, similarity_score, metadata) tuples per query
+        """
+        return [self.search(query_vector, top_k, metadata_filters) for query_vector in query_vectors]
+
     @abstractmethod
-    def save(self, path: Optional[str] = None) -> None:
+    def save(self, path: Optional[str] = None, append: bool = False) -> None:
         """
         Persist the store to disk.
 
         Args:
             path: Optional path to save to (uses default if not provided)
+            append: Only persist what was added since the last save, if the
+                implementation supports incremental saves
         """
         pass
 
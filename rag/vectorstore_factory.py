@@ -24,6 +24,11 @@ def get_vector_store(config: Dict[str, Any]) -> IVectorStore:
         config: Configuration dict with keys:
             - vector_backend: "chromadb" or "legacy"
             - index_path: Path to store vectors
+            - storage_mode: "float32" or "int8" (legacy backend only)
+            - rerank_factor: Float re-ranking multiplier for int8 storage
+            - mmap: Memory-map vectors.npy on load (legacy backend only)
+            - compaction_min_rows: Append journal size that may trigger a
+              compaction (legacy backend only)
 
     Returns:
         IVectorStore implementation
@@ -37,7 +42,13 @@ def get_vector_store(config: Dict[str, Any]) -> IVectorStore:
     if backend == "chromadb":
         return ChromaVectorStore(index_path=index_path)
     elif backend == "legacy":
-        return VectorStore(index_path=index_path)
+        return VectorStore(
+            index_path=index_path,
+            storage_mode=config.get("storage_mode", "float32"),
+            rerank_factor=config.get("rerank_factor", 4),
+            mmap=config.get("mmap", False),
+            compaction_min_rows=config.get("compaction_min_rows", 1024)
+        )
     else:
         raise ValueError(f"Unsupported vector backend: {backend}. Use 'chromadb' or 'legacy'.")
 
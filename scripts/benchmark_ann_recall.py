@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Evaluate IVF recall and latency against flat search on a synthetic corpus."""
+import time
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from rag.ann_index import IVFIndex
+
+
+def make_corpus(n_vectors, dim, n_clusters, seed=0):
+    """Clustered unit-length vectors, roughly like real embedding corpora."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n_vectors)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n_vectors, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def flat_top_k(vectors, query, k):
+    """Exact top-k rows by cosine similarity."""
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def ivf_top_k(index, vectors, query, k, nprobe):
+    """Approximate top-k rows, scoring only the probed lists."""
+    rows = index.probe(query, nprobe)
+    scores = vectors[rows] @ query
+    k = min(k, rows.size)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return rows[top[np.argsort(-scores[top])]]
+
+
+def benchmark_ann_recall(n_vectors=200000, dim=384, n_lists=1024, n_queries=200, k=10,
+                         nprobes=(1, 4, 8, 16, 32, 64)):
+    """Report recall@k and mean query latency of IVF vs flat for several nprobe values."""
+    print(f"Building synthetic corpus: {n_vectors} x {dim}...")
+    vectors = make_corpus(n_vectors, dim, n_clusters=max(n_lists // 4, 1))
+    queries = make_corpus(n_queries, dim, n_clusters=max(n_lists // 4, 1), seed=1)
+
+    index = IVFIndex(n_lists=n_lists)
+    start_time = time.perf_counter()
+    assignments = index.train(vectors)
+    index.reset(assignments)
+    train_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    truth = [set(flat_top_k(vectors, q, k).tolist()) for q in queries]
+    flat_ms = (time.perf_counter() - start_time) / n_queries * 1000
+
+    print(f"\n{'='*60}")
+    print(f"IVF Recall Benchmark Results:")
+    print(f"  Corpus: {n_vectors} vectors, dim={dim}, n_lists={n_lists}")
+    print(f"  Training: {train_time:.2f}s")
+    print(f"  Flat search: {flat_ms:.3f}ms/query")
+    print(f"  {'nprobe':>8} {'recall@' + str(k):>10} {'ms/query':>10} {'speedup':>8}")
+
+    results = []
+    for nprobe in nprobes:
+        start_time = time.perf_counter()
+        found = [ivf_top_k(index, vectors, q, k, nprobe) for q in queries]
+        ivf_ms = (time.perf_counter() - start_time) / n_queries * 1000
+        recall = float(np.mean([len(truth[i] & set(rows.tolist())) / k for i, rows in enumerate(found)]))
+        results.append((nprobe, recall, ivf_ms))
+        print(f"  {nprobe:>8} {recall:>10.3f} {ivf_ms:>10.3f} {flat_ms / ivf_ms:>7.1f}x")
+    print(f"{'='*60}\n")
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Evaluate IVF recall vs flat search")
+    parser.add_argument("--vectors", type=int, default=200000,
+                       help="Corpus size (default: 200000)")
+    parser.add_argument("--dim", type=int, default=384,
+                       help="Embedding dimension (default: 384)")
+    parser.add_argument("--lists", type=int, default=1024,
+                       help="Number of IVF lists (default: 1024)")
+    parser.add_argument("--queries", type=int, default=200,
+                       help="Number of queries (default: 200)")
+    parser.add_argument("--k", type=int, default=10,
+                       help="Results per query (default: 10)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64],
+                       help="nprobe values to evaluate")
+    args = parser.parse_args()
+
+    benchmark_ann_recall(args.vectors, args.dim, args.lists, args.queries, args.k, tuple(args.nprobe))
@@ -151,3 +151,93 @@ Paragraph four final.
 
         # Whitespace should be preserved within chunks
         # But excessive whitespace might be trimmed
+
+
+@pytest.mark.unit
+class TestStreamingChunking:
+    """Test generator-based chunking of streamed text."""
+
+    TEXT = (
+        "Intro line.\n\n\n\nA paragraph that goes on. And on. " * 3
+        + "\n\n" + "word " * 80 + "\n\n\nTail.\n\n"
+    )
+
+    def _blocks(self, text, size):
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def test_paragraphs_match_split(self):
+        """Test that paragraphs from any block split equal str.split("\\n\\n")."""
+        from rag.chunking import iter_paragraphs
+
+        for text in [self.TEXT, "", "\n", "\n\n", "a\n\n\n\n\nb\n", "\n\n\nx"]:
+            for size in (1, 2, 3, 7, 1000):
+                assert list(iter_paragraphs(self._blocks(text, size))) == text.split("\n\n")
+
+    def test_stream_matches_chunk_text(self):
+        """Test that chunking streamed blocks gives chunk_text's output."""
+        from rag.chunking import iter_chunks, iter_paragraphs
+
+        for size in (1, 5, 64):
+            for chunk_size, overlap in [(30, 0), (50, 10), (200, 60)]:
+                streamed = iter_chunks(iter_paragraphs(self._blocks(self.TEXT, size)), chunk_size, overlap, "words")
+                assert list(streamed) == chunk_text(self.TEXT, chunk_size, overlap)
+
+    def test_long_paragraphs_stream_like_whole_text(self):
+        """Test that paragraphs longer than chunk_size chunk the same from any block split."""
+        from rag.chunking import iter_chunks, iter_paragraphs, iter_text_chunks
+
+        text = "  Log line one. Log line two\n" * 40 + "\n\nshort\n\n" + "token " * 90 + " \n "
+        for split_long in ("sentences", "words"):
+            for chunk_size, overlap in [(30, 0), (50, 10), (200, 60)]:
+                whole = list(iter_chunks(iter_paragraphs([text]), chunk_size, overlap, split_long))
+                for size in (1, 5, 64):
+                    streamed = iter_text_chunks(self._blocks(text, size), chunk_size, overlap, split_long)
+                    assert list(streamed) == whole
+        assert list(iter_text_chunks(self._blocks(self.TEXT, 3), 50, 10, "words")) == chunk_text(self.TEXT, 50, 10)
+
+    def test_file_without_blank_lines_streams_in_bounded_memory(self, temp_dir):
+        """Test that a log with no blank lines is chunked without holding it whole."""
+        import tracemalloc
+        from rag.chunking import iter_file_blocks, iter_text_chunks
+
+        path = temp_dir / "app.log"
+        line = "2026-10-17 12:00:00 INFO worker processed request in 12ms\n"
+        path.write_text(line * 50000)
+        size = path.stat().st_size
+
+        tracemalloc.start()
+        try:
+            chunks = sum(1 for _ in iter_text_chunks(iter_file_blocks(str(path), 1 << 16, "utf-8"), 500, 50, "words"))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert chunks > size // 500
+        assert peak < size // 4
+
+    def test_file_blocks_fall_back_to_latin1(self, temp_dir):
+        """Test that files are read in blocks with the whole-file encoding fallback."""
+        from rag.chunking import iter_file_blocks
+        from rag.ingest import read_file
+
+        path = temp_dir / "notes.txt"
+        path.write_bytes("café ✓\n\n".encode("utf-8") * 50 + "naïve".encode("latin-1"))
+
+        blocks = list(iter_file_blocks(str(path), block_size=16))
+        assert len(blocks) > 1 and all(len(block) <= 16 for block in blocks)
+        assert "".join(blocks) == read_file(str(path))
+        assert "".join(blocks).endswith("naïve")
+
+    def test_file_blocks_use_given_encoding(self, temp_dir, monkeypatch):
+        """Test that a passed-in encoding skips detection."""
+        import rag.chunking as chunking
+
+        path = temp_dir / "notes.txt"
+        path.write_bytes("naïve\n\ncafé".encode("latin-1"))
+        encoding = chunking.detect_encoding(str(path))
+
+        def detect(*args, **kwargs):
+            raise AssertionError("encoding detected again")
+
+        monkeypatch.setattr(chunking, "detect_encoding", detect)
+        assert "".join(chunking.iter_file_blocks(str(path), block_size=4, encoding=encoding)) == "naïve\n\ncafé"
@@ -6,7 +6,13 @@ Tests cover pool management, thread safety, and connection lifecycle.
 
 import pytest
 import threading
-from rag.connection_pool import SQLiteConnectionPool
+from rag.connection_pool import (
+    SQLiteConnectionPool,
+    SQLiteDatabasePool,
+    close_database_pools,
+    get_database_pool,
+    get_database_pool_stats
+)
 
 
 @pytest.mark.unit
@@ -209,3 +215,107 @@ class TestSQLiteConnectionPool:
 
         pool1.close_all()
         pool2.close_all()
+
+    def test_overflow_and_wait_metrics(self, test_db_path):
+        """Test that overflow connections are counted and closed when the pool is full."""
+        pool = SQLiteConnectionPool(str(test_db_path), pool_size=1, wait_timeout=0.01)
+
+        with pool.get_connection() as pooled:
+            with pool.get_connection() as overflow:
+                assert pool.get_stats()["in_use"] == 2
+
+        stats = pool.get_stats()
+        assert stats["acquisitions"] == 2
+        assert stats["overflows"] == 1
+        assert stats["wait_ms_max"] >= 10
+        assert stats["in_use"] == 0 and stats["available"] == 1
+
+        # The connection returned to a full pool is closed, not leaked
+        with pool.get_connection() as conn:
+            assert conn is overflow
+        with pytest.raises(Exception):
+            pooled.execute("SELECT 1")
+
+        pool.close_all()
+
+
+@pytest.mark.unit
+class TestSQLiteDatabasePool:
+    """Test SQLiteDatabasePool and the shared per-database registry."""
+
+    def test_writer_commits_and_rolls_back(self, temp_dir):
+        """Test that writes commit on success, roll back on error and are visible to readers."""
+        db = SQLiteDatabasePool(str(temp_dir / "rw.db"), read_pool_size=2)
+        with db.writer() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with pytest.raises(ValueError):
+            with db.writer() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise ValueError("abort")
+
+        with db.reader() as conn:
+            assert conn.execute("SELECT x FROM t").fetchall() == [(1,)]
+            assert conn is not db._writer
+
+        stats = db.get_stats()
+        assert stats["writer"]["writes"] == 2
+        assert stats["readers"]["acquisitions"] == 1
+        db.close()
+
+    def test_get_database_pool_is_shared_per_file(self, temp_dir):
+        """Test that one pool serves a file until the file is replaced."""
+        path = temp_dir / "shared.db"
+        db = get_database_pool(str(path), read_pool_size=2)
+        assert get_database_pool(str(temp_dir / "." / "shared.db")) is db
+        assert str(path) in get_database_pool_stats()
+
+        path.unlink()
+        replaced = get_database_pool(str(path))
+        assert replaced is not db
+        assert replaced.is_current() and not db.is_current()
+
+        close_database_pools()
+        assert get_database_pool_stats() == {}
+
+    def test_closed_pool_reopens(self, temp_dir):
+        """Test that a store's pool keeps working after close_database_pools()."""
+        db = get_database_pool(str(temp_dir / "reopen.db"))
+        with db.writer() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        close_database_pools()
+        with db.writer() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+        with db.reader() as conn:
+            assert conn.execute("SELECT x FROM t").fetchall() == [(1,)]
+        db.close()
+
+    def test_data_version_does_not_wait_for_writes(self, temp_dir):
+        """Test that data_version answers while a write holds the writer."""
+        import sqlite3
+        path = str(temp_dir / "version.db")
+        db = SQLiteDatabasePool(path, read_pool_size=1)
+        with db.writer() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        version = db.data_version()
+
+        writing, release = threading.Event(), threading.Event()
+
+        def write():
+            with db.writer():
+                writing.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        writing.wait(5)
+        with sqlite3.connect(path) as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+        assert db.data_version() == version
+        release.set()
+        thread.join()
+
+        assert db.data_version() != version
+        db.close()
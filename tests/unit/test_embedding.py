@@ -169,3 +169,242 @@ class TestEmbeddingService:
             assert text in mock_embedding_service._cache or \
                    any(k == text for k in mock_embedding_service._cache.keys()), \
                    "Cache should use text as key"
+
+
+@pytest.mark.unit
+class TestEmbeddingCacheLRU:
+    """Test the hit-aware, byte-bounded in-memory cache of EmbeddingService."""
+
+    def _service(self, temp_dir, monkeypatch, calls):
+        model = temp_dir / "embed.gguf"
+        model.write_bytes(b"weights")
+        service = EmbeddingService(config_path="/nonexistent/rag_config.json")
+        service._test_mode = False
+        service.model_path = str(model)
+
+        def fake_generate(model_name, texts, max_batch_size=None):
+            calls.extend(texts)
+            return [[float(len(text))] * 4 for text in texts]
+
+        monkeypatch.setattr(service._manager, "generate_embeddings", fake_generate)
+        return service
+
+    def test_hits_promote_entries(self, temp_dir, monkeypatch):
+        """Test that a hit keeps an entry from being evicted first."""
+        calls = []
+        service = self._service(temp_dir, monkeypatch, calls)
+        service.cache_size = 3
+        service.embed(["a", "bb", "ccc"])
+        assert service.embed(["a"]) == [[1.0] * 4]
+
+        service.embed(["dddd"])
+        calls.clear()
+        service.embed(["a", "ccc", "dddd", "bb"])
+        assert calls == ["bb"]
+
+        stats = service.get_stats()
+        assert (stats["cache_hits"], stats["cache_misses"], stats["cache_evictions"]) == (4, 5, 2)
+
+    def test_byte_budget(self, temp_dir, monkeypatch):
+        """Test that entries are float32 arrays bounded by cache_max_bytes."""
+        calls = []
+        service = self._service(temp_dir, monkeypatch, calls)
+        service.embed(["x"])
+        entry_bytes = service.get_stats()["cache_bytes"]
+        assert next(iter(service._cache.values())).dtype.name == "float32"
+
+        service.cache_max_bytes = entry_bytes * 2
+        service.embed(["long prefix " * 50 + "1", "long prefix " * 50 + "2", "y"])
+        stats = service.get_stats()
+        assert stats["cache_size"] == 2 and stats["cache_bytes"] <= entry_bytes * 2
+
+        # Texts sharing a long prefix, or differing only in case, keep their own vectors
+        calls.clear()
+        assert service.embed(["Y", "y"]) == [[1.0] * 4, [1.0] * 4]
+        assert calls == ["Y"]
+
+        service.clear_cache()
+        assert service.get_stats()["cache_bytes"] == 0
+
+
+@pytest.mark.unit
+class TestEmbedAsync:
+    """Test micro-batching in EmbeddingService.embed_async."""
+
+    def _service(self, monkeypatch, max_batch=32):
+        service = EmbeddingService(config_path="/nonexistent/rag_config.json")
+        service._batcher.max_batch = max_batch
+        calls = []
+
+        def fake_embed(texts):
+            calls.append(list(texts))
+            if "boom" in texts:
+                raise RuntimeError("model failed")
+            return [[float(len(text))] for text in texts]
+
+        monkeypatch.setattr(service, "embed", fake_embed)
+        return service, calls
+
+    def test_coalesces_concurrent_queries(self, monkeypatch):
+        """Test that concurrent calls share one embed() call and get their own vectors."""
+        import asyncio
+        service, calls = self._service(monkeypatch)
+        queries = ["a", "bb", "ccc", "bb", "dddd"]
+
+        async def run():
+            return await asyncio.gather(*(service.embed_async(query) for query in queries))
+
+        assert asyncio.run(run()) == [[1.0], [2.0], [3.0], [2.0], [4.0]]
+        assert calls == [["a", "bb", "ccc", "dddd"]]
+        assert service.get_stats()["async_batches"] == 1
+
+        # A new event loop starts a fresh window
+        assert asyncio.run(run())[4] == [4.0]
+        assert len(calls) == 2
+
+    def test_max_batch_and_errors(self, monkeypatch):
+        """Test that full windows flush early and failures reach every caller of the batch."""
+        import asyncio
+        service, calls = self._service(monkeypatch, max_batch=3)
+
+        async def run(queries):
+            return await asyncio.gather(*(service.embed_async(query) for query in queries), return_exceptions=True)
+
+        results = asyncio.run(run([str(i) * (i + 1) for i in range(7)]))
+        assert [len(call) for call in calls] == [3, 3, 1]
+        assert results == [[float(i + 1)] for i in range(7)]
+
+        results = asyncio.run(run(["x", "boom", "y"]))
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.unit
+class TestParallelEmbeddingService:
+    """Test sharding and the concurrency cap of ParallelEmbeddingService."""
+
+    class _Service:
+        batch_size = 4
+        model_path = "/fake/embed.gguf"
+
+        def __init__(self):
+            import threading
+            self.shards = []
+            self.active = 0
+            self.peak = 0
+            self._lock = threading.Lock()
+
+        def embed(self, texts):
+            import time
+            with self._lock:
+                self.shards.append(list(texts))
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.02)
+            with self._lock:
+                self.active -= 1
+            return [[float(len(text))] for text in texts]
+
+        def get_stats(self):
+            return {"model_path": self.model_path}
+
+    def test_shards_in_order_under_cap(self):
+        """Test that shards run concurrently up to the cap and results keep input order."""
+        from rag.embedding import ParallelEmbeddingService
+        base = self._Service()
+        service = ParallelEmbeddingService(base, max_concurrency=2)
+        texts = ["x" * n for n in range(1, 12)]
+
+        assert service.embed(texts) == [[float(n)] for n in range(1, 12)]
+        assert [len(shard) for shard in base.shards] == [4, 4, 3]
+        assert base.peak == 2
+
+        # Small requests still spread over every slot
+        base.shards.clear()
+        assert service.embed_single("abc") == [3.0]
+        assert service.embed(["a", "b", "c"]) == [[1.0], [1.0], [1.0]]
+        assert sorted(len(shard) for shard in base.shards) == [1, 1, 2]
+
+        stats = service.get_stats()
+        assert stats["model_path"] == "/fake/embed.gguf" and service.model_path == "/fake/embed.gguf"
+        assert stats["shards"] == 6 and stats["texts"] == 15
+        assert stats["shard_latency_ms_p95"] >= 20
+
+    def test_embed_parallel(self):
+        """Test the async API used by ChromaSemanticStore."""
+        import asyncio
+        from rag.embedding import ParallelEmbeddingService
+        base = self._Service()
+        service = ParallelEmbeddingService(base, max_concurrency=3)
+
+        embeddings = asyncio.run(service.embed_parallel(["a" * n for n in range(1, 10)]))
+
+        assert embeddings == [[float(n)] for n in range(1, 10)]
+        assert [len(shard) for shard in base.shards] == [3, 3, 3]
+        assert base.peak == 3
+        assert asyncio.run(service.embed_parallel([])) == []
+
+    def test_default_concurrency(self):
+        """Test the cap's defaults with and without embedding worker processes."""
+        from rag.embedding import IN_PROCESS_CONCURRENCY, ParallelEmbeddingService
+        base = self._Service()
+
+        assert ParallelEmbeddingService(base).max_concurrency == IN_PROCESS_CONCURRENCY
+        base.num_workers = 3
+        assert ParallelEmbeddingService(base).max_concurrency == 3
+        base.max_concurrency = 5
+        assert ParallelEmbeddingService(base).max_concurrency == 5
+
+
+@pytest.mark.unit
+class TestEmbeddingMemo:
+    """Test per-request embedding memos."""
+
+    class _Service:
+        def __init__(self):
+            self.calls = []
+
+        def embed(self, texts):
+            self.calls.append(list(texts))
+            return [[float(len(text)), 1.0] for text in texts]
+
+        async def embed_async(self, text):
+            self.calls.append([text])
+            return [float(len(text)), 1.0]
+
+    class _Store:
+        def search(self, query_embedding, top_k, metadata_filters=None, min_score=0.0, **kwargs):
+            return []
+
+        def search_many(self, query_embeddings, top_k, metadata_filters=None, min_score=0.0, **kwargs):
+            return [[] for _ in query_embeddings]
+
+    def test_embeds_each_text_once(self):
+        """Test that repeated texts reach the service once and are counted as saved."""
+        import asyncio
+        from rag.embedding import EmbeddingMemo
+        service = self._Service()
+        memo = EmbeddingMemo(service)
+
+        assert memo.embed(["a", "bb", "a"]) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert memo.embed_single("bb") == [2.0, 1.0]
+        assert asyncio.run(memo.embed_async("a")) == [1.0, 1.0]
+        assert asyncio.run(memo.embed_async("ccc")) == [3.0, 1.0]
+        assert service.calls == [["a", "bb"], ["ccc"]]
+        assert (memo.requested, memo.computed, memo.saved) == (6, 3, 3)
+
+    def test_shared_across_retrievals(self):
+        """Test that one memo serves expansion and plain retrieval of the same query."""
+        import asyncio
+        from rag.embedding import EmbeddingMemo
+        from rag.semantic_retriever import SemanticRetriever
+        service = self._Service()
+        retriever = SemanticRetriever(semantic_store=self._Store(), embedding_service=service)
+        memo = EmbeddingMemo(service)
+        query = "how do I handle auth errors"
+
+        retriever.retrieve_with_expansion(query, embedding_memo=memo)
+        asyncio.run(retriever.retrieve_async(query, embedding_memo=memo))
+        retriever.retrieve(query, embedding_memo=memo)
+
+        assert len(service.calls) == 1 and service.calls[0][0] == query
+        assert memo.saved == 2
@@ -0,0 +1,137 @@
+"""
+Unit tests for the persistent embedding cache.
+
+Tests cover content-addressed keys, persistence across instances, LRU
+eviction by byte budget and EmbeddingService skipping the model on hits.
+"""
+
+import pytest
+from rag.embedding import EmbeddingService
+from rag.embedding_cache import PersistentEmbeddingCache, model_identity
+
+
+@pytest.mark.unit
+class TestPersistentEmbeddingCache:
+    """Test PersistentEmbeddingCache storage and eviction."""
+
+    def test_round_trip_across_instances(self, temp_dir):
+        """Test that vectors survive a reopen and keys are exact and per-model."""
+        path = str(temp_dir / "cache.db")
+        prefix = "p" * 600
+        cache = PersistentEmbeddingCache(path, "model-a")
+        cache.put_many([prefix + "1", prefix + "2", "Hello", "failed"], [[1.0, 2.0], [3.0, 4.0], [0.5, 0.25], []])
+        cache.close()
+
+        reopened = PersistentEmbeddingCache(path, "model-a")
+        assert reopened.get_many([prefix + "2", "hello", "Hello", "failed", prefix + "1"]) == {
+            0: [3.0, 4.0], 2: [0.5, 0.25], 4: [1.0, 2.0]
+        }
+        assert reopened.get_stats()["entries"] == 3
+        assert reopened.get_stats()["bytes"] == 24
+        assert PersistentEmbeddingCache(path, "model-b").get_many(["Hello"]) == {}
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        """Test that the byte budget evicts the rows read or written longest ago."""
+        cache = PersistentEmbeddingCache(str(temp_dir / "cache.db"), "model", max_bytes=10 * 16, touch_interval=0)
+        texts = [f"text {i}" for i in range(10)]
+        for text in texts:
+            cache.put_many([text], [[1.0, 2.0, 3.0, 4.0]])
+        assert cache.get_many(texts[:2]).keys() == {0, 1}
+
+        cache.put_many(["new"], [[5.0, 6.0, 7.0, 8.0]])
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 9 * 16 and stats["evictions"] == 2
+        assert cache.get_many(texts + ["new"]).keys() == {0, 1, 4, 5, 6, 7, 8, 9, 10}
+
+        cache.clear()
+        assert cache.get_stats()["entries"] == 0
+
+    def test_hits_and_repeated_puts_do_not_rewrite(self, temp_dir):
+        """Test that recent hits skip the last_used write and re-puts are not counted twice."""
+        cache = PersistentEmbeddingCache(str(temp_dir / "cache.db"), "model")
+        cache.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+        with cache._pool.get_connection() as conn:
+            before = conn.execute("SELECT key, last_used FROM embeddings ORDER BY key").fetchall()
+            assert cache.get_many(["a", "b", "a"]).keys() == {0, 1, 2}
+            assert conn.execute("SELECT key, last_used FROM embeddings ORDER BY key").fetchall() == before
+
+        cache.put_many(["a", "b", "c"], [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+        assert cache.get_stats()["bytes"] == 24
+        reopened = PersistentEmbeddingCache(str(temp_dir / "cache.db"), "model")
+        assert reopened.get_stats()["bytes"] == 24
+
+    def test_model_identity(self, temp_dir):
+        """Test that the identity changes with the model file and context size."""
+        model = temp_dir / "embed.gguf"
+        model.write_bytes(b"weights")
+        identity = model_identity(str(model), 2048)
+        assert identity.startswith("embed.gguf:7:")
+        assert model_identity(str(model), 4096) != identity
+        model.write_bytes(b"other weights")
+        assert model_identity(str(model), 2048) != identity
+
+
+@pytest.mark.unit
+class TestEmbeddingServiceDiskCache:
+    """Test EmbeddingService reading through the persistent cache."""
+
+    def _service(self, temp_dir, monkeypatch, calls):
+        model = temp_dir / "embed.gguf"
+        if not model.exists():
+            model.write_bytes(b"weights")
+        service = EmbeddingService(config_path="/nonexistent/rag_config.json")
+        service._test_mode = False
+        service.model_path = str(model)
+        service.disk_cache_enabled = True
+        service.disk_cache_path = str(temp_dir / "cache" / "embeddings.db")
+
+        def fake_generate(model_name, texts, max_batch_size=None):
+            calls.append(list(texts))
+            return [[float(len(text)), 1.0] for text in texts]
+
+        monkeypatch.setattr(service._manager, "generate_embeddings", fake_generate)
+        return service
+
+    def test_skips_model_after_restart(self, temp_dir, monkeypatch):
+        """Test that a new service embeds only texts no earlier service has seen."""
+        calls = []
+        first = self._service(temp_dir, monkeypatch, calls)
+        assert first.embed(["alpha", "beta"]) == [[5.0, 1.0], [4.0, 1.0]]
+        first._close_disk_cache()
+
+        restarted = self._service(temp_dir, monkeypatch, calls)
+        assert restarted.embed(["beta", "gamma!", "alpha"]) == [[4.0, 1.0], [6.0, 1.0], [5.0, 1.0]]
+        assert calls == [["alpha", "beta"], ["gamma!"]]
+        assert restarted.get_stats()["disk_cache"]["hits"] == 2
+
+        # Disk hits also warm the in-memory cache
+        restarted.embed(["alpha", "beta"])
+        assert restarted.get_stats()["disk_cache"]["hits"] == 2
+        assert len(calls) == 2
+
+    def test_set_model_drops_previous_model_state(self, temp_dir, monkeypatch):
+        """Test that switching models stops the workers and never reuses the old model's vectors."""
+        calls = []
+        service = self._service(temp_dir, monkeypatch, calls)
+
+        class _Pool:
+            closed = False
+
+            def embed(self, texts):
+                return [[9.0, 9.0] for _ in texts]
+
+            def close(self):
+                self.closed = True
+
+        pool = service._pool = _Pool()
+        service.num_workers = 2
+        assert service.embed(["alpha"]) == [[9.0, 9.0]]
+
+        other = temp_dir / "other.gguf"
+        other.write_bytes(b"other weights")
+        service.set_model(str(other))
+        service.num_workers = 0
+
+        assert pool.closed and service._pool is None
+        assert service.embed(["alpha"]) == [[5.0, 1.0]]
+        assert calls == [["alpha"]]
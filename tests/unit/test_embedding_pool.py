@@ -0,0 +1,93 @@
+"""
+Unit tests for the multi-process embedding worker pool.
+
+Tests cover shared-memory packing of texts and vectors, the worker task
+and in-order gathering of sharded results.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import pytest
+from rag import embedding_pool
+from rag.embedding_pool import EmbeddingWorkerPool, collect_vectors, pack_texts, share_vectors, unpack_texts
+
+
+class _FakeManager:
+    """Embeds a text as [character count, 1.0]; "bad" fails."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_embeddings(self, model_name, texts, max_batch_size=None):
+        self.calls.append(list(texts))
+        return [[] if text == "bad" else [float(len(text)), 1.0] for text in texts]
+
+
+@pytest.mark.unit
+class TestEmbeddingPool:
+    """Test shared-memory dispatch in EmbeddingWorkerPool."""
+
+    def test_pack_and_share_round_trip(self):
+        """Test that texts and vectors survive the shared-memory buffers."""
+        texts = ["hello", "", "naïve café ✓", "x" * 300]
+        buffer, offsets = pack_texts(texts)
+        try:
+            spans = [(int(offsets[i]), int(offsets[i + 1])) for i in range(len(texts))]
+            assert unpack_texts(buffer.buf, spans) == texts
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+        shared = share_vectors([[0.5, 1.5], [], [2.0, -1.0]])
+        assert shared[1:] == (3, 2, [1])
+        assert collect_vectors(shared) == [[0.5, 1.5], [], [2.0, -1.0]]
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shared[0])
+        assert collect_vectors(share_vectors([[], []])) == [[], []]
+
+    def test_embed_gathers_shards_in_order(self, monkeypatch):
+        """Test that texts are dealt across workers by length and returned in input order."""
+        manager = _FakeManager()
+        monkeypatch.setattr(embedding_pool, "_worker_manager", manager)
+        pool = EmbeddingWorkerPool("/fake/embed.gguf", num_workers=3, n_threads=1)
+        pool._executor.shutdown()
+        pool._executor = ThreadPoolExecutor(max_workers=3)
+
+        texts = ["a" * n for n in (7, 1, 4, 2, 9, 3, 5)] + ["bad"]
+        embeddings = pool.embed(texts)
+
+        assert [vector[0] if vector else None for vector in embeddings] == [7, 1, 4, 2, 9, 3, 5, None]
+        assert sorted(len(call) for call in manager.calls) == [2, 3, 3]
+        assert all(call == sorted(call, key=len) for call in manager.calls)
+        assert pool.embed([]) == []
+
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.embed(["late"])
+
+    def test_broken_workers_are_replaced(self, monkeypatch):
+        """Test that a worker failure only fails the call that hit it."""
+
+        class _BrokenExecutor:
+            shut_down = False
+
+            def submit(self, *args):
+                raise BrokenProcessPool("worker failed to start")
+
+            def shutdown(self, wait=True):
+                self.shut_down = True
+
+        monkeypatch.setattr(embedding_pool, "_worker_manager", _FakeManager())
+        pool = EmbeddingWorkerPool("/fake/embed.gguf", num_workers=2, n_threads=1)
+        pool._executor.shutdown()
+        broken = pool._executor = _BrokenExecutor()
+        monkeypatch.setattr(pool, "_new_executor", lambda: ThreadPoolExecutor(max_workers=2))
+
+        with pytest.raises(BrokenProcessPool):
+            pool.embed(["one", "three"])
+
+        assert broken.shut_down and pool.restarts == 1
+        assert pool.embed(["one", "three"]) == [[3.0, 1.0], [5.0, 1.0]]
+        pool.close()
@@ -363,3 +363,77 @@ class TestEpisodicStore:
         assert retrieved is not None, "Episode should persist across connections"
         assert retrieved.situation == "Persistent situation"
         assert retrieved.lesson == "Persistent lesson"
+
+
+@pytest.mark.unit
+class TestEpisodicFullTextIndex:
+    """Test the FTS5 index behind episodic keyword and situation search."""
+
+    def _episode(self, situation, lesson, confidence=0.8):
+        return Episode(
+            project_id="proj",
+            situation=situation,
+            action="Searched the code",
+            outcome="success",
+            lesson=lesson,
+            confidence=confidence
+        )
+
+    def test_index_tracks_writes_and_backfills(self, temp_dir):
+        """Test that existing rows are indexed on open and deletes leave the index."""
+        import sqlite3
+        path = str(temp_dir / "episodic.db")
+        with sqlite3.connect(path) as conn:
+            conn.executescript(EpisodicStore._get_schema(None))
+            conn.execute(
+                "INSERT INTO episodic_memory (id, project_id, situation, action, outcome, lesson, confidence) "
+                "VALUES ('old', 'proj', 'Legacy monorepo build', 'a', 'b', 'Cache the toolchain', 0.9)"
+            )
+
+        store = EpisodicStore(path)
+        assert store.fts_enabled
+        kept = store.store_episode(self._episode("Flaky integration tests", "Retry with fixed seeds"))
+        dropped = store.store_episode(self._episode("Flaky network calls", "Mock remote services"))
+        store.delete_episode(dropped.id)
+
+        assert [e.id for e in store.query_episodes("proj", situation_contains="monorepo")] == ["old"]
+        assert [e.id for e in store.query_episodes("proj", situation_contains="FLAKY")] == [kept.id]
+        assert [e.id for e in store.query_episodes("proj", situation_contains="y i")] == [kept.id]
+
+    def test_reader_ranks_keyword_matches(self, temp_dir):
+        """Test that keyword recall through the index returns only matching episodes."""
+        from rag.episodic_reader import EpisodicReader
+        path = str(temp_dir / "episodic.db")
+        store = EpisodicStore(path)
+        once = store.store_episode(self._episode("Parsing a config file", "Validate schemas early"))
+        twice = store.store_episode(self._episode("Parsing config for parsers", "Parsing errors need line numbers"))
+        store.store_episode(self._episode("Slow deploys", "Cache container layers", confidence=0.9))
+
+        episodes = EpisodicReader(path).get_relevant_episodes("parsing configs", min_confidence=0.5)
+        assert [e["id"] for e in episodes] == [twice.id, once.id]
+
+
+@pytest.mark.unit
+class TestEpisodicBulkWrites:
+    """Test EpisodicStore.store_episodes_bulk."""
+
+    def test_bulk_store_and_upsert(self, temp_dir):
+        """Test that a batch is stored in order and re-storing an id replaces it."""
+        store = EpisodicStore(str(temp_dir / "episodic.db"))
+        episodes = [
+            Episode(project_id="proj", situation=f"Build step {i} failed", action="Read the log",
+                    outcome="success", lesson=f"Check toolchain version {i} first", confidence=0.7)
+            for i in range(3)
+        ]
+        stored = store.store_episodes_bulk(episodes)
+        assert [e.id for e in stored] == [e.id for e in episodes]
+
+        episodes[1].lesson = "Pin compiler versions"
+        episodes[1].confidence = 0.9
+        store.store_episodes_bulk([episodes[1]])
+        assert store.get_episode(episodes[1].id).lesson == "Pin compiler versions"
+        assert store.get_stats()["total_episodes"] == 3
+        assert [e.id for e in store.query_episodes("proj", situation_contains="step 1")] == [episodes[1].id]
+
+        with pytest.raises(ValueError):
+            store.store_episodes_bulk([Episode(project_id="proj", situation="x", action="", outcome="", lesson="")])
@@ -312,3 +312,116 @@ class TestMemoryStore:
         assert results[0].scope == "user"
         assert results[0].category == "preference"
         assert results[0].confidence >= 0.8
+
+
+@pytest.mark.unit
+class TestMemorySearch:
+    """Test MemoryStore.search_memory over the FTS5 index."""
+
+    def _fact(self, scope, key, value, confidence):
+        return MemoryFact(scope=scope, category="fact", key=key, value=value, confidence=confidence, source="user")
+
+    def test_search_ranks_scoped_matches(self, temp_dir):
+        """Test that keys and values are searched within a scope, ranked by relevance and confidence."""
+        store = MemoryStore(str(temp_dir / "memory.db"))
+        assert store.fts_enabled
+        store.store_memory(self._fact("proj", "db_engine", "Postgres database", 0.5))
+        store.store_memory(self._fact("proj", "cache", "Redis in front of the database", 0.9))
+        store.store_memory(self._fact("proj", "database_url", "postgres://localhost", 0.3))
+        store.store_memory(self._fact("other", "database", "SQLite", 1.0))
+        store.store_memory(self._fact("proj", "output_format", "json", 1.0))
+
+        keys = [f.key for f in store.search_memory("DATABASE", scope="proj")]
+        assert keys[0] == "cache" and sorted(keys) == ["cache", "database_url", "db_engine"]
+        assert [f.key for f in store.search_memory("database", scope="proj", limit=1)] == ["cache"]
+        assert [f.key for f in store.search_memory("database")][0] == "database"
+
+    def test_short_and_wildcard_queries_use_like(self, temp_dir):
+        """Test that queries the index cannot answer fall back to LIKE patterns."""
+        store = MemoryStore(str(temp_dir / "memory.db"))
+        store.store_memory(self._fact("proj", "db_engine", "Postgres", 0.5))
+        store.store_memory(self._fact("proj", "dbname", "main", 0.8))
+
+        assert [f.key for f in store.search_memory("db", scope="proj")] == ["dbname", "db_engine"]
+        assert [f.key for f in store.search_memory("db_%", scope="proj")] == ["dbname", "db_engine"]
+        assert [f.key for f in store.search_memory("%engine", scope="proj")] == ["db_engine"]
+
+
+@pytest.mark.unit
+class TestMemoryBulkWrites:
+    """Test MemoryStore.store_memories_bulk."""
+
+    def test_bulk_upsert_keeps_highest_confidence(self, temp_dir):
+        """Test that a batch upserts by (scope, key) with store_memory's conflict rule."""
+        store = MemoryStore(str(temp_dir / "memory.db"))
+        existing = store.store_memory(MemoryFact(scope="proj", key="language", value="python", confidence=0.6))
+
+        stored = store.store_memories_bulk([
+            MemoryFact(scope="proj", key="language", value="rust", confidence=0.9),
+            MemoryFact(scope="proj", key="editor", value="vim", confidence=0.8),
+            MemoryFact(scope="proj", key="editor", value="emacs", confidence=0.5),
+            MemoryFact(scope="other", key="language", value="go", confidence=0.4)
+        ])
+
+        assert [f.to_dict()["value"] for f in stored] == ["rust", "vim", "vim", "go"]
+        assert stored[0].id == existing.id
+        assert stored[1].id == stored[2].id
+        assert store.get_stats()["total_facts"] == 3
+
+    def test_bulk_rejects_invalid_batch(self, temp_dir):
+        """Test that one invalid fact stores nothing."""
+        store = MemoryStore(str(temp_dir / "memory.db"))
+        with pytest.raises(ValueError):
+            store.store_memories_bulk([
+                MemoryFact(scope="proj", key="ok", value=1),
+                MemoryFact(scope="bad scope!", key="broken", value=2)
+            ])
+        assert store.get_stats()["total_facts"] == 0
+        assert store.store_memories_bulk([]) == []
+
+
+@pytest.mark.unit
+class TestMemoryFactCache:
+    """Test the read-through fact cache behind query_memory."""
+
+    def test_cache_hits_until_scope_changes(self, temp_dir, monkeypatch):
+        """Test that repeated queries skip SQLite and writes invalidate only their scope."""
+        path = str(temp_dir / "memory.db")
+        store = MemoryStore(path)
+        other_store = MemoryStore(path)
+        fact = store.store_memory(MemoryFact(scope="proj", category="preference", key="style", value="terse", confidence=0.9))
+        store.store_memory(MemoryFact(scope="other", key="tool", value="make", confidence=0.8))
+
+        queries = []
+        query_facts = store._query_facts
+        monkeypatch.setattr(store, "_query_facts", lambda **kwargs: queries.append(kwargs) or query_facts(**kwargs))
+
+        assert [f.key for f in store.query_memory(scope="proj", min_confidence=0.5)] == ["style"]
+        assert [f.key for f in store.query_memory(scope="proj", min_confidence=0.5, category="preference")] == ["style"]
+        assert store.query_memory(scope="proj", min_confidence=0.5, category="decision") == []
+        store.query_memory(scope="other", min_confidence=0.5)
+        assert len(queries) == 2
+
+        # A write through another store on the same database invalidates "proj" only
+        other_store.store_memory(MemoryFact(scope="proj", key="lang", value="python", confidence=0.7))
+        assert [f.key for f in store.query_memory(scope="proj", min_confidence=0.5)] == ["style", "lang"]
+        store.query_memory(scope="other", min_confidence=0.5)
+        assert len(queries) == 3
+
+        store.update_memory(MemoryFact(id=fact.id, scope="proj", category="preference", key="style", value="verbose", confidence=0.9))
+        assert store.query_memory(scope="proj", min_confidence=0.5)[0].to_dict()["value"] == "verbose"
+        assert store.get_stats()["fact_cache"]["hits"] == 3
+
+    def test_commits_by_other_connections_invalidate(self, temp_dir):
+        """Test that writes outside the store's pool are noticed through data_version."""
+        import sqlite3
+        path = str(temp_dir / "memory.db")
+        store = MemoryStore(path)
+        assert store.query_memory(scope="proj") == []
+
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "INSERT INTO memory_facts (id, scope, category, key, value, confidence, source) "
+                "VALUES ('x', 'proj', 'fact', 'external', 'yes', 1.0, 'tool')"
+            )
+        assert [f.key for f in store.query_memory(scope="proj")] == ["external"]
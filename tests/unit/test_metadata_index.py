@@ -0,0 +1,100 @@
+"""
+Unit tests for MetadataIndex.
+
+Tests cover posting-list filtering, IN semantics, row drops and the
+VectorStore filtered search path.
+"""
+
+import numpy as np
+import pytest
+from rag.metadata_index import MetadataIndex
+from rag.vectorstore import VectorStore
+
+
+def _brute_force(metadatas, filters):
+    return [
+        i for i, metadata in enumerate(metadatas)
+        if all(
+            key in metadata and (
+                metadata[key] in value if isinstance(value, (list, tuple)) else metadata[key] == value
+            )
+            for key, value in filters.items()
+        )
+    ]
+
+
+@pytest.mark.unit
+class TestMetadataIndex:
+    """Test MetadataIndex posting lists."""
+
+    def _metadatas(self, count):
+        return [
+            {"type": ["code", "doc", "note"][i % 3], "source": f"file_{i % 5}.py", **({"project_id": "p1"} if i % 2 else {})}
+            for i in range(count)
+        ]
+
+    @pytest.mark.parametrize("filters", [
+        {"type": "code"},
+        {"type": ["code", "note"]},
+        {"type": "doc", "project_id": "p1"},
+        {"source": ("file_1.py", "file_2.py"), "type": "note"},
+        {"type": "missing"},
+    ])
+    def test_matches_brute_force(self, filters):
+        """Test that posting lists return the rows a per-row check would."""
+        metadatas = self._metadatas(50)
+        index = MetadataIndex()
+        index.add(metadatas)
+
+        rows, residual = index.match(filters, lambda i: metadatas[i], len(metadatas))
+
+        assert residual == {}
+        assert rows.tolist() == _brute_force(metadatas, filters)
+
+    def test_tracks_appends_and_drops(self):
+        """Test that a built column stays aligned after appends and drops."""
+        metadatas = self._metadatas(30)
+        index = MetadataIndex()
+        index.add(metadatas)
+        index.match({"type": "code"}, lambda i: metadatas[i], len(metadatas))
+
+        extra = [{"type": "code", "source": "new.py"}, {"type": "fresh"}]
+        metadatas += extra
+        index.add(extra)
+        keep = np.array([i % 4 != 0 for i in range(len(metadatas))])
+        metadatas = [m for m, kept in zip(metadatas, keep) if kept]
+        index.keep(keep)
+
+        for filters in ({"type": "code"}, {"type": "fresh"}, {"source": "new.py"}):
+            rows, _ = index.match(filters, lambda i: metadatas[i], len(metadatas))
+            assert rows.tolist() == _brute_force(metadatas, filters)
+
+    def test_unhashable_filters_are_residual(self):
+        """Test that filters the index cannot evaluate are handed back."""
+        metadatas = [{"tags": ["a"], "type": "code"}]
+        index = MetadataIndex()
+        index.add(metadatas)
+
+        rows, residual = index.match({"tags": [["a"]], "type": "code"}, lambda i: metadatas[i], 1)
+
+        assert rows.tolist() == [0]
+        assert residual == {"tags": [["a"]]}
+
+
+@pytest.mark.unit
+class TestVectorStoreFilteredSearch:
+    """Test that VectorStore filters through the metadata index."""
+
+    def test_filtered_search(self, temp_dir):
+        """Test equality filters on VectorStore keep their semantics."""
+        store = VectorStore(index_path=str(temp_dir / "rag_index"))
+        store.add(
+            ["a", "b", "c"],
+            [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]],
+            [{"type": "code"}, {"type": "doc"}, {"type": "code"}]
+        )
+
+        results = store.search([1.0, 0.0], top_k=3, metadata_filters={"type": "code"})
+
+        assert [doc for doc, _, _ in results] == ["a", "c"]
+        assert store.search([1.0, 0.0], metadata_filters={"type": "other"}) == []
@@ -5,7 +5,7 @@ Tests cover model registration, loading, unloading, caching, and external models
 """
 
 import pytest
-from rag.model_manager import ModelManager, ModelConfig, get_model_manager
+from rag.model_manager import LoadedModel, ModelManager, ModelConfig, get_model_manager
 
 
 @pytest.mark.unit
@@ -203,3 +203,64 @@ class TestModelManager:
         # Test that manager has max_loaded_models setting
         # (implementation dependent)
         assert hasattr(manager, "max_loaded_models"), "Manager should have max_loaded_models setting"
+
+
+class _FakeEmbeddingModel:
+    """Stands in for a llama-cpp embedding model; embeds a text as [length, 1.0]."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def tokenize(self, data):
+        raise AssertionError("texts must only be tokenized inside embed()")
+
+    def embed(self, inputs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        self.calls.append(batch)
+        if self.fail_on in batch:
+            raise RuntimeError("bad input")
+        vectors = [[float(len(text)), 1.0] for text in batch]
+        return vectors if isinstance(inputs, list) else vectors[0]
+
+
+@pytest.mark.unit
+class TestBatchedEmbeddings:
+    """Test token-budgeted batching in ModelManager.generate_embeddings."""
+
+    def _manager(self, monkeypatch, model, n_batch=10):
+        monkeypatch.setattr("rag.model_manager.LLAMA_CPP_AVAILABLE", True)
+        manager = ModelManager(config_path="/nonexistent/models_config.json")
+        config = ModelConfig(path="/fake/embed.gguf", model_type="embedding", n_batch=n_batch, embedding=True)
+        manager.register_model("embed", config)
+        manager._loaded["embed"] = LoadedModel(model=model, config=config)
+        return manager
+
+    def test_batches_by_token_budget(self, monkeypatch):
+        """Test that texts are grouped by length within n_batch and returned in order."""
+        model = _FakeEmbeddingModel()
+        manager = self._manager(monkeypatch, model)
+        # Estimated at ~4 characters per token: n tokens each
+        texts = ["w" * (4 * n - 1) for n in (6, 1, 3, 2, 5, 12, 1)]
+
+        embeddings = manager.generate_embeddings("embed", texts)
+
+        assert [vector[0] for vector in embeddings] == [len(text) for text in texts]
+        batches = [[(len(text) + 1) // 4 for text in call] for call in model.calls]
+        assert batches == [[1, 1, 2, 3], [5], [6], [12]]
+
+        stats = manager.get_embedding_throughput()
+        assert stats["batches"] == 4 and stats["texts"] == 7
+        assert stats["tokens"] == 28  # the 12-word text is truncated to n_batch
+
+    def test_max_batch_size_and_failures(self, monkeypatch):
+        """Test the per-call text cap and that a failing batch only blanks the bad text."""
+        model = _FakeEmbeddingModel(fail_on="bad")
+        manager = self._manager(monkeypatch, model, n_batch=100)
+
+        embeddings = manager.generate_embeddings("embed", ["a", "bad", "b c", "d"], max_batch_size=2)
+
+        assert embeddings[1] == []
+        assert [embeddings[i][0] for i in (0, 2, 3)] == [1, 3, 1]
+        assert [len(call) for call in model.calls] == [2, 1, 1, 2]
+        assert ModelManager._embedding_batches([3, 1, 2], 4, max_batch_size=1) == [[1], [2], [0]]
@@ -0,0 +1,124 @@
+"""
+Unit tests for int8 embedding quantization.
+
+Tests cover quantization accuracy, asymmetric scoring, float row
+mapping and the VectorStore int8 storage mode (including multi-query search).
+"""
+
+import numpy as np
+import pytest
+from rag.quantization import MappedRows, dequantize_int8, int8_scores, quantize_int8
+from rag.vectorstore import VectorStore
+
+
+def _unit_vectors(count, dim, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.unit
+class TestInt8Quantization:
+    """Test quantize_int8, int8_scores and MappedRows."""
+
+    def test_round_trip_error_is_small(self):
+        """Test that dequantized vectors stay within half a quantization step."""
+        vectors = _unit_vectors(200, 64)
+        codes, scales = quantize_int8(vectors)
+
+        assert codes.dtype == np.int8 and scales.dtype == np.float32
+        error = np.abs(dequantize_int8(codes, scales) - vectors)
+        assert np.all(error <= scales[:, None] / 2 + 1e-6)
+
+    def test_normalize_and_zero_rows(self):
+        """Test that normalize scales rows to unit length and zero rows stay zero."""
+        vectors = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+        codes, scales = quantize_int8(vectors, normalize=True)
+
+        assert dequantize_int8(codes, scales)[0] == pytest.approx([0.6, 0.8], abs=0.01)
+        assert not codes[1].any()
+
+    def test_scores_preserve_ranking(self):
+        """Test that asymmetric scores approximate float dot products."""
+        vectors = _unit_vectors(500, 64)
+        query = vectors[7]
+        codes, scales = quantize_int8(vectors)
+
+        scores = int8_scores(codes, scales, query)
+        assert np.abs(scores - vectors @ query).max() < 0.02
+        assert int(np.argmax(scores)) == 7
+
+        rows = np.array([3, 7, 11])
+        assert int8_scores(codes, scales, query, rows) == pytest.approx(scores[rows])
+
+    def test_mapped_rows_gather_and_keep(self):
+        """Test that rows resolve to their blocks across appends and drops."""
+        first, second = _unit_vectors(4, 8, seed=1), _unit_vectors(3, 8, seed=2)
+        mapped = MappedRows()
+        mapped.append(mapped.add_block(first), np.array([0, 2, 3]))
+        mapped.append(mapped.add_block(second), np.arange(3))
+
+        assert np.array_equal(mapped.gather(np.array([1, 3])), np.stack([first[2], second[0]]))
+
+        mapped.keep(np.array([True, False, True, True, False, True]))
+        assert len(mapped) == 4
+        assert np.array_equal(mapped.gather(), np.stack([first[0], first[3], second[0], second[2]]))
+
+
+@pytest.mark.unit
+class TestVectorStoreInt8:
+    """Test the int8 storage mode of VectorStore."""
+
+    def _stores(self, temp_dir):
+        vectors = _unit_vectors(100, 32, seed=3) * 2.5
+        docs = [f"doc {i}" for i in range(100)]
+        metadata = [{"type": "code" if i % 2 else "doc"} for i in range(100)]
+
+        float_store = VectorStore(index_path=str(temp_dir / "float_index"))
+        int8_store = VectorStore(index_path=str(temp_dir / "int8_index"), storage_mode="int8")
+        for store in (float_store, int8_store):
+            store.add(docs, vectors.tolist(), metadata)
+        return float_store, int8_store, vectors
+
+    def test_matches_float_search(self, temp_dir):
+        """Test that re-ranked int8 search returns the float ranking and scores."""
+        float_store, int8_store, vectors = self._stores(temp_dir)
+        query = vectors[10].tolist()
+
+        expected = float_store.search(query, top_k=5)
+        results = int8_store.search(query, top_k=5)
+        assert [doc for doc, _, _ in results] == [doc for doc, _, _ in expected]
+        assert [score for _, score, _ in results] == pytest.approx([score for _, score, _ in expected], abs=1e-5)
+
+        filtered = int8_store.search(query, top_k=5, metadata_filters={"type": "code"})
+        assert all(meta["type"] == "code" for _, _, meta in filtered)
+        assert int8_store.get_stats() == float_store.get_stats()
+        assert int8_store._matrix.size == 0
+
+    def test_search_many_matches_search(self, temp_dir):
+        """Test that multi-query search returns one search() result per query, in both modes."""
+        float_store, int8_store, vectors = self._stores(temp_dir)
+        queries = [vectors[i].tolist() for i in (2, 30, 71)]
+
+        for store in (float_store, int8_store):
+            batched = store.search_many(queries + [[1.0]], top_k=4, metadata_filters={"type": "doc"})
+            assert batched[3] == []
+            for query, results in zip(queries, batched):
+                expected = store.search(query, top_k=4, metadata_filters={"type": "doc"})
+                assert [doc for doc, _, _ in results] == [doc for doc, _, _ in expected]
+                assert [score for _, score, _ in results] == pytest.approx([score for _, score, _ in expected])
+
+    def test_save_and_reload(self, temp_dir):
+        """Test that saved int8 stores reload with memory-mapped float vectors."""
+        _, int8_store, vectors = self._stores(temp_dir)
+        int8_store.save()
+        int8_store.add(["late"], [vectors[0].tolist()], [{"type": "doc"}])
+        int8_store.save()
+
+        reloaded = VectorStore(index_path=int8_store.index_path, storage_mode="int8")
+        assert reloaded.get_stats()["total_vectors"] == 101
+        assert isinstance(reloaded._float_rows._blocks[0], np.memmap)
+        top = reloaded.search(vectors[0].tolist(), top_k=2)
+        assert sorted(doc for doc, _, _ in top) == ["doc 0", "late"]
+
+        reloaded.clear()
+        assert reloaded.search(vectors[0].tolist()) == []
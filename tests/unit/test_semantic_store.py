@@ -238,3 +238,680 @@ class TestSemanticStore:
         # Results should be filtered by minimum score
         # (implementation dependent - this is a basic test)
         assert isinstance(results, list), "Results should be a list"
+
+
+@pytest.fixture
+def indexed_store(temp_dir, monkeypatch):
+    """SemanticStore with deterministic 16-dim embeddings per chunk."""
+    import numpy as np
+    import rag.semantic_store as semantic_store_module
+
+    rng = np.random.default_rng(7)
+    monkeypatch.setattr(
+        semantic_store_module,
+        "_generate_embeddings",
+        lambda texts, embedding_service=None: [rng.normal(size=16).tolist() for _ in texts]
+    )
+
+    store = SemanticStore(index_path=str(temp_dir / "semantic_index"), background_compaction=False)
+    for i in range(20):
+        store.add_document(
+            f"Document {i} body",
+            {"source": f"docs/file_{i}.md", "type": "code" if i % 2 else "doc"}
+        )
+    return store
+
+
+@pytest.mark.unit
+class TestSemanticStoreVectorSearch:
+    """Test the vectorized search path against brute-force cosine similarity."""
+
+    def _brute_force(self, store, query, top_k):
+        scored = [(store._cosine_similarity(query, c.embedding), c.chunk_id) for c in store.chunks]
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored[:top_k]
+
+    def test_matches_brute_force(self, indexed_store):
+        """Test that matrix search returns the same ranking as per-chunk cosine."""
+        query = indexed_store.chunks[3].embedding
+        results = indexed_store.search(query, top_k=5)
+        expected = self._brute_force(indexed_store, query, 5)
+
+        assert [r["chunk_id"] for r in results] == [cid for _, cid in expected]
+        for result, (score, _) in zip(results, expected):
+            assert result["score"] == pytest.approx(score, abs=1e-5)
+        assert set(results[0]) == {
+            "chunk_id", "document_id", "content", "score",
+            "metadata", "chunk_index", "citation"
+        }
+
+    def test_metadata_filter_and_min_score(self, indexed_store):
+        """Test that filters and min_score apply to the vectorized path."""
+        query = indexed_store.chunks[0].embedding
+        results = indexed_store.search(query, top_k=20, metadata_filters={"type": "code"}, min_score=0.0)
+
+        assert results, "Should find code chunks"
+        assert all(r["metadata"]["type"] == "code" for r in results)
+        assert all(r["score"] >= 0.0 for r in results)
+
+    def test_in_filter_after_delete(self, indexed_store):
+        """Test IN filters resolved on posting lists stay correct after deletes."""
+        query = indexed_store.chunks[2].embedding
+        filters = {"source": ["docs/file_2.md", "docs/file_3.md", "docs/file_4.md"]}
+        indexed_store.search(query, top_k=20, metadata_filters=filters)
+
+        indexed_store.delete_document(indexed_store.chunks[3].document_id)
+        results = indexed_store.search(query, top_k=20, metadata_filters=filters, min_score=-1.0)
+
+        assert sorted(r["metadata"]["source"] for r in results) == ["docs/file_2.md", "docs/file_4.md"]
+        assert results[0]["chunk_id"] == indexed_store.chunks[2].chunk_id
+
+    def test_matrix_tracks_delete_and_reload(self, indexed_store):
+        """Test that the matrix stays aligned after deletes and reloads."""
+        query = indexed_store.chunks[5].embedding
+        deleted_doc = indexed_store.chunks[5].document_id
+
+        assert indexed_store.delete_document(deleted_doc) == 1
+        results = indexed_store.search(query, top_k=3)
+        assert all(r["document_id"] != deleted_doc for r in results)
+
+        reloaded = SemanticStore(index_path=indexed_store.index_path)
+        assert [r["chunk_id"] for r in reloaded.search(query, top_k=3)] == \
+            [r["chunk_id"] for r in results]
+
+    def test_search_many_matches_search(self, indexed_store):
+        """Test that batched multi-query search returns one search() result per query."""
+        queries = [indexed_store.chunks[i].embedding for i in (1, 6, 11)]
+        filters = {"type": "doc"}
+
+        batched = indexed_store.search_many(queries + [[1.0, 2.0]], top_k=4, metadata_filters=filters, min_score=-1.0)
+        assert len(batched) == 4 and batched[3] == []
+        for query, results in zip(queries, batched):
+            expected = indexed_store.search(query, top_k=4, metadata_filters=filters, min_score=-1.0)
+            assert [r["chunk_id"] for r in results] == [r["chunk_id"] for r in expected]
+            assert [r["score"] for r in results] == pytest.approx([r["score"] for r in expected], abs=1e-5)
+
+
+@pytest.mark.unit
+class TestSemanticIndexFormat:
+    """Test the binary, memory-mapped on-disk index format."""
+
+    def test_reload_memory_maps_embeddings(self, indexed_store):
+        """Test that a reloaded store maps embeddings instead of parsing them."""
+        import numpy as np
+
+        indexed_store.compact()
+        reloaded = SemanticStore(index_path=indexed_store.index_path)
+
+        assert isinstance(reloaded._vectors, np.memmap)
+        assert len(reloaded.chunks) == len(indexed_store.chunks)
+        assert reloaded.chunks[0].content == indexed_store.chunks[0].content
+        assert reloaded.chunks[0].metadata == indexed_store.chunks[0].metadata
+
+    def test_migrates_legacy_chunks_json(self, temp_dir):
+        """Test that a legacy chunks.json index is migrated on load."""
+        import json
+        import os
+
+        index_path = temp_dir / "legacy_index"
+        os.makedirs(index_path)
+        legacy = [
+            DocumentChunk(
+                document_id="doc_a",
+                content="legacy chunk",
+                embedding=[1.0, 0.0, 0.0],
+                metadata={"source": "a.md"}
+            ).to_dict()
+        ]
+        with open(index_path / "chunks.json", "w") as f:
+            json.dump(legacy, f)
+
+        store = SemanticStore(index_path=str(index_path))
+
+        assert not (index_path / "chunks.json").exists()
+        assert (index_path / "chunks.json.bak").exists()
+        assert store._manifest["base"] is not None
+
+        reloaded = SemanticStore(index_path=str(index_path))
+        results = reloaded.search([1.0, 0.0, 0.0], top_k=1)
+        assert results[0]["content"] == "legacy chunk"
+        assert results[0]["score"] == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+class TestSemanticSegmentLog:
+    """Test append-only segment persistence, tombstones and compaction."""
+
+    def _make_store(self, temp_dir, monkeypatch, **kwargs):
+        import rag.semantic_store as semantic_store_module
+
+        monkeypatch.setattr(semantic_store_module, "_generate_embeddings", lambda texts, embedding_service=None: [[1.0, 0.5, 0.25] for _ in texts])
+        return SemanticStore(index_path=str(temp_dir / "segment_index"), **kwargs)
+
+    def test_add_appends_segment_without_rewriting(self, temp_dir, monkeypatch):
+        """Test that each add writes one new segment and leaves earlier ones untouched."""
+        import os
+
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=100)
+        store.add_document("first", {"source": "a.md"})
+        first_segment = os.path.join(store.index_path, "segments", store._manifest["segments"][0])
+        first_mtime = os.path.getmtime(os.path.join(first_segment, "chunk_rows.bin"))
+
+        store.add_document("second", {"source": "b.md"})
+
+        assert len(store._manifest["segments"]) == 2
+        assert store._manifest["base"] is None
+        assert os.path.getmtime(os.path.join(first_segment, "chunk_rows.bin")) == first_mtime
+
+    def test_replay_applies_tombstones(self, temp_dir, monkeypatch):
+        """Test that a restarted store replays segments and hides deleted documents."""
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=100)
+        store.add_document("keep me", {"source": "keep.md"})
+        store.add_document("delete me", {"source": "gone.md"})
+        deleted_id = store._generate_document_id("gone.md")
+
+        assert store.delete_document(deleted_id) == 1
+        # Re-adding after a delete must survive replay
+        store.add_document("back again", {"source": "gone.md"})
+
+        reloaded = SemanticStore(index_path=store.index_path, compaction_threshold=100)
+        contents = sorted(chunk.content for chunk in reloaded.chunks)
+
+        assert contents == ["back again", "keep me"]
+        assert reloaded.document_ids == store.document_ids
+
+    def test_compaction_merges_segments(self, temp_dir, monkeypatch):
+        """Test that reaching the threshold merges segments into a new base."""
+        import os
+
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=3, background_compaction=False)
+        for i in range(3):
+            store.add_document(f"doc {i}", {"source": f"{i}.md"})
+
+        assert store._manifest["base"] is not None
+        assert store._manifest["segments"] == []
+        assert os.listdir(os.path.join(store.index_path, "segments")) == [store._manifest["base"]]
+
+        reloaded = SemanticStore(index_path=store.index_path)
+        assert sorted(c.content for c in reloaded.chunks) == ["doc 0", "doc 1", "doc 2"]
+
+    def test_background_compaction(self, temp_dir, monkeypatch):
+        """Test that background compaction keeps writes made while it runs."""
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=2)
+        for i in range(5):
+            store.add_document(f"doc {i}", {"source": f"{i}.md"})
+        store.wait_for_compaction()
+
+        reloaded = SemanticStore(index_path=store.index_path)
+        assert sorted(c.content for c in reloaded.chunks) == [f"doc {i}" for i in range(5)]
+
+    def test_bulk_ingest_writes_near_linear_bytes(self, temp_dir, monkeypatch):
+        """Test that many adds merge similar-size segments instead of rewriting the base each time."""
+        import os
+        import rag.semantic_store as semantic_store_module
+
+        written = []
+        write_segment = semantic_store_module.write_segment
+
+        def counting_write_segment(directory, *args, **kwargs):
+            manifest = write_segment(directory, *args, **kwargs)
+            written.append(sum(entry.stat().st_size for entry in os.scandir(directory)))
+            return manifest
+
+        monkeypatch.setattr(semantic_store_module, "write_segment", counting_write_segment)
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=4, background_compaction=False)
+        for i in range(300):
+            store.add_document(f"doc {i}", {"source": f"{i}.md"})
+
+        # Rewriting the base at every threshold would write ~20x the appended bytes here
+        appended = 300 * written[0]
+        assert sum(written) < 8 * appended
+        assert len(store._manifest["segments"]) < 12
+
+        reloaded = SemanticStore(index_path=store.index_path, compaction_threshold=100)
+        assert sorted(c.content for c in reloaded.chunks) == sorted(f"doc {i}" for i in range(300))
+
+    def test_segment_merges_apply_tombstones(self, temp_dir, monkeypatch):
+        """Test that merged segments keep deleted documents hidden after a restart."""
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=4, background_compaction=False)
+        for i in range(40):
+            store.add_document(f"doc {i}", {"source": f"{i}.md"})
+        store.delete_document(store._generate_document_id("3.md"))
+        store.add_document("doc 3 again", {"source": "3.md"})
+        for i in range(40, 80):
+            store.add_document(f"doc {i}", {"source": f"{i}.md"})
+            if i % 10 == 0:
+                store.delete_document(store._generate_document_id(f"{i - 5}.md"))
+
+        reloaded = SemanticStore(index_path=store.index_path, compaction_threshold=100)
+        assert sorted(c.content for c in reloaded.chunks) == sorted(c.content for c in store.chunks)
+        assert "doc 3" not in {c.content for c in reloaded.chunks}
+
+    def test_unreferenced_segments_removed_on_load(self, temp_dir, monkeypatch):
+        """Test that segments written but never committed to the manifest are ignored."""
+        import os
+
+        store = self._make_store(temp_dir, monkeypatch, compaction_threshold=100)
+        store.add_document("committed", {"source": "a.md"})
+        orphan = os.path.join(store.index_path, "segments", "seg-99999999")
+        os.makedirs(orphan)
+
+        reloaded = SemanticStore(index_path=store.index_path)
+
+        assert [c.content for c in reloaded.chunks] == ["committed"]
+        assert not os.path.exists(orphan)
+
+
+@pytest.mark.unit
+class TestSemanticANNIndex:
+    """Test the optional IVF index of the legacy semantic store."""
+
+    ANN_CONFIG = {"ann_index": "ivf", "ivf_n_lists": 4, "ivf_nprobe": 1, "ivf_min_train_size": 10}
+
+    def _make_store(self, temp_dir, monkeypatch):
+        import numpy as np
+        import rag.semantic_store as semantic_store_module
+
+        rng = np.random.default_rng(11)
+        monkeypatch.setattr(
+            semantic_store_module, "_generate_embeddings", lambda texts, embedding_service=None: [rng.normal(size=16).tolist() for _ in texts]
+        )
+        store = SemanticStore(
+            index_path=str(temp_dir / "ann_index"),
+            compaction_threshold=100,
+            background_compaction=False,
+            ann_config=self.ANN_CONFIG
+        )
+        for i in range(30):
+            store.add_document(f"Document {i}", {"source": f"docs/{i}.md", "type": "code" if i % 2 else "doc"})
+        return store
+
+    def test_untrained_index_uses_flat_search(self, temp_dir, monkeypatch):
+        """Test that search is exact until compaction trains the index."""
+        store = self._make_store(temp_dir, monkeypatch)
+        query = store.chunks[4].embedding
+
+        assert not store._ann.is_trained
+        assert store.search(query, top_k=5) == store.search(query, top_k=5, exact=True)
+
+    def test_full_probe_matches_exact_search(self, temp_dir, monkeypatch):
+        """Test that probing every list returns the flat-scan results."""
+        store = self._make_store(temp_dir, monkeypatch)
+        store.compact()
+        query = store.chunks[4].embedding
+
+        assert store._ann.is_trained
+        exact = store.search(query, top_k=5, exact=True)
+        probed = store.search(query, top_k=5, nprobe=4)
+        assert [r["chunk_id"] for r in probed] == [r["chunk_id"] for r in exact]
+        assert [r["score"] for r in probed] == pytest.approx([r["score"] for r in exact], abs=1e-5)
+
+        approx = store.search(query, top_k=5, metadata_filters={"type": "doc"})
+        assert approx[0]["chunk_id"] == store.chunks[4].chunk_id
+        assert all(r["metadata"]["type"] == "doc" for r in approx)
+
+        queries = [store.chunks[i].embedding for i in (4, 9)]
+        for query, results in zip(queries, store.search_many(queries, top_k=5)):
+            expected = store.search(query, top_k=5)
+            assert [r["chunk_id"] for r in results] == [r["chunk_id"] for r in expected]
+
+    def test_selective_filter_scans_rows_outside_probed_lists(self, temp_dir, monkeypatch):
+        """Test that a filter matching fewer rows than the probed lists is searched exactly."""
+        import numpy as np
+
+        store = self._make_store(temp_dir, monkeypatch)
+        store.compact()
+        query = store.chunks[4].embedding
+        probed = store._ann.probe(np.asarray(query, dtype=np.float32) / np.linalg.norm(query), 1)
+        outside = next(row for row in range(len(store.chunks)) if row not in set(probed.tolist()))
+        source = store.chunks[outside].metadata["source"]
+
+        results = store.search(query, top_k=3, nprobe=1, metadata_filters={"source": source}, min_score=-1.0)
+
+        assert [r["chunk_id"] for r in results] == [store.chunks[outside].chunk_id]
+
+    def test_index_persists_and_tracks_changes(self, temp_dir, monkeypatch):
+        """Test that centroids reload from the base segment and new rows get assigned."""
+        import numpy as np
+
+        store = self._make_store(temp_dir, monkeypatch)
+        store.compact()
+        store.delete_document(store.chunks[0].document_id)
+        store.add_document("Late document", {"source": "docs/late.md"})
+
+        reloaded = SemanticStore(index_path=store.index_path, ann_config=self.ANN_CONFIG)
+
+        assert np.allclose(reloaded._ann.centroids, store._ann.centroids)
+        assert np.array_equal(reloaded._ann.assignments, store._ann.assignments)
+        assert len(reloaded._ann) == len(reloaded.chunks) == 30
+        query = reloaded.chunks[-1].embedding
+        assert reloaded.search(query, top_k=1)[0]["content"] == "Late document"
+
+    def test_search_concurrent_with_writes(self, temp_dir, monkeypatch):
+        """Test that searches racing deletes and adds score and return matching rows."""
+        import threading
+        import zlib
+        import numpy as np
+        import rag.semantic_store as semantic_store_module
+
+        def embed(text):
+            vector = np.random.default_rng(zlib.crc32(text.encode())).normal(size=16)
+            return vector / np.linalg.norm(vector)
+
+        monkeypatch.setattr(
+            semantic_store_module, "_generate_embeddings", lambda texts, embedding_service=None: [embed(t).tolist() for t in texts]
+        )
+        store = SemanticStore(
+            index_path=str(temp_dir / "concurrent_index"),
+            background_compaction=False,
+            ann_config=self.ANN_CONFIG
+        )
+        for i in range(60):
+            store.add_document(f"Document {i}", {"source": f"docs/{i}.md"})
+        store.compact()
+        assert store._ann.is_trained
+
+        errors = []
+        done = threading.Event()
+
+        def write():
+            try:
+                for round_ in range(40):
+                    i = round_ % 20
+                    store.delete_document(store._generate_document_id(f"docs/{i}.md"))
+                    store.add_document(f"Document {i}", {"source": f"docs/{i}.md"})
+            except Exception as e:
+                errors.append(e)
+            finally:
+                done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            queries = [embed(f"Document {i}") for i in range(0, 60, 7)]
+            for query, results in zip(queries, store.search_many(queries, top_k=3, nprobe=2)):
+                for result in results:
+                    assert result["score"] == pytest.approx(float(embed(result["content"]) @ query), abs=1e-4)
+        writer.join()
+
+        assert errors == []
+        assert len(store.chunks) == 60
+
+
+@pytest.mark.unit
+class TestSemanticInt8Storage:
+    """Test the int8 storage mode of the legacy semantic store."""
+
+    def _make_store(self, temp_dir, monkeypatch, storage_mode="int8", name="int8_index"):
+        import numpy as np
+        import rag.semantic_store as semantic_store_module
+
+        rng = np.random.default_rng(5)
+        monkeypatch.setattr(
+            semantic_store_module, "_generate_embeddings", lambda texts, embedding_service=None: [rng.normal(size=32).tolist() for _ in texts]
+        )
+        store = SemanticStore(
+            index_path=str(temp_dir / name),
+            compaction_threshold=100,
+            background_compaction=False,
+            storage_mode=storage_mode
+        )
+        for i in range(20):
+            store.add_document(f"Document {i}", {"source": f"docs/{i}.md", "type": "code" if i % 2 else "doc"})
+        return store
+
+    def test_matches_float_ranking(self, temp_dir, monkeypatch):
+        """Test that int8 codes with float re-ranking reproduce float search."""
+        import numpy as np
+
+        store = self._make_store(temp_dir, monkeypatch)
+        float_store = SemanticStore(index_path=store.index_path)
+
+        assert store._vectors.dtype == np.int8
+        assert store.get_stats()["storage_mode"] == "int8"
+        for i in (0, 7, 13):
+            query = store.chunks[i].embedding
+            results = store.search(query, top_k=5, min_score=-1.0)
+            expected = float_store.search(query, top_k=5, min_score=-1.0)
+            assert [r["chunk_id"] for r in results] == [r["chunk_id"] for r in expected]
+            assert [r["score"] for r in results] == pytest.approx([r["score"] for r in expected], abs=1e-5)
+
+        queries = [store.chunks[i].embedding for i in (0, 7, 13)]
+        batched = store.search_many(queries, top_k=5, min_score=-1.0)
+        assert batched == [store.search(query, top_k=5, min_score=-1.0) for query in queries]
+
+    def test_delete_compact_and_reload(self, temp_dir, monkeypatch):
+        """Test that codes, scales and float rows stay aligned through the segment log."""
+        import numpy as np
+
+        store = self._make_store(temp_dir, monkeypatch)
+        deleted = store.chunks[3].document_id
+        store.delete_document(deleted)
+        query = store.chunks[8].embedding
+        before = store.search(query, top_k=5, min_score=-1.0)
+        assert before[0]["chunk_id"] == store.chunks[8].chunk_id
+
+        reloaded = SemanticStore(index_path=store.index_path, storage_mode="int8")
+        assert [r["chunk_id"] for r in reloaded.search(query, top_k=5, min_score=-1.0)] == \
+            [r["chunk_id"] for r in before]
+
+        reloaded.compact()
+        assert len(reloaded._mapped) == len(reloaded.chunks) == 19
+        assert isinstance(reloaded._mapped._blocks[0], np.memmap)
+        assert [r["chunk_id"] for r in reloaded.search(query, top_k=5, min_score=-1.0)] == \
+            [r["chunk_id"] for r in before]
+        assert all(r["document_id"] != deleted for r in reloaded.search(query, top_k=20, min_score=-1.0))
+
+
+@pytest.mark.unit
+class TestSemanticLazyLoad:
+    """Test lazy loading, where chunks are decoded on first access."""
+
+    def _undecoded(self, store):
+        return sum(not isinstance(item, DocumentChunk) for item in store.chunks._items)
+
+    def test_decodes_only_search_hits(self, indexed_store):
+        """Test that a lazy load decodes nothing until rows are returned."""
+        import numpy as np
+
+        indexed_store.compact()
+        query = indexed_store.chunks[6].embedding
+        expected = indexed_store.search(query, top_k=3, metadata_filters={"type": "doc"})
+
+        lazy = SemanticStore(index_path=indexed_store.index_path, lazy_load=True)
+        assert self._undecoded(lazy) == 20
+        assert lazy.get_stats() == indexed_store.get_stats()
+
+        results = lazy.search(query, top_k=3, metadata_filters={"type": "doc"})
+        assert results == expected
+        assert self._undecoded(lazy) == 17
+        assert lazy.chunks[6].chunk_id == expected[0]["chunk_id"]
+        embedding = np.asarray(indexed_store.chunks[6].embedding)
+        assert np.allclose(lazy.chunks[6].embedding, embedding / np.linalg.norm(embedding))
+
+    def test_lookups_deletes_and_compaction(self, indexed_store):
+        """Test that the ID index serves lookups and deletes without decoding every row."""
+        indexed_store.add_document("Appended", {"source": "docs/appended.md", "type": "doc"})
+        chunk_id = indexed_store.chunks[12].chunk_id
+        deleted = indexed_store.chunks[3].document_id
+
+        lazy = SemanticStore(index_path=indexed_store.index_path, lazy_load=True, background_compaction=False)
+        assert lazy.get_chunk_by_id(chunk_id).content == "Document 12 body"
+        assert lazy.delete_document(deleted) == 1
+        assert self._undecoded(lazy) == 19
+        assert {s["path"] for s in lazy.list_sources()} == \
+            {f"docs/file_{i}.md" for i in range(20) if i != 3} | {"docs/appended.md"}
+
+        lazy.compact()
+        assert self._undecoded(lazy) == 19
+        reloaded = SemanticStore(index_path=lazy.index_path)
+        assert sorted(c.content for c in reloaded.chunks) == sorted(c.content for c in lazy.chunks)
+        assert lazy.get_chunk_by_id(chunk_id) is lazy.chunks[11]
+
+    def test_background_warm_up(self, indexed_store):
+        """Test that warm-up builds the source table without decoding chunks."""
+        lazy = SemanticStore(index_path=indexed_store.index_path, lazy_load=True, warm_up=True)
+        lazy.wait_for_warm_up(timeout=10)
+
+        assert lazy._source_stats is not None
+        assert len(lazy.list_sources()) == 20
+        assert self._undecoded(lazy) == 20
+
+
+@pytest.mark.unit
+class TestSemanticLookupIndexes:
+    """Test the chunk, document and source indexes maintained by SemanticStore."""
+
+    def _assert_aligned(self, store):
+        for document_id, rows in store._document_rows.items():
+            assert all(store.chunks[row].document_id == document_id for row in rows)
+        assert sum(len(rows) for rows in store._document_rows.values()) == len(store.chunks)
+        assert all(store.get_chunk_by_id(c.chunk_id) is c for c in store.chunks)
+
+    def test_indexes_track_deletes(self, indexed_store):
+        """Test that deleting a document keeps positions of later documents correct."""
+        removed = indexed_store.chunks[7]
+
+        assert indexed_store.delete_document(removed.document_id) == 1
+        assert indexed_store.get_chunk_by_id(removed.chunk_id) is None
+        self._assert_aligned(indexed_store)
+
+        query = indexed_store.chunks[10].embedding
+        assert indexed_store.search(query, top_k=1)[0]["chunk_id"] == indexed_store.chunks[10].chunk_id
+
+    def test_indexes_rebuilt_on_load(self, indexed_store):
+        """Test that a reloaded store serves lookups without scanning."""
+        chunk_id = indexed_store.chunks[4].chunk_id
+        reloaded = SemanticStore(index_path=indexed_store.index_path)
+
+        assert reloaded.get_chunk_by_id(chunk_id).content == indexed_store.chunks[4].content
+        self._assert_aligned(reloaded)
+
+    def test_list_sources(self, indexed_store):
+        """Test per-source aggregates with and without a type filter."""
+        indexed_store.add_document("Second part", {"source": "docs/file_1.md", "type": "code"})
+        indexed_store.delete_document(indexed_store.chunks[0].document_id)
+
+        sources = {s["path"]: s for s in indexed_store.list_sources()}
+        assert len(sources) == 19
+        assert "docs/file_0.md" not in sources
+        assert sources["docs/file_1.md"]["chunk_count"] == 2
+
+        code_sources = indexed_store.list_sources("code")
+        assert len(code_sources) == 10
+        assert all(s["type"] == "code" for s in code_sources)
+        assert indexed_store.get_stats()["by_type"] == {"doc": 9, "code": 11}
+
+
+@pytest.mark.unit
+class TestSemanticBatchEmbedding:
+    """Test batched embedding of document chunks."""
+
+    class _Service:
+        n_ctx = 2048
+        batch_size = 4
+
+        def __init__(self, fail_batches=False):
+            self.fail_batches = fail_batches
+            self.batch_calls = []
+            self.single_calls = 0
+
+        def embed(self, texts):
+            self.batch_calls.append(len(texts))
+            if self.fail_batches:
+                raise RuntimeError("model crashed")
+            return [[float(len(t)), 1.0] for t in texts]
+
+        def embed_single(self, text):
+            self.single_calls += 1
+            return [float(len(text)), 1.0]
+
+    def _add(self, temp_dir, monkeypatch, service):
+        import rag.semantic_store as semantic_store_module
+
+        monkeypatch.setattr(semantic_store_module, "get_embedding_service", lambda: service)
+        store = SemanticStore(index_path=str(temp_dir / "batch_index"), background_compaction=False)
+        content = "\n\n".join(f"Paragraph {i} " + "x" * 300 for i in range(10))
+        store.add_document(content, {"source": "big.md"}, chunk_size=350, chunk_overlap=0)
+        return store
+
+    def test_chunks_embedded_in_batches(self, temp_dir, monkeypatch):
+        """Test that a document's chunks are embedded with a few batch calls."""
+        service = self._Service()
+        store = self._add(temp_dir, monkeypatch, service)
+
+        assert len(store.chunks) == 10
+        assert service.batch_calls == [4, 4, 2]
+        assert service.single_calls == 0
+        assert all(len(chunk.embedding) == 2 for chunk in store.chunks)
+
+    def test_failed_batch_falls_back_to_single(self, temp_dir, monkeypatch):
+        """Test that a failing batch is retried, then embedded chunk by chunk."""
+        service = self._Service(fail_batches=True)
+        store = self._add(temp_dir, monkeypatch, service)
+
+        assert service.batch_calls == [4, 4, 4, 4, 2, 2]
+        assert service.single_calls == 10
+        assert all(len(chunk.embedding) == 2 for chunk in store.chunks)
+
+    def test_token_batches_respect_budget(self):
+        """Test that batches stay within the token budget and keep order."""
+        from rag.semantic_store import _token_batches
+
+        texts = ["a" * 400, "b" * 400, "c" * 4000, "d" * 40]
+        batches = _token_batches(texts, token_budget=250, max_batch_size=8)
+
+        assert batches == [["a" * 400, "b" * 400], ["c" * 4000], ["d" * 40]]
+
+    def test_streamed_document_matches_add_document(self, temp_dir, monkeypatch):
+        """Test that add_document_stream stores add_document's chunks in batches."""
+        import rag.semantic_store as semantic_store_module
+
+        service = self._Service()
+        monkeypatch.setattr(semantic_store_module, "get_embedding_service", lambda: service)
+        content = "\n\n".join(f"Paragraph {i}. " + "Sentence x. " * (i * 7) for i in range(12))
+        blocks = [content[i:i + 37] for i in range(0, len(content), 37)]
+
+        whole = SemanticStore(index_path=str(temp_dir / "whole"), background_compaction=False)
+        whole.add_document(content, {"source": "log.txt"}, chunk_size=120, chunk_overlap=20)
+        streamed = SemanticStore(
+            index_path=str(temp_dir / "streamed"), compaction_threshold=100, background_compaction=False
+        )
+        chunk_ids = streamed.add_document_stream(
+            lambda: iter(blocks), {"source": "log.txt"}, chunk_size=120, chunk_overlap=20, batch_size=5
+        )
+
+        assert len(chunk_ids) == len(whole.chunks) > 5
+        assert [c.content for c in streamed.chunks] == [c.content for c in whole.chunks]
+        assert [c.metadata for c in streamed.chunks] == [c.metadata for c in whole.chunks]
+        assert len(streamed._manifest["segments"]) == -(-len(chunk_ids) // 5)
+
+        with pytest.raises(ValueError):
+            streamed.add_document_stream(lambda: iter(blocks), {"source": "x", "decision": "no"})
+
+    def test_failed_stream_deletes_stored_batches(self, temp_dir, monkeypatch):
+        """Test that a stream failing part-way leaves no chunks of the new document."""
+        import rag.semantic_store as semantic_store_module
+
+        service = self._Service()
+        monkeypatch.setattr(semantic_store_module, "get_embedding_service", lambda: service)
+        content = "\n\n".join(f"Paragraph {i}. " + "Sentence x. " * 10 for i in range(12))
+        blocks = [content[i:i + 37] for i in range(0, len(content), 37)]
+        passes = []
+
+        def read_blocks():
+            passes.append(len(passes))
+            for i, block in enumerate(blocks):
+                if len(passes) == 2 and i == len(blocks) // 2:
+                    raise OSError("disk read failed")
+                yield block
+
+        store = SemanticStore(index_path=str(temp_dir / "failed"), background_compaction=False)
+        store.add_document("Kept document.", {"source": "kept.md"})
+        with pytest.raises(OSError):
+            store.add_document_stream(read_blocks, {"source": "log.txt"}, chunk_size=120, batch_size=2)
+
+        assert len(service.batch_calls) > 1
+        assert [c.content for c in store.chunks] == ["Kept document."]
+        reopened = SemanticStore(index_path=str(temp_dir / "failed"), background_compaction=False)
+        assert [c.content for c in reopened.chunks] == ["Kept document."]
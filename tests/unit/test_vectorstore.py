@@ -0,0 +1,170 @@
+"""
+Unit tests for the legacy VectorStore.
+
+Tests cover float32 array storage, amortized growth, cached norms,
+memory-mapped loading and the append journal used by incremental saves.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from rag.vectorstore import JOURNAL_RECORDS, JOURNAL_VECTORS, VectorStore
+
+
+def _brute_force(vectors, query, top_k):
+    vectors = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = np.inf
+    scores = vectors @ np.asarray(query) / norms / np.linalg.norm(query)
+    return sorted(range(len(vectors)), key=lambda i: (-scores[i], i))[:top_k], scores
+
+
+@pytest.mark.unit
+class TestVectorStoreArrays:
+    """Test the float32 ndarray storage of VectorStore."""
+
+    def test_grows_amortized(self, temp_dir):
+        """Test that add() doubles capacity and keeps a norm per row."""
+        store = VectorStore(index_path=str(temp_dir / "rag_index"))
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(150, 8)).astype(np.float32)
+
+        capacities = set()
+        for start in range(0, 150, 10):
+            store.add([f"doc {i}" for i in range(start, start + 10)], vectors[start:start + 10].tolist())
+            capacities.add(store._matrix.shape[0])
+
+        assert capacities == {64, 128, 256}
+        assert store.vectors.dtype == np.float32 and store.vectors.shape == (150, 8)
+        assert np.array_equal(store.vectors, vectors)
+        assert np.allclose(store._norms[:150], np.linalg.norm(vectors, axis=1))
+        with pytest.raises(ValueError):
+            store.add(["bad"], [[1.0, 2.0]])
+
+    def test_matches_brute_force(self, temp_dir):
+        """Test that vectorized search ranks and scores like plain cosine similarity."""
+        store = VectorStore(index_path=str(temp_dir / "rag_index"))
+        vectors = np.random.default_rng(1).normal(size=(80, 16))
+        vectors[4] = 0.0
+        store.add([f"doc {i}" for i in range(80)], vectors.tolist(), [{"even": i % 2 == 0} for i in range(80)])
+        query = vectors[7] + 0.1
+
+        expected, scores = _brute_force(vectors, query, 5)
+        results = store.search(query.tolist(), top_k=5)
+        assert [doc for doc, _, _ in results] == [f"doc {i}" for i in expected]
+        assert [score for _, score, _ in results] == pytest.approx([scores[i] for i in expected], abs=1e-5)
+
+        filtered = store.search(query.tolist(), top_k=80, metadata_filters={"even": True})
+        assert len(filtered) == 40 and all(meta["even"] for _, _, meta in filtered)
+        assert dict((doc, score) for doc, score, _ in filtered)["doc 4"] == 0.0
+
+    def test_memory_mapped_load(self, temp_dir):
+        """Test that mmap=True maps vectors.npy and copies it only on add()."""
+        store = VectorStore(index_path=str(temp_dir / "rag_index"))
+        vectors = np.random.default_rng(2).normal(size=(20, 4)).astype(np.float32)
+        store.add([f"doc {i}" for i in range(20)], vectors.tolist())
+        store.save()
+
+        mapped = VectorStore(index_path=store.index_path, mmap=True)
+        assert isinstance(mapped._matrix, np.memmap)
+        assert mapped.get_stats() == {"total_docs": 20, "total_vectors": 20, "vector_dimension": 4}
+        assert mapped.search(vectors[3].tolist(), top_k=1)[0][0] == "doc 3"
+
+        # Saving over the mapped file must not corrupt the mapping
+        mapped.save()
+        assert np.array_equal(mapped.vectors, vectors)
+
+        mapped.add(["late"], [vectors[0].tolist()])
+        assert not isinstance(mapped._matrix, np.memmap)
+        mapped.save()
+        reloaded = VectorStore(index_path=store.index_path)
+        assert reloaded.get_stats()["total_vectors"] == 21
+        assert sorted(doc for doc, _, _ in reloaded.search(vectors[0].tolist(), top_k=2)) == ["doc 0", "late"]
+
+
+@pytest.mark.unit
+class TestVectorStoreJournal:
+    """Test save(append=True) and journal compaction."""
+
+    def _batches(self, count, size, dim=6):
+        vectors = np.random.default_rng(4).normal(size=(count * size, dim)).astype(np.float32)
+        for start in range(0, count * size, size):
+            rows = range(start, start + size)
+            yield [f"doc {i}" for i in rows], vectors[start:start + size].tolist(), [{"row": i} for i in rows]
+
+    @pytest.mark.parametrize("storage_mode", ["float32", "int8"])
+    def test_appends_and_reloads(self, temp_dir, storage_mode):
+        """Test that appended batches reload like a full save."""
+        path = str(temp_dir / "rag_index")
+        store = VectorStore(index_path=path, storage_mode=storage_mode, compaction_min_rows=100)
+        batches = list(self._batches(4, 10))
+        for docs, vectors, metadata in batches:
+            store.add(docs, vectors, metadata)
+            store.save(append=True)
+
+        # The first save writes the canonical files, the rest go to the journal
+        assert len(np.load(os.path.join(path, "vectors.npy"))) == 10
+        assert store._journal_rows == 30
+        with open(os.path.join(path, JOURNAL_RECORDS), encoding="utf-8") as f:
+            assert len(f.readlines()) == 30
+
+        reloaded = VectorStore(index_path=path, storage_mode=storage_mode, compaction_min_rows=100)
+        assert reloaded.docs == store.docs and reloaded.metadata == store.metadata
+        assert np.allclose(reloaded.vectors, store.vectors)
+        query = batches[3][1][5]
+        assert reloaded.search(query, top_k=1)[0][0] == "doc 35"
+        assert reloaded.search(query, top_k=3, metadata_filters={"row": 2})[0][0] == "doc 2"
+
+        # Appending after a reload continues the same journal
+        reloaded.add(["late"], [query], [{"row": -1}])
+        reloaded.save(append=True)
+        assert VectorStore(index_path=path, storage_mode=storage_mode).get_stats()["total_vectors"] == 41
+
+    def test_compacts_when_journal_outgrows_files(self, temp_dir):
+        """Test that the journal is folded into the canonical files geometrically."""
+        path = str(temp_dir / "rag_index")
+        store = VectorStore(index_path=path, compaction_min_rows=15)
+        compactions = []
+        for docs, vectors, metadata in self._batches(12, 10):
+            store.add(docs, vectors, metadata)
+            store.save(append=True)
+            if not os.path.exists(os.path.join(path, JOURNAL_VECTORS)):
+                compactions.append(len(store.docs))
+
+        assert compactions == [10, 30, 70]
+        reloaded = VectorStore(index_path=path)
+        assert reloaded.docs == store.docs
+        assert np.array_equal(reloaded.vectors, store.vectors)
+
+    def test_stale_and_torn_journal(self, temp_dir):
+        """Test that torn tails are dropped and folded journals are ignored."""
+        path = str(temp_dir / "rag_index")
+        store = VectorStore(index_path=path)
+        for docs, vectors, metadata in self._batches(2, 5):
+            store.add(docs, vectors, metadata)
+            store.save(append=True)
+
+        # A torn write: half a vector row and a partial JSON line
+        with open(os.path.join(path, JOURNAL_VECTORS), "ab") as f:
+            f.write(b"\0" * 12)
+        with open(os.path.join(path, JOURNAL_RECORDS), "a", encoding="utf-8") as f:
+            f.write('{"doc": "torn"')
+        torn = VectorStore(index_path=path)
+        assert torn.docs == store.docs
+        torn.add(["late"], [[1.0] * 6])
+        torn.save(append=True)
+        assert not os.path.exists(os.path.join(path, JOURNAL_VECTORS))
+        assert VectorStore(index_path=path).docs == store.docs + ["late"]
+
+        # A full save that crashed before removing the journal
+        store.add(["late"], [[1.0] * 6])
+        store.save()
+        with open(os.path.join(path, JOURNAL_VECTORS), "wb") as f:
+            f.write(b"VSJRNL1\n" + np.array([6, 5], dtype="<u4").tobytes())
+        assert VectorStore(index_path=path).docs == store.docs
+
+        # clear() forces the next append to rewrite everything
+        store.clear()
+        store.save(append=True)
+        assert VectorStore(index_path=path).get_stats()["total_docs"] == 0